@@ -1,4 +1,6 @@
 # app.py
+import os
+
 from dash import Dash, html
 import dash_bootstrap_components as dbc
 
@@ -6,12 +8,30 @@ from callbacks.theme import register_theme_callbacks
 from callbacks.charts import register_chart_callbacks
 from callbacks.controls import register_control_callbacks
 from callbacks.drilldown import register_drilldown_callback
+from callbacks.live import register_live_callbacks
+from callbacks.detail import register_detail_callbacks
+from callbacks.portfolio import register_portfolio_callbacks
 import callbacks.tabs  # Imports the two callbacks above
+from callbacks.tabs import fundamentals_layout
+from components.layout import create_layout
+from jobs.manager import get_background_manager
+from jobs.prewarm import start_prewarm
+from fundamentals import prefetch
+from utils.instrumentation import register_instrumentation
+
+background_manager = get_background_manager()
 
-app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app = Dash(
+    __name__,
+    external_stylesheets=[dbc.themes.BOOTSTRAP],
+    background_callback_manager=background_manager,
+)
 app.config.suppress_callback_exceptions = True
 app.title = "Stock Analytics Pro"
 
+# WSGI callable for production servers (see wsgi.py / gunicorn.conf.py)
+server = app.server
+
 # Main layout with horizontal worksheet-style tabs
 app.layout = html.Div([
     dbc.Tabs(
@@ -23,15 +43,34 @@ app.layout = html.Div([
             dbc.Tab(label="Fundamental Analysis", tab_id="fundamentals"),
         ]
     ),
-    html.Div(id="tab-content")
+    # Panes stay mounted; render_tab_content only shows/hides them
+    html.Div(id="tab-content", children=[
+        html.Div(id="home-pane", children=create_layout()),
+        html.Div(id="fundamentals-pane", children=fundamentals_layout(), style={"display": "none"}),
+    ])
 ])
 # Register all your existing callbacks (they work perfectly on the Home tab)
 register_theme_callbacks(app)
-register_chart_callbacks(app)
+register_chart_callbacks(app, background_manager)
 register_control_callbacks(app)
 register_drilldown_callback(app)
+register_live_callbacks(app)
+register_detail_callbacks(app)
+register_portfolio_callbacks(app)
+register_instrumentation(app)
 
 # The tab callbacks are already registered via the import above
 
 if __name__ == "__main__":
-    app.run(debug=True, host='0.0.0.0', port=8050)
\ No newline at end of file
+    debug = os.getenv("DASH_DEBUG", "0") == "1"
+    # The debug reloader runs this block in a watcher process and again in the
+    # serving child (WERKZEUG_RUN_MAIN=true); only the serving process warms up.
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_prewarm()
+        if prefetch.enabled():
+            prefetch.start_prefetch(prefetch.tracked_symbols())
+    app.run(
+        debug=debug,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8050")),
+    )
@@ -1,214 +1,469 @@
+from collections import OrderedDict
+import threading
+
+import numpy as np
+import pandas as pd
 from dash import Input, Output
 import plotly.express as px
 import plotly.graph_objects as go
 from data.db import load_price_data
+from data.catalog import has_data, data_versions, get_entries
+from data import rollups
+from utils.instrumentation import stage, cache_event
+from utils import response_cache
 from utils.metrics import *
 from config.theme import DARK, LIGHT, ACCENT, SAFE, DANGER, WARN
 from components.cards import kpi_card, risk_card
 
+UPDATE_OUTPUTS = [
+    Output("price_chart", "figure"),
+    Output("monthly_heat", "figure"),
+    Output("yearly_line", "figure"),
+    Output("corr_heat", "figure"),
+    Output("kpi_grid", "children"),
+    Output("risk_surface", "data"),
+    Output("live_view", "data"),
+]
+
+UPDATE_INPUTS = [
+    Input("symbols", "value"),
+    Input("metric", "value"),
+    Input("scale_mode", "value"),
+    Input("season_year", "value"),
+    Input("theme_store", "data"),
+]
+
+# Number of progress steps reported by build_dashboard
+PROGRESS_STEPS = 6
+
+# Calendar days of bars loaded before a selected year so the longest risk
+# window is full on its first day
+RISK_LOOKBACK_DAYS = max(RISK_WINDOWS) * 7 // 5 + 30
+
+# Recently built views keyed by inputs + data versions (filled by the startup prewarm).
+# This per-process memo sits in front of the shared response cache.
+VIEW_MEMO_SIZE = 32
+_view_memo = OrderedDict()
+_view_memo_lock = threading.Lock()
+
 
-def register_chart_callbacks(app):
-    """Register chart update callbacks."""
+def _view_key(symbols, metric, scale_mode, season_year, mode):
+    syms = tuple(sorted(set(symbols)))
+    versions = data_versions(syms)
+    versions = tuple(versions.get(s) for s in syms)
+    returns_source = "rollups" if rollups.enabled() else "pandas"
+    return (syms, metric, scale_mode, season_year, mode, returns_source, versions)
+
+
+def register_chart_callbacks(app, manager=None):
+    """
+    Register chart update callbacks.
+    With a background manager, ``update`` runs outside the web worker with
+    progress reporting; a newer request for the same callback cancels it.
+    """
+    register_risk_card_callback(app)
+
+    if manager is None:
+        @app.callback(*UPDATE_OUTPUTS, *UPDATE_INPUTS)
+        def update(symbols, metric, scale_mode, season_year, mode):
+            """Main callback to update all charts and metrics."""
+            return build_dashboard(symbols, metric, scale_mode, season_year, mode)
+        return
+
+    @app.callback(
+        *UPDATE_OUTPUTS,
+        *UPDATE_INPUTS,
+        background=True,
+        manager=manager,
+        progress=[Output("update_progress", "value"), Output("update_progress", "max")],
+        progress_default=["0", str(PROGRESS_STEPS)],
+        running=[
+            (Output("update_progress", "style"), {"width": "100%", "height": "6px"}, {"display": "none"}),
+        ],
+    )
+    def update(set_progress, symbols, metric, scale_mode, season_year, mode):
+        """Main callback to update all charts and metrics (background job)."""
+        def progress(step):
+            set_progress((str(step), str(PROGRESS_STEPS)))
+        return build_dashboard(symbols, metric, scale_mode, season_year, mode, progress=progress)
+
+
+def register_risk_card_callback(app):
+    """Re-render the risk cards from the stored surface when the window or theme changes."""
 
     @app.callback(
-        Output("price_chart", "figure"),
-        Output("monthly_heat", "figure"),
-        Output("yearly_line", "figure"),
-        Output("corr_heat", "figure"),
-        Output("kpi_grid", "children"),
         Output("risk_cards", "children"),
-        Input("symbols", "value"),
-        Input("metric", "value"),
-        Input("scale_mode", "value"),
-        Input("season_year", "value"),
+        Input("risk_surface", "data"),
+        Input("risk_window", "value"),
         Input("theme_store", "data"),
     )
-    def update(symbols, metric, scale_mode, season_year, mode):
-        """Main callback to update all charts and metrics."""
+    def render_risk_cards(risk_data, window, mode):
         theme = DARK if mode == "dark" else LIGHT
-        symbols = symbols or []
-        df = load_price_data(symbols)
+        return render_window_cards(theme, risk_data, window)
 
-        if df.empty:
-            empty = px.line(title="No data")
-            empty.update_layout(
-                paper_bgcolor=theme["CARD_BG"],
-                plot_bgcolor=theme["CARD_BG"],
-                font_color=theme["TEXT"]
-            )
-            return empty, empty, empty, empty, [], []
 
-        df = add_returns(df)
-        df = add_vwap(df)
+def build_dashboard(symbols, metric, scale_mode, season_year, mode, progress=None):
+    """
+    Build the Home outputs. Unchanged inputs and data are served from this
+    process's view memo, then from the shared response cache, before rebuilding.
+    """
+    symbols = symbols or []
+    key = _view_key(symbols, metric, scale_mode, season_year, mode)
+    with _view_memo_lock:
+        hit = key in _view_memo
+        if hit:
+            _view_memo.move_to_end(key)
+            result = _view_memo[key]
+    cache_event("view_memo", hit)
+    if hit:
+        return result
+
+    shared_key = response_cache.cache_key("dashboard", key)
+    result = response_cache.get(shared_key)
+    if result is not None:
+        result = tuple(result)
+    else:
+        with stage("build_dashboard"):
+            result = _build_dashboard(symbols, metric, scale_mode, season_year, mode, progress or (lambda step: None))
+        with stage("response_cache_store"):
+            response_cache.put(shared_key, result)
 
-        # Filter by year if selected
+    with _view_memo_lock:
+        _view_memo[key] = result
+        while len(_view_memo) > VIEW_MEMO_SIZE:
+            _view_memo.popitem(last=False)
+    return result
+
+
+def _build_dashboard(symbols, metric, scale_mode, season_year, mode, progress):
+    """Compute all charts, KPIs and risk cards for one set of control values."""
+    theme = DARK if mode == "dark" else LIGHT
+    if not has_data(symbols):
+        empty = empty_figure(theme, "No data")
+        return empty, empty, empty, empty, [], None, None
+
+    start = end = None
+    if rollups.enabled():
+        # Seasonality comes from the rollups, so daily bars are only needed for
+        # the selected year (plus the risk lookback), not the whole history
+        present = sorted(get_entries(symbols))
+        with stage("monthly_returns"):
+            mdf = rollups.monthly_rollups(present)
+        with stage("yearly_returns"):
+            ydf = rollups.yearly_rollups(present)
         if season_year != "ALL":
             selected_year = int(season_year)
-            df = df[df["date"].dt.year == selected_year]
-            if df.empty:
-                empty = px.line(title=f"No data for {selected_year}")
-                empty.update_layout(
-                    paper_bgcolor=theme["CARD_BG"],
-                    plot_bgcolor=theme["CARD_BG"],
-                    font_color=theme["TEXT"]
-                )
-                return empty, empty, empty, empty, [], []
+            mdf = mdf[mdf["year"] == selected_year]
+            ydf = ydf[ydf["year"] == selected_year]
+            end = pd.Timestamp(selected_year, 12, 31, 23, 59, 59)
+            # VWAP accumulates from each symbol's first bar, so it needs them all
+            if metric != "vwap":
+                start = pd.Timestamp(selected_year, 1, 1) - pd.Timedelta(days=RISK_LOOKBACK_DAYS)
+
+    with stage("load"):
+        df = load_price_data(symbols, start, end)
+
+    if df is None or df.empty:
+        empty = empty_figure(theme, "No data")
+        return empty, empty, empty, empty, [], None, None
 
+    progress(1)
+    with stage("enrich"):
+        df = add_returns(df)
+        df = add_vwap(df)
+    # Rolling risk windows look back across the year boundary
+    history = df
+
+    # Filter by year if selected
+    if season_year != "ALL":
+        selected_year = int(season_year)
+        df = df[df["date"].dt.year == selected_year]
+        if df.empty:
+            empty = empty_figure(theme, f"No data for {selected_year}")
+            return empty, empty, empty, empty, [], None, None
+
+    with stage("enrich"):
         df = add_normalized_price(df)
 
-        # Price Chart
-        chart_title = "Price Comparison"
-        if metric == "volume":
-            ycol = "volume"
-            chart_title = "Volume Comparison"
-        elif metric == "vwap":
-            ycol = "vwap"
-            chart_title = "VWAP Comparison"
-        elif metric == "close":
-            ycol = "norm_close" if scale_mode == "norm" else "close"
-            chart_title = "Normalized Price (Base = 100)" if scale_mode == "norm" else "Price Comparison (Actual)"
+    with stage("figure_price"):
+        price_fig = price_figure(df, metric, scale_mode, season_year, theme)
 
-        if season_year != "ALL":
-            chart_title += f" ({season_year})"
-
-        price_fig = px.line(df, x="date", y=ycol, color="symbol", title=chart_title)
-        price_fig.update_layout(
-            paper_bgcolor=theme["CARD_BG"],
-            plot_bgcolor=theme["CARD_BG"],
-            font_color=theme["TEXT"],
-            legend_title_text="Ticker",
-            xaxis=dict(gridcolor=theme["GRID"]),
-            yaxis=dict(gridcolor=theme["GRID"]),
-            height=500,
-            margin=dict(l=40, r=20, t=40, b=40),
-        )
+    progress(2)
 
-        # Monthly Heatmap
-        mdf = monthly_returns(df)
-        if season_year != "ALL":
-            yr = int(season_year)
-            mdf2 = mdf[mdf["year"] == yr].copy()
-            title = f"Monthly Returns ({yr})"
-            heat_data = mdf2.pivot(index="symbol", columns="month", values="monthly_return")
-            heat_label = "Monthly Return"
-        else:
-            monthly_avg = mdf.groupby(["symbol", "month"])["monthly_return"].mean().reset_index()
-            title = "Average Monthly Returns"
-            heat_data = monthly_avg.pivot(index="symbol", columns="month", values="monthly_return")
-            heat_label = "Avg Monthly Return"
-
-        heat_data.columns = heat_data.columns.astype(str)
-        month_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-
-        heat = px.imshow(
-            heat_data,
-            color_continuous_scale="RdYlGn",
-            labels={"x": "Month", "y": "Ticker", "color": heat_label},
-            title=title
-        )
-        heat.update_xaxes(tickmode="array", tickvals=[str(i) for i in range(1, 13)], ticktext=month_labels)
-        heat.update_layout(
-            paper_bgcolor=theme["CARD_BG"],
-            plot_bgcolor=theme["CARD_BG"],
-            font_color=theme["TEXT"],
-            xaxis=dict(gridcolor=theme["GRID"]),
-            yaxis=dict(gridcolor=theme["GRID"]),
-            height=500,
-            margin=dict(l=80, r=20, t=40, b=40),
-        )
+    # Monthly Heatmap
+    if not rollups.enabled():
+        with stage("monthly_returns"):
+            mdf = monthly_returns(df)
 
-        # Yearly Returns
-        ydf = yearly_returns(df)
-        yearly_title = "Yearly Returns" if season_year == "ALL" else f"Yearly Returns ({season_year})"
-        
-        yearly_fig = px.line(ydf, x="year", y="yearly_return", color="symbol", markers=True, title=yearly_title)
-        yearly_fig.update_layout(
-            paper_bgcolor=theme["CARD_BG"],
-            plot_bgcolor=theme["CARD_BG"],
-            font_color=theme["TEXT"],
-            xaxis=dict(gridcolor=theme["GRID"]),
-            yaxis=dict(gridcolor=theme["GRID"]),
-            height=500,
-            margin=dict(l=40, r=20, t=40, b=40),
-        )
+    with stage("figure_heatmap"):
+        heat = monthly_heatmap(mdf, season_year, theme)
 
-        # Correlation Heatmap
-        pivot = df.pivot(index="date", columns="symbol", values="returns")
-        corr = pivot.corr()
-        symbols_list = corr.columns.tolist()
-        corr_title = "Return Correlation" if season_year == "ALL" else f"Return Correlation ({season_year})"
-
-        corr_fig = go.Figure()
-        corr_fig.add_trace(
-            go.Heatmap(
-                z=corr.values,
-                x=symbols_list,
-                y=symbols_list,
-                colorscale="RdBu",
-                zmid=0,
-                colorbar=dict(title="Correlation")
-            )
-        )
-        corr_fig.update_layout(
-            title=corr_title,
-            paper_bgcolor=theme["CARD_BG"],
-            plot_bgcolor=theme["CARD_BG"],
-            font_color=theme["TEXT"],
-            xaxis=dict(side="bottom"),
-            yaxis=dict(autorange="reversed"),
-            height=500,
-            margin=dict(l=100, r=50, t=40, b=100)
-        )
+    progress(3)
 
-        # KPIs
-        if season_year != "ALL":
-            kpi_year = int(season_year)
-            latest = ydf[ydf["year"] == kpi_year].set_index("symbol")["yearly_return"].dropna()
-            kpi_label = f"({kpi_year})"
-        else:
-            latest = ydf.groupby("symbol")["yearly_return"].mean()
-            kpi_label = "(All Years Avg)"
-
-        best_sym = latest.idxmax() if len(latest) > 0 else "N/A"
-        best_val = float(latest.max()) if len(latest) > 0 else 0
-        worst_sym = latest.idxmin() if len(latest) > 0 else "N/A"
-        worst_val = float(latest.min()) if len(latest) > 0 else 0
-
-        mdf_for_kpi = mdf if season_year == "ALL" else mdf[mdf["year"] == int(season_year)]
-        avg_monthly_sym = mdf_for_kpi.groupby("symbol")["monthly_return"].mean().sort_values(ascending=False)
-        top_m_sym = avg_monthly_sym.idxmax()
-        top_m_val = float(avg_monthly_sym.max())
-
-        avg_yearly_sym = ydf.groupby("symbol")["yearly_return"].mean().sort_values(ascending=False)
-        top_y_sym = avg_yearly_sym.idxmax()
-        top_y_val = float(avg_yearly_sym.max())
+    # Yearly Returns
+    if not rollups.enabled():
+        with stage("yearly_returns"):
+            ydf = yearly_returns(df)
+
+    with stage("figure_yearly"):
+        yearly_fig = yearly_figure(ydf, season_year, theme)
+
+    progress(4)
+
+    # Correlation Heatmap
+    with stage("correlation"):
+        corr = return_correlation(df)
 
+    with stage("figure_corr"):
+        corr_fig = correlation_figure(corr, season_year, theme)
+
+    progress(5)
+
+    # KPIs
+    if season_year != "ALL":
+        latest = ydf[ydf["year"] == int(season_year)].set_index("symbol")["yearly_return"].dropna()
+    else:
+        latest = ydf.groupby("symbol")["yearly_return"].mean()
+
+    mdf_for_kpi = mdf if season_year == "ALL" else mdf[mdf["year"] == int(season_year)]
+    avg_monthly_sym = mdf_for_kpi.groupby("symbol")["monthly_return"].mean()
+    avg_yearly_sym = ydf.groupby("symbol")["yearly_return"].mean()
+
+    with stage("kpi_metrics"):
         cagr = cagr_by_symbol(df)
         vol = annual_vol_by_symbol(df)
         sharpe = sharpe_by_symbol(df, rf=0.04)
 
-        best_cagr_sym = cagr.idxmax()
-        best_cagr_val = float(cagr.max())
-        best_sharpe_sym = sharpe.idxmax()
-        best_sharpe_val = float(sharpe.max())
-        avg_ann_vol = float(vol.mean())
-
-        kpis = [
-            kpi_card(theme, f"Best {kpi_label}", f"{best_sym}", f"{best_val*100:.2f}%", SAFE),
-            kpi_card(theme, f"Worst {kpi_label}", f"{worst_sym}", f"{worst_val*100:.2f}%", DANGER),
-            kpi_card(theme, "Avg Annual Vol", f"{avg_ann_vol*100:.2f}%", "Annualized (252)", WARN),
-            kpi_card(theme, "Tickers", f"{len(symbols)}", "Selected", ACCENT),
-            kpi_card(theme, "Top Avg Monthly Return", f"{top_m_sym}", f"{top_m_val*100:.2f}% ({season_year})", SAFE),
-            kpi_card(theme, "Top Avg Yearly Return", f"{top_y_sym}", f"{top_y_val*100:.2f}% (Avg)", ACCENT),
-            kpi_card(theme, "Best CAGR", f"{best_cagr_sym}", f"{best_cagr_val*100:.2f}%", "#9b59b6"),
-            kpi_card(theme, "Best Sharpe", f"{best_sharpe_sym}", f"{best_sharpe_val:.2f} (rf=4%)", "#1abc9c"),
-        ]
-
-        # Risk Cards
-        rtab = risk_table(df, window=30)
-        cards = [
-            risk_card(theme, r["symbol"], float(r["risk_score"]), float(r["ann_vol"]), float(r["max_drawdown"]))
-            for _, r in rtab.iterrows()
-        ]
-
-        return price_fig, heat, yearly_fig, corr_fig, kpis, cards
+    kpis = kpi_cards(theme, len(symbols), season_year, latest, avg_monthly_sym, avg_yearly_sym, cagr, vol, sharpe)
+
+    progress(6)
+
+    # Risk surface; render_risk_cards draws the selected window from it
+    with stage("risk_surface"):
+        surface = risk_surface(history[history["symbol"].isin(df["symbol"].unique())])
+        if season_year != "ALL":
+            surface = surface[surface["date"].dt.year == int(season_year)]
+        risk_data = risk_surface_data(surface, max_drawdown_by_symbol(df))
+
+    # Last bar drawn per symbol: live mode appends from there
+    drawn = df.groupby("symbol")["date"].max()
+    live_view = {sym: date.isoformat() for sym, date in drawn.items()}
+
+    return price_fig, heat, yearly_fig, corr_fig, kpis, risk_data, live_view
+
+
+def kpi_cards(theme, n_symbols, season_year, latest, avg_monthly, avg_yearly, cagr, vol, sharpe):
+    """
+    KPI grid from per-symbol Series: ``latest`` yearly return (the selected
+    year, or the all-years average), average monthly/yearly return, CAGR,
+    annualized vol and Sharpe.
+    """
+    kpi_label = "(All Years Avg)" if season_year == "ALL" else f"({int(season_year)})"
+
+    best_sym = latest.idxmax() if len(latest) > 0 else "N/A"
+    best_val = float(latest.max()) if len(latest) > 0 else 0
+    worst_sym = latest.idxmin() if len(latest) > 0 else "N/A"
+    worst_val = float(latest.min()) if len(latest) > 0 else 0
+
+    top_m_sym = avg_monthly.idxmax()
+    top_m_val = float(avg_monthly.max())
+
+    top_y_sym = avg_yearly.idxmax()
+    top_y_val = float(avg_yearly.max())
+
+    best_cagr_sym = cagr.idxmax()
+    best_cagr_val = float(cagr.max())
+    best_sharpe_sym = sharpe.idxmax()
+    best_sharpe_val = float(sharpe.max())
+    avg_ann_vol = float(vol.mean())
+
+    return [
+        kpi_card(theme, f"Best {kpi_label}", f"{best_sym}", f"{best_val*100:.2f}%", SAFE),
+        kpi_card(theme, f"Worst {kpi_label}", f"{worst_sym}", f"{worst_val*100:.2f}%", DANGER),
+        kpi_card(theme, "Avg Annual Vol", f"{avg_ann_vol*100:.2f}%", "Annualized (252)", WARN),
+        kpi_card(theme, "Tickers", f"{n_symbols}", "Selected", ACCENT),
+        kpi_card(theme, "Top Avg Monthly Return", f"{top_m_sym}", f"{top_m_val*100:.2f}% ({season_year})", SAFE),
+        kpi_card(theme, "Top Avg Yearly Return", f"{top_y_sym}", f"{top_y_val*100:.2f}% (Avg)", ACCENT),
+        kpi_card(theme, "Best CAGR", f"{best_cagr_sym}", f"{best_cagr_val*100:.2f}%", "#9b59b6"),
+        kpi_card(theme, "Best Sharpe", f"{best_sharpe_sym}", f"{best_sharpe_val:.2f} (rf=4%)", "#1abc9c"),
+    ]
+
+
+# Points per volatility sparkline, spread over the last SPARK_DAYS rows
+SPARK_POINTS = 60
+SPARK_DAYS = TRADING_DAYS
+
+
+def window_cards(scored, trends):
+    """JSON-safe card rows from a ``risk_scores`` frame (riskiest first) and ``{symbol: trend}``."""
+    return [
+        {
+            "symbol": r.symbol,
+            "risk_score": float(r.risk_score),
+            "ann_vol": float(r.ann_vol),
+            "max_drawdown": float(r.max_drawdown),
+            "trend": trends.get(r.symbol, []),
+        }
+        for r in scored.itertuples()
+    ]
+
+
+def risk_surface_data(surface, max_dd):
+    """
+    JSON-safe summary of ``surface`` for the ``risk_surface`` store:
+    ``{window: card rows}``. Each symbol's latest row gives its volatility
+    for the window, ``max_dd`` (per symbol, over the view) its max drawdown,
+    and ``risk_scores`` ranks those latest rows against each other, so the
+    30-day cards score like ``risk_table(view, 30)``. The trend is the
+    window's annualized volatility over the last year.
+    """
+    data = {}
+    for window, wdf in surface.groupby("window", sort=True):
+        latest = wdf.groupby("symbol", sort=True).tail(1)
+        scored = risk_scores(pd.DataFrame({
+            "symbol": latest["symbol"].to_numpy(),
+            "ann_vol": latest["ann_vol"].to_numpy(),
+            "max_drawdown": max_dd.reindex(latest["symbol"]).to_numpy(dtype=float),
+        }))
+        trends = {}
+        for sym, sdf in wdf.groupby("symbol", sort=False):
+            recent = sdf["ann_vol"].to_numpy()[-SPARK_DAYS:]
+            step = max(1, -(-len(recent) // SPARK_POINTS))
+            trends[sym] = np.round(recent[::-1][::step][::-1], 4).tolist()
+        data[str(window)] = window_cards(scored, trends)
+    return data
+
+
+def render_window_cards(theme, risk_data, window):
+    """Risk cards for one window of ``risk_surface_data``."""
+    return [
+        risk_card(theme, r["symbol"], r["risk_score"], r["ann_vol"], r["max_drawdown"], trend=r["trend"])
+        for r in (risk_data or {}).get(str(window), [])
+    ]
+
+
+# Figure builders shared by the Home callback and the batch report renderer
+# (reports/render.py). They only shape already-computed frames.
+
+def empty_figure(theme, title="No data"):
+    empty = px.line(title=title)
+    empty.update_layout(
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"]
+    )
+    return empty
+
+
+def price_figure(df, metric, scale_mode, season_year, theme):
+    """Price/volume/VWAP lines per symbol; ``df`` has ``norm_close`` and ``vwap``."""
+    chart_title = "Price Comparison"
+    if metric == "volume":
+        ycol = "volume"
+        chart_title = "Volume Comparison"
+    elif metric == "vwap":
+        ycol = "vwap"
+        chart_title = "VWAP Comparison"
+    elif metric == "close":
+        ycol = "norm_close" if scale_mode == "norm" else "close"
+        chart_title = "Normalized Price (Base = 100)" if scale_mode == "norm" else "Price Comparison (Actual)"
+
+    if season_year != "ALL":
+        chart_title += f" ({season_year})"
+
+    price_fig = px.line(df, x="date", y=ycol, color="symbol", title=chart_title)
+    price_fig.update_layout(
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"],
+        legend_title_text="Ticker",
+        xaxis=dict(gridcolor=theme["GRID"]),
+        yaxis=dict(gridcolor=theme["GRID"]),
+        height=500,
+        margin=dict(l=40, r=20, t=40, b=40),
+    )
+    return price_fig
+
+
+def monthly_heatmap(mdf, season_year, theme):
+    """Symbol x month heatmap of monthly returns (the selected year, or the average)."""
+    if season_year != "ALL":
+        yr = int(season_year)
+        mdf2 = mdf[mdf["year"] == yr].copy()
+        title = f"Monthly Returns ({yr})"
+        heat_data = mdf2.pivot(index="symbol", columns="month", values="monthly_return")
+        heat_label = "Monthly Return"
+    else:
+        monthly_avg = mdf.groupby(["symbol", "month"])["monthly_return"].mean().reset_index()
+        title = "Average Monthly Returns"
+        heat_data = monthly_avg.pivot(index="symbol", columns="month", values="monthly_return")
+        heat_label = "Avg Monthly Return"
+
+    heat_data.columns = heat_data.columns.astype(str)
+    month_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+    heat = px.imshow(
+        heat_data,
+        color_continuous_scale="RdYlGn",
+        labels={"x": "Month", "y": "Ticker", "color": heat_label},
+        title=title
+    )
+    heat.update_xaxes(tickmode="array", tickvals=[str(i) for i in range(1, 13)], ticktext=month_labels)
+    heat.update_layout(
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"],
+        xaxis=dict(gridcolor=theme["GRID"]),
+        yaxis=dict(gridcolor=theme["GRID"]),
+        height=500,
+        margin=dict(l=80, r=20, t=40, b=40),
+    )
+    return heat
+
+
+def yearly_figure(ydf, season_year, theme):
+    yearly_title = "Yearly Returns" if season_year == "ALL" else f"Yearly Returns ({season_year})"
+    yearly_fig = px.line(ydf, x="year", y="yearly_return", color="symbol", markers=True, title=yearly_title)
+    yearly_fig.update_layout(
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"],
+        xaxis=dict(gridcolor=theme["GRID"]),
+        yaxis=dict(gridcolor=theme["GRID"]),
+        height=500,
+        margin=dict(l=40, r=20, t=40, b=40),
+    )
+    return yearly_fig
+
+
+def return_correlation(df):
+    pivot = df.pivot(index="date", columns="symbol", values="returns")
+    return pivot.corr()
+
+
+def correlation_figure(corr, season_year, theme):
+    symbols_list = corr.columns.tolist()
+    corr_title = "Return Correlation" if season_year == "ALL" else f"Return Correlation ({season_year})"
+
+    corr_fig = go.Figure()
+    corr_fig.add_trace(
+        go.Heatmap(
+            z=corr.values,
+            x=symbols_list,
+            y=symbols_list,
+            colorscale="RdBu",
+            zmid=0,
+            colorbar=dict(title="Correlation")
+        )
+    )
+    corr_fig.update_layout(
+        title=corr_title,
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"],
+        xaxis=dict(side="bottom"),
+        yaxis=dict(autorange="reversed"),
+        height=500,
+        margin=dict(l=100, r=50, t=40, b=100)
+    )
+    return corr_fig
@@ -1,5 +1,7 @@
-from dash import Input, Output
-from data.db import load_price_data
+from dash import Input, Output, State
+from dash.exceptions import PreventUpdate
+from data.catalog import available_years
+from data.registry import registry
 
 def register_control_callbacks(app):
     """Register dropdown and control callbacks."""
@@ -23,8 +25,19 @@ def register_control_callbacks(app):
     )
     def set_year_options(symbols):
         """Update year dropdown options based on selected symbols."""
-        df = load_price_data(symbols or [])
-        if df.empty:
+        years = available_years(symbols or [])
+        if not years:
             return [{"label": "ALL (Seasonality)", "value": "ALL"}]
-        years = sorted(df["date"].dt.year.dropna().unique().tolist())
         return [{"label": "ALL", "value": "ALL"}] + [{"label": str(y), "value": str(y)} for y in years]
+
+
+    @app.callback(
+        Output("symbols", "options"),
+        Input("symbols", "search_value"),
+        State("symbols", "value"),
+    )
+    def search_symbols(search_value, selected):
+        """Server-side ticker search, capped at SYMBOL_SEARCH_LIMIT; selected tickers stay in the options."""
+        if not search_value:
+            raise PreventUpdate
+        return registry.options((selected or []) + registry.search(search_value))
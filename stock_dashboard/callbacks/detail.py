@@ -0,0 +1,93 @@
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from dash import Input, Output, ctx
+
+from data.catalog import get_entry
+from data.bars import bars_for_range, LEVEL_NAMES, MA_WINDOWS
+from utils.instrumentation import stage
+
+RANGE_OFFSETS = {
+    "1M": pd.DateOffset(months=1),
+    "6M": pd.DateOffset(months=6),
+    "1Y": pd.DateOffset(years=1),
+    "5Y": pd.DateOffset(years=5),
+}
+
+MA_COLORS = {20: "#f39c12", 50: "#9b59b6"}
+
+
+def _relayout_range(relayout):
+    """(start, end) from a zoom/pan relayoutData, or None for autorange/other events."""
+    if not relayout:
+        return None
+    for axis in ("xaxis", "xaxis2"):
+        if f"{axis}.range[0]" in relayout:
+            return relayout[f"{axis}.range[0]"], relayout[f"{axis}.range[1]"]
+        if f"{axis}.range" in relayout:
+            return tuple(relayout[f"{axis}.range"])
+    return None
+
+
+def candlestick_figure(ticker, level, bars, x_range=None):
+    """Candles with moving averages over a volume panel, for one pyramid level."""
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.75, 0.25], vertical_spacing=0.03)
+    fig.add_trace(
+        go.Candlestick(
+            x=bars.index, open=bars["open"], high=bars["high"], low=bars["low"], close=bars["close"],
+            name=ticker,
+        ),
+        row=1, col=1,
+    )
+    for window in MA_WINDOWS:
+        fig.add_trace(
+            go.Scatter(x=bars.index, y=bars[f"ma{window}"], name=f"MA{window}",
+                       line=dict(width=1.4, color=MA_COLORS.get(window))),
+            row=1, col=1,
+        )
+    fig.add_trace(go.Bar(x=bars.index, y=bars["volume"], name="Volume", marker_color="#4da3ff", opacity=0.6), row=2, col=1)
+    fig.update_layout(
+        title=f"{ticker} • {LEVEL_NAMES[level]} candles ({len(bars)})",
+        xaxis_rangeslider_visible=False,
+        height=620,
+        margin=dict(l=40, r=20, t=50, b=30),
+        legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
+        uirevision=ticker,
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    return fig
+
+
+def register_detail_callbacks(app):
+    """Register the candlestick view for the technical section."""
+
+    @app.callback(
+        Output("detail-candles", "figure"),
+        Input("detail-ticker", "data"),
+        Input("detail-range", "value"),
+        Input("detail-candles", "relayoutData"),
+    )
+    def update_candles(ticker, range_key, relayout):
+        """Pick the pyramid level that fits the selected or zoomed range."""
+        if not ticker:
+            return go.Figure()
+
+        x_range = _relayout_range(relayout) if ctx.triggered_id == "detail-candles" else None
+        if x_range is not None:
+            start, end = x_range
+        else:
+            end = None
+            offset = RANGE_OFFSETS.get(range_key)
+            start = None
+            if offset is not None:
+                entry = get_entry(ticker)
+                if entry is not None:
+                    start = pd.Timestamp(entry["max_date"]) - offset
+
+        with stage("candles"):
+            result = bars_for_range(ticker, start, end)
+            if result is None:
+                return go.Figure(layout={"title": f"No data for {ticker}"})
+            level, bars = result
+            return candlestick_figure(ticker, level, bars, x_range)
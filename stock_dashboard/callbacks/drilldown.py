@@ -1,5 +1,7 @@
 from dash import Input, Output, State
+import pandas as pd
 from data.db import load_price_data
+from data.catalog import get_entry
 from utils.metrics import add_returns
 from components.cards import card_style
 from config.theme import DARK, LIGHT
@@ -24,43 +26,33 @@ def register_drilldown_callback(app):
             return None
 
         theme = DARK if mode == "dark" else LIGHT
-        df = load_price_data(symbols or [])
-        
-        if df.empty:
-            return html.Div("No Data", style={"color": theme["TEXT"]})
-
-        df = add_returns(df)
 
         # Extract clicked symbol and month
         pt = clickData["points"][0]
         month = int(pt["x"])
         sym = str(pt["y"])
 
-        df_sym = df[df["symbol"] == sym]
-        year = int(df_sym["date"].dt.year.max()) if season_year == "ALL" else int(season_year)
+        entry = get_entry(sym) if sym in (symbols or []) else None
+        if entry is None:
+            return html.Div("No Data", style={"color": theme["TEXT"]})
+        year = pd.Timestamp(entry["max_date"]).year if season_year == "ALL" else int(season_year)
+
+        # Only this symbol's month, plus a few days before it so the first daily return is defined
+        month_start = pd.Timestamp(year=year, month=month, day=1)
+        month_end = month_start + pd.offsets.MonthBegin(1) - pd.Timedelta(milliseconds=1)
+        df = load_price_data([sym], start=month_start - pd.Timedelta(days=10), end=month_end)
+
+        if df.empty:
+            return html.Div(f"{sym} • {year}-{month:02d} (No data)", style={"color": theme["TEXT"]})
 
-        sdf = df_sym[(df_sym["date"].dt.year == year) & (df_sym["date"].dt.month == month)]
+        df = add_returns(df)
+        sdf = df[(df["date"].dt.year == year) & (df["date"].dt.month == month)]
         
         if sdf.empty:
             return html.Div(f"{sym} • {year}-{month:02d} (No data)", style={"color": theme["TEXT"]})
 
-        # Calculate stats
-        first_close = float(sdf["close"].iloc[0])
-        last_close = float(sdf["close"].iloc[-1])
-        mret = (last_close - first_close) / first_close
-        peak = sdf["close"].cummax()
-        dd = (sdf["close"] / peak - 1).min()
-        vol = float(sdf["returns"].std() * (252 ** 0.5))
-
-        # Create chart
-        fig = px.line(sdf, x="date", y="close", title=f"{sym} Daily Close • {year}-{month:02d}")
-        fig.update_layout(
-            paper_bgcolor=theme["CARD_BG"],
-            plot_bgcolor=theme["CARD_BG"],
-            font_color=theme["TEXT"],
-            xaxis=dict(gridcolor=theme["GRID"]),
-            yaxis=dict(gridcolor=theme["GRID"]),
-        )
+        mret, vol, dd = month_stats(sdf)
+        fig = month_figure(sdf, sym, year, month, theme)
 
         return html.Div(
             style={
@@ -93,4 +85,27 @@ def register_drilldown_callback(app):
                     ]
                 )
             ]
-        )
\ No newline at end of file
+        )
+
+
+def month_stats(sdf):
+    """(return, annualized in-month vol, in-month max drawdown) for one symbol-month of bars with ``returns``."""
+    first_close = float(sdf["close"].iloc[0])
+    last_close = float(sdf["close"].iloc[-1])
+    mret = (last_close - first_close) / first_close
+    peak = sdf["close"].cummax()
+    dd = (sdf["close"] / peak - 1).min()
+    vol = float(sdf["returns"].std() * (252 ** 0.5))
+    return mret, vol, dd
+
+
+def month_figure(sdf, sym, year, month, theme):
+    fig = px.line(sdf, x="date", y="close", title=f"{sym} Daily Close • {year}-{month:02d}")
+    fig.update_layout(
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"],
+        xaxis=dict(gridcolor=theme["GRID"]),
+        yaxis=dict(gridcolor=theme["GRID"]),
+    )
+    return fig
@@ -0,0 +1,139 @@
+"""
+Live mode: while the Live switch is on and the view reaches the present (all
+years, or the current one), ``live_interval`` polls for bars newer than the
+ones on screen and pushes only those through ``price_chart.extendData``.
+The cursor starts from the last bar ``update`` drew per symbol (the
+``live_view`` store), so bars stored after the redraw are appended, not
+skipped. KPI cards are re-rendered from running totals in ``live_cursor``
+(see utils/live.py) instead of re-running ``update``. The risk windows the
+cursor covers are recomputed into the ``risk_surface`` store, which
+``render_risk_cards`` draws; longer windows keep the values of the last full
+update.
+"""
+import os
+
+import pandas as pd
+from dash import Input, Output, State, no_update
+from dash.exceptions import PreventUpdate
+
+from data.db import load_price_data, fetch_new_bars
+from utils.instrumentation import stage
+from utils.metrics import add_returns, RISK_WINDOWS
+from utils.live import init_cursor, advance_cursor, kpi_series, risk_frame, RISK_WINDOW
+from callbacks.charts import kpi_cards, window_cards, SPARK_POINTS
+from config.theme import DARK, LIGHT
+
+LIVE_INTERVAL_MS = int(os.getenv("LIVE_INTERVAL_MS", "5000"))
+
+VIEW_STATES = [
+    State("symbols", "value"),
+    State("metric", "value"),
+    State("scale_mode", "value"),
+    State("season_year", "value"),
+    State("theme_store", "data"),
+]
+
+
+def live_risk_data(risk_data, cursor):
+    """``risk_data`` with every window of at most RISK_WINDOW returns rescored from ``cursor``."""
+    data = dict(risk_data or {})
+    for window in RISK_WINDOWS:
+        if window > RISK_WINDOW:
+            continue
+        scored = risk_frame(cursor, window)
+        if scored.empty:
+            data[str(window)] = []
+            continue
+        previous = {r["symbol"]: r["trend"] for r in data.get(str(window), [])}
+        trends = {
+            sym: (previous.get(sym, []) + [round(float(vol), 4)])[-SPARK_POINTS:]
+            for sym, vol in zip(scored["symbol"], scored["ann_vol"])
+        }
+        data[str(window)] = window_cards(scored, trends)
+    return data
+
+
+def follows_new_bars(live, season_year):
+    """Whether the view can still grow: Live on, showing all years or the current one."""
+    if "on" not in (live or []):
+        return False
+    return season_year == "ALL" or int(season_year) >= pd.Timestamp.today().year
+
+
+def drawn_bars(symbols, live_view):
+    """Each charted symbol's bars up to the last one ``update`` drew (``live_view``), with returns."""
+    drawn = pd.Series(
+        {sym: pd.Timestamp(d) for sym, d in (live_view or {}).items() if sym in symbols}, dtype="datetime64[ns]"
+    )
+    if drawn.empty:
+        return pd.DataFrame()
+    df = load_price_data(sorted(drawn.index), end=drawn.max())
+    if df.empty:
+        return df
+    df = add_returns(df)
+    return df[df["date"] <= df["symbol"].map(drawn)]
+
+
+def register_live_callbacks(app):
+    """Register the live toggle and the polling tick."""
+
+    @app.callback(
+        Output("live_interval", "disabled"),
+        Output("live_cursor", "data", allow_duplicate=True),
+        Input("live_toggle", "value"),
+        Input("symbols", "value"),
+        Input("metric", "value"),
+        Input("scale_mode", "value"),
+        Input("season_year", "value"),
+        Input("theme_store", "data"),
+        prevent_initial_call=True,
+    )
+    def reset_live(live, symbols, metric, scale_mode, season_year, mode):
+        """
+        Any change that makes ``update`` redraw invalidates the cursor; the next
+        tick rebuilds it. A past year never gets new bars, so it isn't polled.
+        """
+        return not follows_new_bars(live, season_year), None
+
+    @app.callback(
+        Output("price_chart", "extendData"),
+        Output("kpi_grid", "children", allow_duplicate=True),
+        Output("risk_surface", "data", allow_duplicate=True),
+        Output("live_cursor", "data"),
+        Input("live_interval", "n_intervals"),
+        State("live_cursor", "data"),
+        State("risk_surface", "data"),
+        State("live_view", "data"),
+        *VIEW_STATES,
+        prevent_initial_call=True,
+    )
+    def live_tick(_, cursor, risk_data, live_view, symbols, metric, scale_mode, season_year, mode):
+        """Append new bars to the price chart and refresh KPI/risk cards from running totals."""
+        symbols = symbols or []
+        if cursor is None:
+            with stage("live_init"):
+                df = drawn_bars(symbols, live_view)
+                if df.empty:
+                    raise PreventUpdate
+                state = init_cursor(df, season_year)
+            return no_update, no_update, no_update, state
+
+        with stage("live_poll"):
+            bars = fetch_new_bars({sym: st["last_date"] for sym, st in cursor.items()})
+        if bars.empty:
+            raise PreventUpdate
+
+        with stage("live_advance"):
+            points = advance_cursor(cursor, bars, metric, scale_mode, season_year)
+        if not points:
+            raise PreventUpdate
+
+        syms = sorted(points)
+        extend = (
+            {"x": [points[s][0] for s in syms], "y": [points[s][1] for s in syms]},
+            [cursor[s]["trace"] for s in syms],
+        )
+        theme = DARK if mode == "dark" else LIGHT
+        latest, monthly, yearly, cagr, vol, sharpe = kpi_series(cursor)
+        kpis = kpi_cards(theme, len(symbols), season_year, latest, monthly, yearly, cagr, vol, sharpe)
+        return extend, kpis, live_risk_data(risk_data, cursor), cursor
@@ -0,0 +1,197 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+from dash import Input, Output, html
+
+from data.db import load_price_data
+from data.catalog import has_data, data_versions
+from utils.instrumentation import stage, cache_event
+from utils.metrics import add_returns
+from utils.portfolio import RF, return_stats, sample_weights, evaluate, efficient_frontier, drawdowns
+from config.theme import DARK, LIGHT, ACCENT, SAFE, WARN
+from callbacks.charts import empty_figure
+
+PORTFOLIO_SAMPLES = int(os.getenv("PORTFOLIO_SAMPLES", "10000"))
+# Sampled portfolios drawn in the cloud; the frontier always uses every sample
+PORTFOLIO_PLOT_POINTS = int(os.getenv("PORTFOLIO_PLOT_POINTS", "3000"))
+
+# Evaluated baskets keyed by symbols, year and data versions
+PORTFOLIO_CACHE_SIZE = 16
+_portfolios = OrderedDict()
+_lock = threading.Lock()
+
+
+def _portfolio_key(symbols, season_year):
+    syms = tuple(sorted(set(symbols)))
+    versions = data_versions(syms)
+    return syms, season_year, tuple(versions.get(s) for s in syms)
+
+
+def analyze_basket(symbols, season_year):
+    """
+    Covariance, sampled portfolios and frontier for ``symbols``; cached until
+    the data version of any symbol changes. Returns None without data, or
+    when no portfolio has a Sharpe ratio (every price flat over the period).
+    """
+    key = _portfolio_key(symbols, season_year)
+    with _lock:
+        cached = _portfolios.get(key)
+        if cached is not None:
+            _portfolios.move_to_end(key)
+    cache_event("portfolio", cached is not None)
+    if cached is not None:
+        return cached
+
+    with stage("load"):
+        df = load_price_data(list(key[0])) if has_data(key[0]) else None
+    if df is None or df.empty:
+        return None
+    df = add_returns(df)
+    if season_year != "ALL":
+        df = df[df["date"].dt.year == int(season_year)]
+
+    with stage("portfolio_covariance"):
+        stats = return_stats(df)
+    if stats["mu"] is None:
+        return None
+
+    n = len(stats["symbols"])
+    with stage("portfolio_evaluate"):
+        weights = sample_weights(PORTFOLIO_SAMPLES, n)
+        scores = evaluate(stats, weights)
+        if not np.isfinite(scores["sharpe"]).any():
+            return None
+        frontier = efficient_frontier(scores["ret"], scores["vol"])
+        best = int(np.nanargmax(scores["sharpe"]))
+        safest = int(np.argmin(scores["vol"]))
+        equal = np.full((1, n), 1.0 / n)
+        picks = np.vstack([weights[frontier], weights[[best, safest]], equal])
+
+    with stage("portfolio_drawdown"):
+        dd = drawdowns(stats, picks)
+
+    result = {
+        "stats": stats,
+        "weights": weights,
+        "scores": scores,
+        "frontier": frontier,
+        "frontier_dd": dd[:len(frontier)],
+        "best": best,
+        "safest": safest,
+        "special_dd": dd[len(frontier):],
+        "equal": evaluate(stats, equal),
+    }
+    with _lock:
+        _portfolios[key] = result
+        while len(_portfolios) > PORTFOLIO_CACHE_SIZE:
+            _portfolios.popitem(last=False)
+    return result
+
+
+def _mix(symbols, w, top=6):
+    order = np.argsort(w)[::-1][:top]
+    return ", ".join(f"{symbols[i]} {w[i]:.0%}" for i in order if w[i] >= 0.005)
+
+
+def frontier_figure(result, season_year, theme):
+    """Sampled portfolio cloud coloured by Sharpe, the frontier and the notable picks."""
+    stats, scores, weights = result["stats"], result["scores"], result["weights"]
+    symbols = stats["symbols"]
+    cloud = slice(0, PORTFOLIO_PLOT_POINTS)
+    frontier = result["frontier"]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=scores["vol"][cloud], y=scores["ret"][cloud], mode="markers", name="Portfolios",
+        marker=dict(size=4, color=scores["sharpe"][cloud], colorscale="Viridis", opacity=0.6,
+                    colorbar=dict(title="Sharpe")),
+        hovertemplate="Vol %{x:.2%}<br>Return %{y:.2%}<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=scores["vol"][frontier], y=scores["ret"][frontier], mode="lines+markers", name="Efficient frontier",
+        line=dict(color=ACCENT, width=2), marker=dict(size=5),
+        customdata=np.column_stack([scores["sharpe"][frontier], result["frontier_dd"]]),
+        text=[_mix(symbols, w, top=3) for w in weights[frontier]],
+        hovertemplate="Vol %{x:.2%}<br>Return %{y:.2%}<br>Sharpe %{customdata[0]:.2f}"
+                      "<br>Max DD %{customdata[1]:.2%}<br>%{text}<extra></extra>",
+    ))
+
+    single_vol = np.sqrt(np.diag(stats["cov"]))
+    fig.add_trace(go.Scatter(
+        x=single_vol, y=stats["mu"], mode="markers+text", name="Tickers", text=symbols,
+        textposition="top center", marker=dict(size=7, color=theme["MUTED"], symbol="diamond"),
+        hovertemplate="%{text}<br>Vol %{x:.2%}<br>Return %{y:.2%}<extra></extra>",
+    ))
+
+    labelled = [
+        ("Max Sharpe", scores["ret"][result["best"]], scores["vol"][result["best"]], result["special_dd"][0], SAFE),
+        ("Min volatility", scores["ret"][result["safest"]], scores["vol"][result["safest"]], result["special_dd"][1], WARN),
+        ("Equal weight", result["equal"]["ret"][0], result["equal"]["vol"][0], result["special_dd"][2], theme["TEXT"]),
+    ]
+    for name, ret, vol, dd, color in labelled:
+        fig.add_trace(go.Scatter(
+            x=[vol], y=[ret], mode="markers", name=name,
+            marker=dict(size=14, color=color, symbol="star", line=dict(width=1, color=theme["CARD_BG"])),
+            hovertemplate=f"{name}<br>Vol %{{x:.2%}}<br>Return %{{y:.2%}}<br>Max DD {dd:.2%}<extra></extra>",
+        ))
+
+    title = "Portfolio Frontier" if season_year == "ALL" else f"Portfolio Frontier ({season_year})"
+    fig.update_layout(
+        title=f"{title} • {len(scores['ret']):,} portfolios, {len(symbols)} tickers",
+        paper_bgcolor=theme["CARD_BG"],
+        plot_bgcolor=theme["CARD_BG"],
+        font_color=theme["TEXT"],
+        xaxis=dict(title="Annualized volatility", tickformat=".0%", gridcolor=theme["GRID"]),
+        yaxis=dict(title="Annualized return", tickformat=".0%", gridcolor=theme["GRID"]),
+        legend=dict(orientation="h", y=-0.15),
+        height=560,
+        margin=dict(l=60, r=20, t=50, b=40),
+    )
+    return fig
+
+
+def portfolio_summary(result, theme):
+    """Weights of the max-Sharpe and min-volatility portfolios."""
+    stats, scores, weights = result["stats"], result["scores"], result["weights"]
+    rows = []
+    for name, idx, dd in (("Max Sharpe", result["best"], result["special_dd"][0]),
+                          ("Min volatility", result["safest"], result["special_dd"][1])):
+        rows.append(html.Div([
+            html.Span(f"{name}: ", style={"fontWeight": "700"}),
+            html.Span(
+                f"return {scores['ret'][idx]:.2%}, vol {scores['vol'][idx]:.2%}, "
+                f"Sharpe {scores['sharpe'][idx]:.2f} (rf={RF:.0%}), max DD {dd:.2%} — "
+                f"{_mix(stats['symbols'], weights[idx])}"
+            ),
+        ]))
+    rows.append(html.Div(
+        f"Covariance over {stats['days']} common trading days; long-only, daily rebalanced.",
+        style={"color": theme["MUTED"], "marginTop": "4px"},
+    ))
+    return html.Div(rows, style={"fontSize": "12px", "color": theme["TEXT"]})
+
+
+def register_portfolio_callbacks(app):
+    """Register the portfolio frontier panel."""
+
+    @app.callback(
+        Output("portfolio_frontier", "figure"),
+        Output("portfolio_summary", "children"),
+        Input("symbols", "value"),
+        Input("season_year", "value"),
+        Input("theme_store", "data"),
+    )
+    def update_portfolio(symbols, season_year, mode):
+        """Evaluate sampled portfolios for the selected basket."""
+        theme = DARK if mode == "dark" else LIGHT
+        if not symbols or len(symbols) < 2:
+            return empty_figure(theme, "Select at least two tickers"), []
+
+        with stage("portfolio"):
+            result = analyze_basket(symbols, season_year)
+        if result is None:
+            return empty_figure(theme, "Not enough overlapping price history"), []
+        return frontier_figure(result, season_year, theme), portfolio_summary(result, theme)
@@ -1,53 +1,97 @@
 # callbacks/tabs.py
-from dash import Input, Output, callback, html, dcc
+from dash import Input, Output, State, callback, html, dcc
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 
+from data.registry import registry
 from fundamentals.fundamentals import get_fundamentals
+from components.technical import technical_section
+
+HIDDEN = {"display": "none"}
+VISIBLE = {}
+
+
+def fundamentals_layout():
+    """Fundamental Analysis worksheet pane."""
+    defaults = registry.default_symbols()
+    initial = "NVDA" if "NVDA" in defaults else (defaults[0] if defaults else None)
+    return dbc.Container([
+        html.H2("Fundamental Analysis Worksheet", className="mt-4 mb-4 text-primary"),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Stock", className="fw-bold mb-2"),
+                dcc.Dropdown(
+                    id="fund-stock-dropdown",
+                    options=registry.options(defaults),
+                    value=initial,
+                    clearable=False,
+                    searchable=True,
+                    className="mb-4"
+                ),
+            ], width=4)
+        ]),
+        html.Div(id="fund-details"),
+        dcc.Store(id="fund-details-ticker"),
+        html.H2("Technical Analysis", className="mt-5 mb-3"),
+        technical_section(initial),
+    ], fluid=True)
 
-# List of your stocks (keep consistent with your main list)
-SYMBOLS = ["AMZN", "MSFT", "NVDA", "TSLA", "META", "GOOGL", "NFLX", "INTC", "BABA"]
 
 @callback(
-    Output("tab-content", "children"),
+    Output("home-pane", "style"),
+    Output("fundamentals-pane", "style"),
     Input("main-tabs", "active_tab")
 )
 def render_tab_content(active_tab):
+    """
+    Both panes are mounted once in app.layout; switching tabs only toggles
+    visibility, so controls, figures and their callbacks are left untouched.
+    """
+    if active_tab == "fundamentals":
+        return HIDDEN, VISIBLE
+    return VISIBLE, HIDDEN
+
+
+@callback(
+    Output("fund-stock-dropdown", "options"),
+    Input("fund-stock-dropdown", "search_value"),
+    State("fund-stock-dropdown", "value"),
+)
+def search_fund_symbols(search_value, selected):
+    """Server-side ticker search; the selected ticker stays in the options."""
+    if not search_value:
+        raise PreventUpdate
+    return registry.options([selected] + registry.search(search_value))
+
 
-    if active_tab == "home":
-        # Import here to avoid circular imports
-        from components.layout import create_layout
-        return create_layout()
-
-    elif active_tab == "fundamentals":
-        return dbc.Container([
-            html.H2("Fundamental Analysis Worksheet", className="mt-4 mb-4 text-primary"),
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Select Stock", className="fw-bold mb-2"),
-                    dcc.Dropdown(
-                        id="fund-stock-dropdown",
-                        options=[{"label": s, "value": s} for s in SYMBOLS],
-                        value="NVDA",
-                        clearable=False,
-                        searchable=True,
-                        className="mb-4"
-                    ),
-                ], width=4)
-            ]),
-            html.Div(id="fund-details")
-        ], fluid=True)
+@callback(
+    Output("detail-ticker", "data"),
+    Input("fund-stock-dropdown", "value"),
+    prevent_initial_call=True,
+)
+def select_detail_ticker(ticker):
+    return ticker
 
 
 @callback(
     Output("fund-details", "children"),
-    Input("fund-stock-dropdown", "value")
+    Output("fund-details-ticker", "data"),
+    Input("fund-stock-dropdown", "value"),
+    Input("main-tabs", "active_tab"),
+    State("fund-details-ticker", "data"),
 )
-def update_fund_details(ticker):
+def update_fund_details(ticker, active_tab, shown):
+    """
+    Built the first time the Fundamental Analysis tab is shown, then only
+    when the ticker changes; page loads on Home don't read fundamentals.
+    """
+    if active_tab != "fundamentals" or (shown is not None and ticker == shown):
+        raise PreventUpdate
     if not ticker:
-        return html.Div("Select a stock above.", className="text-muted")
+        return html.Div("Select a stock above.", className="text-muted"), None
 
     ticker = ticker.upper()
-    fundamentals = get_fundamentals(ticker)  # Live yfinance data
+    fundamentals = get_fundamentals(ticker)  # Local store, kept warm by fundamentals.prefetch
 
     # Create responsive cards for each fundamental metric
     fund_cards = dbc.Row([
@@ -100,5 +144,5 @@ def update_fund_details(ticker):
         html.Hr(),
         fund_cards,
         recommendation
-    ])
+    ]), ticker
     
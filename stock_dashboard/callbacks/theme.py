@@ -39,6 +39,7 @@ def register_theme_callbacks(app):
         Output("corr_card", "style"),
         Output("monthly_card", "style"),
         Output("yearly_card", "style"),
+        Output("portfolio_card", "style"),
         Output("kpi_grid", "style"),
         Input("theme_store", "data")
     )
@@ -48,5 +49,5 @@ def register_theme_callbacks(app):
         base = {"backgroundColor": theme["APP_BG"], "minHeight": "100vh", "padding": "16px", "color": theme["TEXT"]}
         c = {**card_style(theme)}
         grid = {"display": "grid", "gridTemplateColumns": "repeat(4,1fr)", "gap": "14px"}
-        return base, c, c, c, c, c, grid
+        return base, c, c, c, c, c, c, grid
 
@@ -1,4 +1,4 @@
-from dash import html
+from dash import dcc, html
 from config.theme import ACCENT, SAFE, WARN, DANGER
 
 def card_style(theme):
@@ -39,24 +39,46 @@ def risk_chip_color(score):
         return DANGER, "Extreme"
 
 
-def risk_card(theme, sym, score, ann_vol, max_dd):
-    """Creates a risk metric card for a single symbol."""
+def risk_card(theme, sym, score, ann_vol, max_dd, trend=None):
+    """Creates a risk metric card for a single symbol, with an optional volatility sparkline."""
     color, label = risk_chip_color(score)
+    children = [
+        html.Div(sym, style={"fontSize": "13px", "letterSpacing": "1px", "color": theme["MUTED"]}),
+        html.Div(f"{score:.2f}/100", style={"fontSize": "34px", "fontWeight": "900", "marginTop": "6px", "color": theme["TEXT"]}),
+        html.Div(label + " Risk", style={"fontSize": "12px", "fontWeight": "700", "color": color}),
+        html.Div(f"Ann Vol: {ann_vol:.2%}  |  Max DD: {max_dd:.2%}", style={"fontSize": "12px", "marginTop": "8px", "color": theme["MUTED"]})
+    ]
+    if trend:
+        children.append(dcc.Graph(
+            figure=sparkline(trend, color),
+            config={"displayModeBar": False, "staticPlot": True},
+            style={"height": "40px", "marginTop": "6px"},
+        ))
     return html.Div(
         style={
             **card_style(theme),
             "minWidth": "260px",
             "background": f"linear-gradient(180deg, {color}18, {theme['CARD_BG']})",
         },
-        children=[
-            html.Div(sym, style={"fontSize": "13px", "letterSpacing": "1px", "color": theme["MUTED"]}),
-            html.Div(f"{score:.2f}/100", style={"fontSize": "34px", "fontWeight": "900", "marginTop": "6px", "color": theme["TEXT"]}),
-            html.Div(label + " Risk", style={"fontSize": "12px", "fontWeight": "700", "color": color}),
-            html.Div(f"Ann Vol: {ann_vol:.2%}  |  Max DD: {max_dd:.2%}", style={"fontSize": "12px", "marginTop": "8px", "color": theme["MUTED"]})
-        ]
+        children=children,
     )
 
-from dash import dcc
+
+def sparkline(values, color):
+    """Axis-free line figure for a small trend, scaled to its own range."""
+    return {
+        "data": [{"type": "scatter", "mode": "lines", "y": values, "line": {"color": color, "width": 2}, "hoverinfo": "skip"}],
+        "layout": {
+            "height": 40,
+            "margin": {"l": 0, "r": 0, "t": 2, "b": 2},
+            "xaxis": {"visible": False},
+            "yaxis": {"visible": False},
+            "paper_bgcolor": "rgba(0,0,0,0)",
+            "plot_bgcolor": "rgba(0,0,0,0)",
+            "showlegend": False,
+        },
+    }
+
 
 def nvda_stock_link():
     """Return a navigation link component to the NVDA stock page."""
@@ -1,9 +1,13 @@
 from dash import dcc, html
 
-SYMBOLS = ["AMZN", "MSFT", "NVDA", "TSLA", "META", "GOOGL", "NFLX", "INTC", "BABA"]
+from data.registry import registry
+from callbacks.live import LIVE_INTERVAL_MS
+from utils.metrics import RISK_WINDOWS
 
 def create_layout():
     """Create main page layout."""
+    # Options start as the default selection; search_symbols fills the rest on demand
+    defaults = registry.default_symbols()
     return html.Div(
     id="page",
     className="light-theme",
@@ -11,6 +15,9 @@ def create_layout():
         dcc.Store(id="theme_store", data="light"),
         dcc.Store(id="heat_click_store"),
         dcc.Store(id="global_state", storage_type="memory"),
+        dcc.Store(id="live_cursor"),
+        dcc.Store(id="live_view"),
+        dcc.Interval(id="live_interval", interval=LIVE_INTERVAL_MS, disabled=True),
         
         # Header
         html.Div(
@@ -87,7 +94,7 @@ def create_layout():
                     children=[
                         html.Div([
                             html.Div("Tickers", style={"opacity": 0.8}),
-                            dcc.Dropdown(id="symbols", options=[{"label": s, "value": s} for s in SYMBOLS], value=SYMBOLS, multi=True, className="dark-dropdown"),
+                            dcc.Dropdown(id="symbols", options=registry.options(defaults), value=defaults, multi=True, placeholder="Search tickers…", className="dark-dropdown"),
                         ]),
                         html.Div([
                             html.Div("Price Metric", style={"opacity": 0.8}),
@@ -108,10 +115,15 @@ def create_layout():
                             html.Div("Year", style={"opacity": 0.8}),
                             dcc.Dropdown(id="season_year", options=[{"label": "ALL", "value": "ALL"}], value="ALL", className="dark-dropdown"),
                         ]),
+                        html.Div([
+                            html.Div("Live", style={"opacity": 0.8}),
+                            dcc.Checklist(id="live_toggle", options=[{"label": " Stream new bars", "value": "on"}], value=[]),
+                        ]),
                     ]
                 )
             ],
         ),
+        html.Progress(id="update_progress", value="0", max="6", style={"display": "none"}),
         html.Br(),
 
         # KPI Grid
@@ -140,7 +152,28 @@ def create_layout():
         ),
         html.Br(),
 
+        # Portfolio Frontier
+        html.Div(id="portfolio_card", children=[
+            dcc.Graph(id="portfolio_frontier"),
+            html.Div(id="portfolio_summary"),
+        ]),
+        html.Br(),
+
         # Risk Cards
+        dcc.Store(id="risk_surface"),
+        html.Div(
+            style={"display": "flex", "gap": "10px", "alignItems": "center", "marginBottom": "8px"},
+            children=[
+                html.Div("Risk window", style={"opacity": 0.8}),
+                dcc.RadioItems(
+                    id="risk_window",
+                    options=[{"label": f"{w}d", "value": w} for w in RISK_WINDOWS],
+                    value=30,
+                    inline=True,
+                    inputStyle={"marginRight": "4px", "marginLeft": "10px"},
+                ),
+            ],
+        ),
         html.Div(id="risk_cards", style={"display": "flex", "gap": "12px", "flexWrap": "wrap"}),
 
         # Month Drilldown Modal
@@ -0,0 +1,24 @@
+from dash import dcc, html
+
+RANGES = [
+    {"label": "1M", "value": "1M"},
+    {"label": "6M", "value": "6M"},
+    {"label": "1Y", "value": "1Y"},
+    {"label": "5Y", "value": "5Y"},
+    {"label": "Max", "value": "MAX"},
+]
+
+
+def technical_section(ticker=None):
+    """Candlestick + moving averages + volume for one ticker (see callbacks/detail.py)."""
+    return html.Div([
+        dcc.Store(id="detail-ticker", data=ticker),
+        dcc.RadioItems(
+            id="detail-range",
+            options=RANGES,
+            value="1Y",
+            inline=True,
+            inputStyle={"marginRight": "4px", "marginLeft": "12px"},
+        ),
+        dcc.Graph(id="detail-candles", style={"height": "620px"}),
+    ])
@@ -0,0 +1,123 @@
+"""
+OHLCV bar pyramid for candlestick views.
+
+For each symbol the daily OHLCV bars are loaded once per catalog data
+version and resampled into weekly, monthly and quarterly levels, each with
+its own moving averages. ``bars_for_range`` picks the finest level that
+keeps the visible range under MAX_CANDLES, so a multi-year view sends a few
+hundred candles instead of every trading day.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from data.db import db, _colname, consolidated, PRICES_COLLECTION
+from data.catalog import data_version
+from utils.instrumentation import stage, cache_event
+
+# Finest to coarsest: label, pandas resample rule (None = daily as stored)
+LEVELS = [("D", None), ("W", "W-FRI"), ("M", "ME"), ("Q", "QE")]
+LEVEL_NAMES = {"D": "Daily", "W": "Weekly", "M": "Monthly", "Q": "Quarterly"}
+
+# Moving-average lengths, in bars of the level being shown
+MA_WINDOWS = (20, 50)
+
+MAX_CANDLES = int(os.getenv("MAX_CANDLES", "400"))
+PYRAMID_CACHE_SIZE = int(os.getenv("BAR_PYRAMID_CACHE_SIZE", "64"))
+
+_OHLCV = {"_id": 0, "date": 1, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
+
+_pyramids = OrderedDict()     # symbol -> (data version, {level: DataFrame})
+_lock = threading.Lock()
+
+
+def load_ohlcv(sym):
+    """Daily OHLCV for ``sym``; missing open/high/low fall back to close."""
+    with stage("mongo_fetch"):
+        if consolidated():
+            cursor = db[PRICES_COLLECTION].find({"symbol": sym}, _OHLCV).sort("date", 1)
+        else:
+            cursor = db[_colname(sym)].find({}, _OHLCV).sort("date", 1)
+        rows = list(cursor)
+
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date", "close"])
+    for col in ("open", "high", "low"):
+        df[col] = pd.to_numeric(df[col], errors="coerce") if col in df else pd.NA
+        df[col] = df[col].fillna(df["close"])
+    df["volume"] = pd.to_numeric(df.get("volume", 0), errors="coerce").fillna(0)
+    return df.set_index("date")[["open", "high", "low", "close", "volume"]]
+
+
+def _with_averages(bars):
+    for window in MA_WINDOWS:
+        bars[f"ma{window}"] = bars["close"].rolling(window, min_periods=window).mean()
+    return bars
+
+
+def build_pyramid(daily):
+    """``{level: DataFrame}`` from daily OHLCV indexed by date."""
+    levels = {}
+    for level, rule in LEVELS:
+        if rule is None:
+            bars = daily.copy()
+        else:
+            bars = daily.resample(rule).agg(
+                {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+            ).dropna(subset=["close"])
+        levels[level] = _with_averages(bars)
+    return levels
+
+
+def get_pyramid(sym):
+    """Cached pyramid for ``sym`` at its current data version (None without data)."""
+    version = data_version(sym)
+    if version is None:
+        return None
+
+    with _lock:
+        cached = _pyramids.get(sym)
+        hit = cached is not None and cached[0] == version
+        if hit:
+            _pyramids.move_to_end(sym)
+    cache_event("bar_pyramid", hit)
+    if hit:
+        return cached[1]
+
+    daily = load_ohlcv(sym)
+    if daily.empty:
+        return None
+    with stage("bar_pyramid"):
+        pyramid = build_pyramid(daily)
+
+    with _lock:
+        _pyramids[sym] = (version, pyramid)
+        while len(_pyramids) > PYRAMID_CACHE_SIZE:
+            _pyramids.popitem(last=False)
+    return pyramid
+
+
+def bars_for_range(sym, start=None, end=None, max_candles=MAX_CANDLES):
+    """
+    Return ``(level, bars)`` for ``start``..``end`` (None = open-ended) at the
+    finest level with at most ``max_candles`` bars in range, or None.
+    Moving averages are computed over each whole level, so they are already
+    populated at ``start``.
+    """
+    pyramid = get_pyramid(sym)
+    if pyramid is None:
+        return None
+
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    for level, _ in LEVELS:
+        bars = pyramid[level]
+        lo = bars.index.searchsorted(start, "left") if start is not None else 0
+        hi = bars.index.searchsorted(end, "right") if end is not None else len(bars)
+        if hi - lo <= max_candles or level == LEVELS[-1][0]:
+            return level, bars.iloc[lo:hi]
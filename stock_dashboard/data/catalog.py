@@ -0,0 +1,213 @@
+"""
+Per-symbol metadata catalog.
+
+Keeps one small document per ticker in the ``symbol_catalog`` collection with
+its first/last date, row count and the time the data last changed. Controls
+(year dropdown, empty-data checks) and cache invalidation read from here
+instead of scanning full price histories.
+
+Besides the date range and row count, a probe reads the newest document
+``_id`` (moves on every insert, including a delete-and-reload) and the newest
+bar ``updated_at`` stamp. Loaders that correct bars in place must set
+``updated_at`` on the rows they touch (indexed on the per-symbol
+collections), otherwise the change is not seen.
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from data.db import db, _colname, consolidated, list_symbols, PRICES_COLLECTION
+from utils.instrumentation import cache_event
+
+logger = logging.getLogger(__name__)
+
+CATALOG_COLLECTION = "symbol_catalog"
+
+# Seconds an in-process catalog entry is trusted before it is re-probed.
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", "30"))
+
+# A change in any of these stamps a new ``updated_at``
+_PROBED_FIELDS = ("min_date", "max_date", "rows", "last_id", "last_write")
+
+_entries = {}      # symbol -> (checked_at, entry or None)
+_lock = threading.Lock()
+
+
+def _now():
+    """UTC timestamp at the precision Mongo stores, so round-trips compare equal."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def _probe(sym: str):
+    """Read min/max date, row count and write markers for one symbol using indexed lookups."""
+    if consolidated():
+        return _probe_many([sym]).get(sym)
+    name = _colname(sym)
+    col = db[name]
+    first = col.find_one({}, {"_id": 0, "date": 1}, sort=[("date", 1)])
+    if first is None:
+        return None
+    last = col.find_one({}, {"_id": 0, "date": 1}, sort=[("date", -1)])
+    newest = col.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    touched = col.find_one(
+        {"updated_at": {"$exists": True}}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)]
+    )
+    return {
+        "symbol": sym,
+        "collection": name,
+        "min_date": first["date"],
+        "max_date": last["date"],
+        "rows": col.estimated_document_count(),
+        "last_id": newest["_id"],
+        "last_write": touched["updated_at"] if touched else None,
+    }
+
+
+def _probe_many(symbols):
+    """
+    ``{symbol: probe}`` for the symbols with data. In consolidated mode one
+    ``$group`` over the prices collection covers every symbol.
+    """
+    if not consolidated():
+        probes = {sym: _probe(sym) for sym in symbols}
+        return {sym: probe for sym, probe in probes.items() if probe is not None}
+
+    pipeline = [
+        {"$match": {"symbol": {"$in": list(symbols)}}},
+        {"$group": {
+            "_id": "$symbol",
+            "min_date": {"$min": "$date"},
+            "max_date": {"$max": "$date"},
+            "rows": {"$sum": 1},
+            "last_id": {"$max": "$_id"},
+            "last_write": {"$max": "$updated_at"},
+        }},
+    ]
+    return {
+        doc["_id"]: {
+            "symbol": doc["_id"],
+            "collection": PRICES_COLLECTION,
+            "min_date": doc["min_date"],
+            "max_date": doc["max_date"],
+            "rows": doc["rows"],
+            "last_id": doc["last_id"],
+            "last_write": doc.get("last_write"),
+        }
+        for doc in db[PRICES_COLLECTION].aggregate(pipeline)
+    }
+
+
+def refresh_symbol(sym: str):
+    """
+    Re-probe one symbol and upsert its catalog document.
+    ``updated_at`` only moves when the probed fields changed.
+    """
+    return _store(sym, _probe(sym))
+
+
+def _store(sym, probe):
+    """Upsert (or delete, when ``probe`` is None) the catalog document for ``sym``."""
+    if probe is None:
+        db[CATALOG_COLLECTION].delete_one({"symbol": sym})
+        with _lock:
+            _entries[sym] = (time.monotonic(), None)
+        return None
+
+    stored = db[CATALOG_COLLECTION].find_one({"symbol": sym}, {"_id": 0})
+    unchanged = stored is not None and all(
+        stored.get(k) == probe[k] for k in _PROBED_FIELDS
+    )
+    if unchanged:
+        entry = stored
+    else:
+        entry = {**probe, "updated_at": _now()}
+        db[CATALOG_COLLECTION].replace_one({"symbol": sym}, entry, upsert=True)
+        logger.info("Catalog updated for %s: %s rows", sym, entry["rows"])
+
+    with _lock:
+        _entries[sym] = (time.monotonic(), entry)
+    return entry
+
+
+def refresh_catalog(symbols=None):
+    """Refresh the catalog for ``symbols`` (default: every symbol with stored prices)."""
+    if symbols is None:
+        symbols = list_symbols()
+    probes = _probe_many(symbols)
+    return {sym: _store(sym, probes.get(sym)) for sym in symbols}
+
+
+def get_entry(sym: str):
+    """Return the catalog entry for ``sym`` (None when it has no data)."""
+    with _lock:
+        cached = _entries.get(sym)
+    if cached is not None and time.monotonic() - cached[0] < CATALOG_TTL:
+        cache_event("catalog", True)
+        return cached[1]
+    cache_event("catalog", False)
+    return refresh_symbol(sym)
+
+
+def get_entries(symbols):
+    """Return ``{symbol: entry}`` for the symbols that have data (expired ones re-probed together)."""
+    symbols = list(symbols or [])
+    entries, expired = {}, []
+    now = time.monotonic()
+    with _lock:
+        for sym in symbols:
+            cached = _entries.get(sym)
+            if cached is not None and now - cached[0] < CATALOG_TTL:
+                entries[sym] = cached[1]
+            else:
+                expired.append(sym)
+    for sym in symbols:
+        cache_event("catalog", sym in entries)
+    if expired:
+        entries.update(refresh_catalog(expired))
+    return {sym: entries[sym] for sym in symbols if entries.get(sym) is not None}
+
+
+def has_data(symbols) -> bool:
+    """True when at least one of ``symbols`` has price rows."""
+    return bool(get_entries(symbols))
+
+
+def _version(entry):
+    return (entry["rows"], str(entry["max_date"]), str(entry.get("last_id")), str(entry.get("last_write")))
+
+
+def data_version(sym: str):
+    """Token that changes whenever the stored bars for ``sym`` change."""
+    entry = get_entry(sym)
+    return None if entry is None else _version(entry)
+
+
+def data_versions(symbols):
+    """``{symbol: data_version}`` for the symbols that have data, in one catalog read."""
+    return {sym: _version(entry) for sym, entry in get_entries(symbols).items()}
+
+
+def available_years(symbols):
+    """Sorted calendar years covered by any of ``symbols``."""
+    years = set()
+    for entry in get_entries(symbols).values():
+        start = pd.to_datetime(entry["min_date"], errors="coerce")
+        end = pd.to_datetime(entry["max_date"], errors="coerce")
+        if pd.isna(start) or pd.isna(end):
+            continue
+        years.update(range(start.year, end.year + 1))
+    return sorted(years)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for sym, entry in refresh_catalog().items():
+        if entry is None:
+            print(f"{sym}: no data")
+        else:
+            print(f"{sym}: {entry['rows']} rows, {entry['min_date']} -> {entry['max_date']}")
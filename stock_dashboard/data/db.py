@@ -1,10 +1,15 @@
 import os
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 from pymongo import MongoClient
 from dotenv import load_dotenv
 import logging
 from pymongo.errors import PyMongoError
 
+from utils.instrumentation import stage, cache_event
+
 
 load_dotenv()
 
@@ -22,58 +27,329 @@ if not mongo_uri or not mongo_db_name:
         "environment variables must be set."
     )
 
-try:
-    client = MongoClient(
-        mongo_uri,
+def _make_client(uri):
+    return MongoClient(
+        uri,
         serverSelectionTimeoutMS=5000  # fail fast
     )
-    # Force connection check
-    client.admin.command("ping")
-    db = client[mongo_db_name]
 
-    logger.info("Successfully connected to MongoDB database '%s'", mongo_db_name)
 
-except PyMongoError as exc:
-    logger.exception("Failed to connect to MongoDB")
-    raise RuntimeError(
-        "Failed to initialize MongoDB client or select database"
-    ) from exc
+# MongoClient is not fork-safe: each process (gunicorn worker, background job)
+# opens its own on first use instead of inheriting the master's sockets and
+# monitor threads.
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """This process's MongoClient, connected (and pinged) on first use."""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            try:
+                client = _make_client(mongo_uri)
+                # Force connection check
+                client.admin.command("ping")
+            except PyMongoError as exc:
+                logger.exception("Failed to connect to MongoDB")
+                raise RuntimeError(
+                    "Failed to initialize MongoDB client or select database"
+                ) from exc
+            _client, _client_pid = client, pid
+            logger.info("Connected to MongoDB database '%s' (pid %d)", mongo_db_name, pid)
+    return _client
+
+
+def reset_client():
+    """
+    Drop the inherited client reference after a fork (gunicorn ``post_fork``)
+    so this process connects on its own. The parent's client is not closed:
+    its sockets belong to the parent.
+    """
+    global _client, _client_pid, _client_lock
+    _client_lock = threading.Lock()
+    _client, _client_pid = None, None
+
+
+class _Database:
+    """``db[name]`` / ``db.<method>`` against the configured database on this process's client."""
+
+    def __getitem__(self, name):
+        return get_client()[mongo_db_name][name]
+
+    def __getattr__(self, name):
+        return getattr(get_client()[mongo_db_name], name)
+
+
+db = _Database()
 
 
 def _colname(sym: str) -> str:
     return sym.lower()+ "_prices"
 
-def load_price_data(symbols):
-    frames = []
 
-    for sym in symbols:
-        col = _colname(sym)
+# PRICE_SOURCE=consolidated reads every symbol from one collection indexed on
+# (symbol, date), built by ``python -m data.migrate_prices``.
+PRICE_SOURCE = os.getenv("PRICE_SOURCE", "collections").lower()
+PRICES_COLLECTION = os.getenv("PRICES_COLLECTION", "prices")
+FETCH_BATCH_SIZE = int(os.getenv("PRICE_FETCH_BATCH_SIZE", "10000"))
 
-        if col not in db.list_collection_names():
-            print(f"NO COLLECTION FOR {sym} -> {col}")
-            continue
+PRICE_FIELDS = {"_id": 0, "date": 1, "close": 1, "volume": 1}
 
-        cursor = db[col].find(
-            {},
-            {"_id": 0, "date": 1, "close": 1, "volume": 1}
-        ).sort("date", 1)
 
-        df = pd.DataFrame(list(cursor))
+def consolidated() -> bool:
+    return PRICE_SOURCE == "consolidated"
+
+
+def list_symbols():
+    """Every symbol with stored prices, from the active price source."""
+    if consolidated():
+        return sorted(db[PRICES_COLLECTION].distinct("symbol"))
+    return sorted(
+        name[: -len("_prices")].upper()
+        for name in db.list_collection_names()
+        if name.endswith("_prices")
+    )
+
+
+# symbol -> (catalog data_version, DataFrame); reused until the catalog says the
+# data changed, least recently used dropped past FRAME_CACHE_SIZE symbols
+FRAME_CACHE_SIZE = int(os.getenv("PRICE_FRAME_CACHE_SIZE", "256"))
+_frame_cache = OrderedDict()
+_frame_lock = threading.Lock()
+
+
+def _build_frame(rows, sym=None):
+    """Normalize raw price documents into the ``load_price_data`` shape."""
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date", "close"])
+    df["volume"] = pd.to_numeric(df.get("volume", 0), errors="coerce").fillna(0)
+    if sym is not None:
+        df["symbol"] = sym
+        if not df["date"].is_monotonic_increasing:
+            df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    else:
+        # Mongo orders mixed date/string values by BSON type first
+        df = df.sort_values(["symbol", "date"], kind="stable").reset_index(drop=True)
+    return df
+
+
+def _fetch_symbol(sym):
+    with stage("mongo_fetch"):
+        if consolidated():
+            cursor = db[PRICES_COLLECTION].find({"symbol": sym}, PRICE_FIELDS).sort("date", 1)
+        else:
+            cursor = db[_colname(sym)].find({}, PRICE_FIELDS).sort("date", 1)
+        rows = list(cursor)
+
+    with stage("dataframe_build"):
+        df = _build_frame(rows, sym)
         if df.empty:
             print(f"EMPTY DATAFRAME FOR {sym}")
+    return df
+
+
+def _date_filter(start=None, end=None):
+    # BSON date bounds: the consolidated collection stores dates as BSON dates
+    # (migrate_prices converts string dates on copy)
+    bounds = {}
+    if start is not None:
+        bounds["$gte"] = pd.Timestamp(start).to_pydatetime()
+    if end is not None:
+        bounds["$lte"] = pd.Timestamp(end).to_pydatetime()
+    return {"date": bounds} if bounds else {}
+
+
+def _fetch_many(symbols, start=None, end=None):
+    """
+    One ``$in`` query over the consolidated collection, read in cursor
+    batches of FETCH_BATCH_SIZE. Returns ``{symbol: DataFrame}``.
+    """
+    query = {"symbol": {"$in": list(symbols)}, **_date_filter(start, end)}
+    projection = {**PRICE_FIELDS, "symbol": 1}
+    with stage("mongo_fetch"):
+        cursor = (
+            db[PRICES_COLLECTION]
+            .find(query, projection)
+            .sort([("symbol", 1), ("date", 1)])
+            .batch_size(FETCH_BATCH_SIZE)
+        )
+        # Accumulate columns as batches arrive instead of holding every document
+        columns = {"symbol": [], "date": [], "close": [], "volume": []}
+        for doc in cursor:
+            for field, values in columns.items():
+                values.append(doc.get(field))
+
+    with stage("dataframe_build"):
+        df = _build_frame(columns)
+        if df.empty:
+            return {}
+        return {sym: part.reset_index(drop=True) for sym, part in df.groupby("symbol", sort=False)}
+
+
+def load_symbol_frame(sym, version=None):
+    """
+    Return one symbol's bars, or None when it has no data.
+    Served from the shared-memory store when it holds the current data
+    version (looked up when not given), else from this process's frame
+    cache / Mongo.
+    """
+    if version is None:
+        version = catalog.data_version(sym)
+    if version is None:
+        print(f"NO COLLECTION FOR {sym} -> {_colname(sym)}")
+        return None
+
+    df = _cached_frame(sym, version)
+    if df is not None:
+        return df
+
+    df = _fetch_symbol(sym)
+    _remember_frame(sym, version, df)
+    return df
+
+
+def fetch_new_bars(last_dates):
+    """
+    Bars strictly after ``last_dates[symbol]`` for each symbol, sorted by
+    symbol and date. Indexed range reads, so the cost follows the new rows.
+    """
+    if not last_dates:
+        return pd.DataFrame()
+    after = {sym: pd.Timestamp(d).to_pydatetime() for sym, d in last_dates.items()}
+    with stage("mongo_fetch"):
+        if consolidated():
+            query = {"$or": [{"symbol": sym, "date": {"$gt": d}} for sym, d in after.items()]}
+            rows = list(
+                db[PRICES_COLLECTION].find(query, {**PRICE_FIELDS, "symbol": 1}).sort([("symbol", 1), ("date", 1)])
+            )
+            frames = [_build_frame(rows)]
+        else:
+            frames = [
+                _build_frame(list(db[_colname(sym)].find({"date": {"$gt": d}}, PRICE_FIELDS).sort("date", 1)), sym)
+                for sym, d in after.items()
+            ]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).sort_values(["symbol", "date"])
+
+
+def _cached_frame(sym, version):
+    """Shared-memory or frame-cache hit for ``sym`` at ``version``, else None."""
+    if shared_store.enabled():
+        df = shared_store.store.frame(sym, version)
+        cache_event("shared_prices", df is not None)
+        if df is not None:
+            return df
+
+    with _frame_lock:
+        cached = _frame_cache.get(sym)
+        hit = cached is not None and cached[0] == version
+        if hit:
+            _frame_cache.move_to_end(sym)
+    cache_event("price_frames", hit)
+    return cached[1] if hit else None
+
+
+def _remember_frame(sym, version, df):
+    with _frame_lock:
+        _frame_cache[sym] = (version, df)
+        _frame_cache.move_to_end(sym)
+        while len(_frame_cache) > FRAME_CACHE_SIZE:
+            _frame_cache.popitem(last=False)
+
+
+def _load_consolidated(symbols, versions, start=None, end=None):
+    """
+    Cached symbols are served as usual; the rest come back from a single
+    ``$in`` query. Full-history fetches refill the frame cache; a date-ranged
+    fetch is returned as is. Returns ``{symbol: DataFrame}``.
+    """
+    frames, missing = {}, {}
+    for sym in symbols:
+        version = versions.get(sym)
+        if version is None:
+            logger.warning("No prices for %s in %s", sym, PRICES_COLLECTION)
             continue
+        df = _cached_frame(sym, version)
+        if df is None:
+            missing[sym] = version
+        else:
+            frames[sym] = df
 
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df = df.dropna(subset=["date", "close"])
-        df["volume"] = pd.to_numeric(df.get("volume", 0), errors="coerce").fillna(0)
-        df["symbol"] = sym
+    if missing:
+        fetched = _fetch_many(missing, start, end)
+        if start is None and end is None:
+            for sym, df in fetched.items():
+                _remember_frame(sym, missing[sym], df)
+        frames.update(fetched)
+    return frames
+
+
+def _date_slice(df, start=None, end=None):
+    """Rows of the date-sorted ``df`` within ``start``..``end`` as a positional slice (a view, no copy)."""
+    if start is None and end is None:
+        return df
+    dates = df["date"].to_numpy()
+    lo = dates.searchsorted(pd.Timestamp(start).to_datetime64(), "left") if start is not None else 0
+    hi = dates.searchsorted(pd.Timestamp(end).to_datetime64(), "right") if end is not None else len(dates)
+    return df.iloc[lo:hi]
+
+
+def load_price_frames(symbols, start=None, end=None):
+    """
+    ``{symbol: DataFrame}`` in symbol order, each sorted by date and limited to
+    ``start``..``end`` (inclusive). Frames are the cached or shared-memory ones
+    themselves, not copies: treat them as read-only.
+    """
+    versions = catalog.data_versions(symbols)
+    if consolidated():
+        frames = _load_consolidated(symbols, versions, start, end)
+    else:
+        frames = {sym: load_symbol_frame(sym, versions.get(sym)) for sym in symbols}
 
-        frames.append(df)
+    out = {}
+    for sym in sorted(frames):
+        df = frames[sym]
+        if df is None or df.empty:
+            continue
+        df = _date_slice(df, start, end)
+        if not df.empty:
+            out[sym] = df
+    return out
+
+
+def load_price_data(symbols, start=None, end=None):
+    """
+    Bars for ``symbols`` (optionally limited to ``start``..``end``, inclusive),
+    sorted by symbol and date.
+    """
+    frames = load_price_frames(symbols, start, end)
 
     if not frames:
         print("NO FRAMES CREATED")
         return pd.DataFrame()
 
-    out = pd.concat(frames, ignore_index=True)
-    out = out.sort_values(["symbol", "date"])
-    return out
+    if len(frames) == 1:
+        # Shallow copy: no data is copied (shared-memory views stay zero-copy),
+        # and columns a caller adds don't reach the cached frame
+        return next(iter(frames.values())).copy(deep=False)
+
+    # Frames are date-sorted and in symbol order, so the result needs no re-sort
+    return pd.concat(frames.values(), ignore_index=True)
+
+
+# Imported last: catalog reads db/_colname from this module. Keeping this at
+# module level (not inside load_symbol_frame) means no import can be in
+# flight when a background job forks from a threaded server.
+from data import catalog, shared_store  # noqa: E402
@@ -0,0 +1,148 @@
+"""
+Build and sync the consolidated ``prices`` collection.
+
+Copies every ``<sym>_prices`` collection into one collection keyed by a
+unique ``(symbol, date)`` index. Runs incrementally: per symbol only bars
+newer than the last consolidated date are copied, so it can be scheduled
+after each data load. Each synced symbol is then checked against its source
+(row count and close/volume sums, computed by the server); a mismatch means
+older bars were corrected or backfilled, and that symbol is recopied.
+
+    python -m data.migrate_prices                 # sync all symbols
+    python -m data.migrate_prices AAPL MSFT       # sync some symbols
+    python -m data.migrate_prices --rebuild       # drop and rebuild
+"""
+import math
+import time
+import logging
+import argparse
+
+import pandas as pd
+
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+from data import catalog
+from data.db import db, _colname, PRICES_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+def ensure_indexes():
+    db[PRICES_COLLECTION].create_index(
+        [("symbol", ASCENDING), ("date", ASCENDING)], unique=True, name="symbol_date"
+    )
+
+
+def _source_symbols():
+    return sorted(
+        name[: -len("_prices")].upper()
+        for name in db.list_collection_names()
+        if name.endswith("_prices")
+    )
+
+
+def _insert(target, docs):
+    try:
+        target.insert_many(docs, ordered=False)
+        return len(docs)
+    except BulkWriteError as exc:
+        # Duplicates from a partially completed earlier run are expected
+        dupes = sum(1 for err in exc.details.get("writeErrors", []) if err.get("code") == 11000)
+        if dupes != len(exc.details.get("writeErrors", [])):
+            raise
+        return exc.details.get("nInserted", 0)
+
+
+def _checksum(col, query):
+    """(rows, sum of close, sum of volume) over ``query``, computed server-side."""
+    pipeline = [
+        {"$match": query},
+        {"$group": {"_id": None, "rows": {"$sum": 1}, "close": {"$sum": "$close"}, "volume": {"$sum": "$volume"}}},
+    ]
+    doc = next(iter(col.aggregate(pipeline)), None)
+    return (0, 0.0, 0.0) if doc is None else (doc["rows"], doc["close"], doc["volume"])
+
+
+def _same(a, b):
+    # Sums taken in a different order can differ in the last bits
+    return a[0] == b[0] and all(math.isclose(x, y, rel_tol=1e-9) for x, y in zip(a[1:], b[1:]))
+
+
+def _as_date(value):
+    """String dates become BSON dates so range queries and date operators see them; unparsable ones are kept."""
+    if isinstance(value, str):
+        parsed = pd.to_datetime(value, errors="coerce")
+        if not pd.isna(parsed):
+            return parsed.to_pydatetime()
+    return value
+
+
+def _copy(sym, query, batch_size):
+    target = db[PRICES_COLLECTION]
+    inserted, batch = 0, []
+    for doc in db[_colname(sym)].find(query, {"_id": 0}).sort("date", 1).batch_size(batch_size):
+        doc["symbol"] = sym
+        doc["date"] = _as_date(doc.get("date"))
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            inserted += _insert(target, batch)
+            batch = []
+    if batch:
+        inserted += _insert(target, batch)
+    return inserted
+
+
+def sync_symbol(sym, batch_size=BATCH_SIZE, verify=True):
+    """
+    Copy bars for ``sym`` newer than its last consolidated date; returns rows
+    inserted. With ``verify``, a symbol whose consolidated copy no longer
+    matches its source is recopied in full.
+    """
+    target = db[PRICES_COLLECTION]
+    last = target.find_one({"symbol": sym}, {"_id": 0, "date": 1}, sort=[("date", -1)])
+    query = {"date": {"$gt": last["date"]}} if last else {}
+    inserted = _copy(sym, query, batch_size)
+
+    if verify and last is not None and not _same(_checksum(db[_colname(sym)], {}), _checksum(target, {"symbol": sym})):
+        logger.info("Older bars changed for %s; recopying it", sym)
+        target.delete_many({"symbol": sym})
+        inserted = _copy(sym, {}, batch_size)
+    return inserted
+
+
+def sync_prices(symbols=None, rebuild=False, batch_size=BATCH_SIZE, verify=True):
+    """Sync ``symbols`` (default: every ``*_prices`` collection); returns ``{symbol: rows inserted}``."""
+    if rebuild:
+        if symbols:
+            # Only the requested symbols; the rest of the collection stays
+            db[PRICES_COLLECTION].delete_many({"symbol": {"$in": list(symbols)}})
+        else:
+            db[PRICES_COLLECTION].drop()
+    ensure_indexes()
+
+    start = time.perf_counter()
+    results = {sym: sync_symbol(sym, batch_size, verify) for sym in (symbols or _source_symbols())}
+    # Re-probe now rather than when each process's catalog entry expires
+    catalog.refresh_catalog(list(results))
+    logger.info(
+        "Synced %d rows for %d symbols into '%s' in %.1fs",
+        sum(results.values()), len(results), PRICES_COLLECTION, time.perf_counter() - start,
+    )
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("symbols", nargs="*", help="symbols to sync (default: all)")
+    parser.add_argument("--rebuild", action="store_true", help="recopy the given symbols (default: all) from scratch")
+    parser.add_argument("--no-verify", action="store_true", help="skip the per-symbol source comparison")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols]
+    for sym, rows in sync_prices(symbols, args.rebuild, args.batch_size, not args.no_verify).items():
+        print(f"{sym}: +{rows} rows")
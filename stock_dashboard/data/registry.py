@@ -0,0 +1,133 @@
+"""
+Symbol registry with prefix-indexed search.
+
+The universe is every symbol with stored prices, enriched with optional
+metadata documents in ``symbol_meta`` (``{"symbol", "name", ...}``). Two
+sorted indexes (tickers and company-name words) answer prefix searches with
+a bisect, so dropdown search stays fast for universes of thousands of
+tickers. The default selection comes from DEFAULT_SYMBOLS (comma-separated).
+"""
+import os
+import time
+import bisect
+import logging
+import threading
+
+from data.db import db, list_symbols
+
+logger = logging.getLogger(__name__)
+
+META_COLLECTION = "symbol_meta"
+
+FALLBACK_DEFAULT = ["AMZN", "MSFT", "NVDA", "TSLA", "META", "GOOGL", "NFLX", "INTC", "BABA"]
+
+# Maximum options returned to a dropdown per search
+SEARCH_LIMIT = int(os.getenv("SYMBOL_SEARCH_LIMIT", "50"))
+
+# Seconds before the registry re-lists collections
+REGISTRY_TTL = float(os.getenv("SYMBOL_REGISTRY_TTL", "300"))
+
+
+class SymbolRegistry:
+    """In-memory universe snapshot with ticker and name prefix indexes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()   # one reload at a time; readers keep the old snapshot
+        self._loaded_at = None
+        self._names = {}          # symbol -> company name ("" when unknown)
+        self._tickers = []        # sorted symbols
+        self._words = []          # sorted (lowercase name word, symbol)
+
+    def _load(self):
+        symbols = list_symbols()
+        meta = {
+            doc["symbol"].upper(): doc
+            for doc in db[META_COLLECTION].find({}, {"_id": 0, "symbol": 1, "name": 1})
+            if doc.get("symbol")
+        }
+        names = {sym: (meta.get(sym) or {}).get("name") or "" for sym in symbols}
+        words = sorted(
+            (word, sym)
+            for sym, name in names.items()
+            for word in set(name.lower().split())
+        )
+        with self._lock:
+            self._names, self._tickers, self._words = names, symbols, words
+            self._loaded_at = time.monotonic()
+        logger.info("Symbol registry loaded: %d symbols", len(symbols))
+
+    def _expired(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > REGISTRY_TTL
+
+    def _ensure_loaded(self):
+        if not self._expired():
+            return
+        with self._load_lock:
+            # Threads that waited here find the snapshot another one just loaded
+            if self._expired():
+                self._load()
+
+    def refresh(self):
+        self._load()
+
+    def all_symbols(self):
+        self._ensure_loaded()
+        return list(self._tickers)
+
+    def default_symbols(self):
+        """DEFAULT_SYMBOLS if set, else the built-in basket, restricted to known symbols when any exist."""
+        configured = os.getenv("DEFAULT_SYMBOLS")
+        wanted = [s.strip().upper() for s in configured.split(",") if s.strip()] if configured else FALLBACK_DEFAULT
+        known = set(self.all_symbols())
+        return [s for s in wanted if s in known] if known else wanted
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Tickers starting with ``query``, then tickers whose name has a word starting with it."""
+        self._ensure_loaded()
+        query = (query or "").strip()
+        if not query:
+            return []
+
+        with self._lock:
+            tickers, words = self._tickers, self._words
+
+        out = []
+        upper = query.upper()
+        i = bisect.bisect_left(tickers, upper)
+        while i < len(tickers) and tickers[i].startswith(upper) and len(out) < limit:
+            out.append(tickers[i])
+            i += 1
+
+        lower = query.lower()
+        seen = set(out)
+        j = bisect.bisect_left(words, (lower, ""))
+        while j < len(words) and words[j][0].startswith(lower) and len(out) < limit:
+            sym = words[j][1]
+            if sym not in seen:
+                seen.add(sym)
+                out.append(sym)
+            j += 1
+        return out
+
+    def label(self, sym):
+        name = self._names.get(sym)
+        return f"{sym} · {name}" if name else sym
+
+    def options(self, symbols):
+        """Dropdown options for ``symbols`` (order kept, duplicates dropped)."""
+        self._ensure_loaded()
+        seen = set()
+        out = []
+        for sym in symbols:
+            if sym and sym not in seen:
+                seen.add(sym)
+                out.append({"label": self.label(sym), "value": sym})
+        return out
+
+
+registry = SymbolRegistry()
+
+
+def default_symbols():
+    return registry.default_symbols()
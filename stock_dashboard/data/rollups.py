@@ -0,0 +1,244 @@
+"""
+Monthly and yearly first/last-close rollups computed inside Mongo.
+
+An aggregation pipeline sorts each symbol's bars by date and groups them by
+year (and month), taking ``$first``/``$last`` close. The results are upserted
+into ``monthly_rollups`` and ``yearly_rollups`` so the seasonality panels can
+read a few hundred rows instead of the full daily history.
+
+Source dates may be BSON dates or ISO strings (the per-symbol collections
+accept both). The pipeline groups the BSON-dated bars; string-dated ones,
+which Mongo can't range-match or bucket, are read separately and grouped
+here, then merged into the same year/month rows.
+
+Refreshes are incremental: ``rollup_state`` remembers the catalog version
+each symbol was rolled up at. When new bars are appended, only the year that
+held the previous last bar onward is recomputed. A changed start date or a
+shrinking row count triggers a full rebuild for that symbol.
+
+Enable with RETURNS_SOURCE=rollups; ``python -m data.rollups`` refreshes
+every symbol.
+"""
+import os
+import logging
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pymongo import ASCENDING
+
+from data.db import db, _colname, consolidated, PRICES_COLLECTION
+from data import catalog
+from utils.instrumentation import stage, cache_event
+
+logger = logging.getLogger(__name__)
+
+MONTHLY_COLLECTION = "monthly_rollups"
+YEARLY_COLLECTION = "yearly_rollups"
+STATE_COLLECTION = "rollup_state"
+
+_fresh = {}        # symbol -> catalog version the stored rollups match
+_lock = threading.Lock()
+_indexes_ready = False
+
+
+def enabled() -> bool:
+    """Serve monthly/yearly returns from the rollup collections: RETURNS_SOURCE=rollups."""
+    return os.getenv("RETURNS_SOURCE", "pandas").lower() == "rollups"
+
+
+def _ensure_indexes():
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    db[MONTHLY_COLLECTION].create_index(
+        [("symbol", ASCENDING), ("year", ASCENDING), ("month", ASCENDING)], unique=True
+    )
+    db[YEARLY_COLLECTION].create_index([("symbol", ASCENDING), ("year", ASCENDING)], unique=True)
+    db[STATE_COLLECTION].create_index("symbol", unique=True)
+    _indexes_ready = True
+
+
+def _source_query(sym):
+    query = {"symbol": sym} if consolidated() else {}
+    query["close"] = {"$ne": None}
+    return query
+
+
+def _pipeline(sym, since, monthly):
+    """Group ``sym``'s BSON-dated bars from ``since`` on by year (and month), first/last close in date order."""
+    match = _source_query(sym)
+    match["date"] = {"$type": "date"} if since is None else {"$type": "date", "$gte": since}
+    group_id = {"year": {"$year": "$date"}}
+    if monthly:
+        group_id["month"] = {"$month": "$date"}
+    return [
+        {"$match": match},
+        {"$sort": {"date": 1}},
+        {"$group": {
+            "_id": group_id,
+            "first_close": {"$first": "$close"},
+            "last_close": {"$last": "$close"},
+            "first_date": {"$first": "$date"},
+            "last_date": {"$last": "$date"},
+        }},
+    ]
+
+
+def _string_dated(source, sym, since, monthly):
+    """The pipeline's groups for bars stored with ISO string dates, computed in pandas."""
+    rows = list(source.find({**_source_query(sym), "date": {"$type": "string"}}, {"_id": 0, "date": 1, "close": 1}))
+    if not rows:
+        return []
+    df = pd.DataFrame(rows)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"]).sort_values("date", kind="stable")
+    if since is not None:
+        df = df[df["date"] >= since]
+
+    names = ["year", "month"] if monthly else ["year"]
+    keys = [df["date"].dt.year.rename("year")]
+    if monthly:
+        keys.append(df["date"].dt.month.rename("month"))
+    groups = []
+    for key, part in df.groupby(keys):
+        groups.append({
+            "_id": dict(zip(names, (int(k) for k in key))),
+            "first_close": float(part["close"].iloc[0]),
+            "last_close": float(part["close"].iloc[-1]),
+            "first_date": part["date"].iloc[0].to_pydatetime(),
+            "last_date": part["date"].iloc[-1].to_pydatetime(),
+        })
+    return groups
+
+
+def _aggregate(sym, since, monthly):
+    source = db[PRICES_COLLECTION] if consolidated() else db[_colname(sym)]
+    groups = {}
+    for doc in [*source.aggregate(_pipeline(sym, since, monthly)), *_string_dated(source, sym, since, monthly)]:
+        key = tuple(doc["_id"].values())
+        merged = groups.setdefault(key, doc)
+        if doc["first_date"] < merged["first_date"]:
+            merged.update(first_close=doc["first_close"], first_date=doc["first_date"])
+        if doc["last_date"] > merged["last_date"]:
+            merged.update(last_close=doc["last_close"], last_date=doc["last_date"])
+
+    rows = []
+    for key in sorted(groups):
+        doc = groups[key]
+        row = {"symbol": sym, **doc.pop("_id"), **doc}
+        first = row["first_close"]
+        row["return"] = (row["last_close"] - first) / first if first else None
+        rows.append(row)
+    return rows
+
+
+def _write(collection, rows, keys, rebuilt):
+    if not rows:
+        return
+    if rebuilt:
+        # The symbol's rows were just deleted, nothing to replace
+        db[collection].insert_many(rows)
+        return
+    for row in rows:
+        db[collection].replace_one({k: row[k] for k in keys}, row, upsert=True)
+
+
+def refresh_symbol(sym):
+    """Bring ``sym``'s rollups up to its current catalog version; returns that version."""
+    entry = catalog.get_entry(sym)
+    version = catalog.data_version(sym)
+    if entry is None:
+        db[MONTHLY_COLLECTION].delete_many({"symbol": sym})
+        db[YEARLY_COLLECTION].delete_many({"symbol": sym})
+        db[STATE_COLLECTION].delete_one({"symbol": sym})
+        return None
+
+    _ensure_indexes()
+    state = db[STATE_COLLECTION].find_one({"symbol": sym}, {"_id": 0})
+    if state is not None and tuple(state["version"]) == tuple(version):
+        return version
+
+    appended = (
+        state is not None
+        and state["min_date"] == entry["min_date"]
+        and entry["rows"] >= state["rows"]
+    )
+    if appended:
+        # Recompute from the start of the year that held the previous last bar
+        since = datetime(pd.Timestamp(state["max_date"]).year, 1, 1)
+    else:
+        since = None
+        db[MONTHLY_COLLECTION].delete_many({"symbol": sym})
+        db[YEARLY_COLLECTION].delete_many({"symbol": sym})
+
+    with stage("rollup_refresh"):
+        _write(MONTHLY_COLLECTION, _aggregate(sym, since, monthly=True), ("symbol", "year", "month"), not appended)
+        _write(YEARLY_COLLECTION, _aggregate(sym, since, monthly=False), ("symbol", "year"), not appended)
+
+    db[STATE_COLLECTION].replace_one(
+        {"symbol": sym},
+        {
+            "symbol": sym,
+            "version": list(version),
+            "min_date": entry["min_date"],
+            "max_date": entry["max_date"],
+            "rows": entry["rows"],
+        },
+        upsert=True,
+    )
+    logger.info("Rollups %s for %s", "extended" if appended else "rebuilt", sym)
+    return version
+
+
+def ensure_fresh(symbols):
+    """Refresh rollups for any of ``symbols`` whose data changed since they were built."""
+    versions = catalog.data_versions(symbols)
+    for sym in symbols:
+        version = versions.get(sym)
+        with _lock:
+            hit = version is not None and _fresh.get(sym) == version
+        cache_event("rollups", hit)
+        if hit:
+            continue
+        version = refresh_symbol(sym)
+        with _lock:
+            _fresh[sym] = version
+
+
+def _read(collection, symbols, sort):
+    ensure_fresh(symbols)
+    with stage("rollup_read"):
+        rows = list(
+            db[collection]
+            .find({"symbol": {"$in": list(symbols)}}, {"_id": 0, "first_date": 0, "last_date": 0})
+            .sort(sort)
+        )
+    return pd.DataFrame(rows)
+
+
+def monthly_rollups(symbols) -> pd.DataFrame:
+    """Same shape as ``utils.metrics.monthly_returns`` without loading daily bars."""
+    m = _read(MONTHLY_COLLECTION, symbols, [("symbol", 1), ("year", 1), ("month", 1)])
+    if m.empty:
+        return pd.DataFrame(columns=["symbol", "year", "month", "first_close", "last_close", "monthly_return"])
+    m["monthly_return"] = m.pop("return").astype(float)
+    m["monthly_return"] = m["monthly_return"].where(m["first_close"] > 0, np.nan)
+    return m[["symbol", "year", "month", "first_close", "last_close", "monthly_return"]]
+
+
+def yearly_rollups(symbols) -> pd.DataFrame:
+    """Same shape as ``utils.metrics.yearly_returns`` without loading daily bars."""
+    y = _read(YEARLY_COLLECTION, symbols, [("symbol", 1), ("year", 1)])
+    if y.empty:
+        return pd.DataFrame(columns=["symbol", "year", "first_close", "last_close", "yearly_return"])
+    y["yearly_return"] = y.pop("return").astype(float)
+    return y[["symbol", "year", "first_close", "last_close", "yearly_return"]]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for sym, entry in catalog.refresh_catalog().items():
+        if entry is not None:
+            refresh_symbol(sym)
@@ -0,0 +1,293 @@
+"""
+Cross-worker shared-memory price store.
+
+The publisher (the gunicorn master before fork, or ``python -m
+data.shared_store`` after a sync) writes each symbol's date/close/volume
+arrays into its own ``multiprocessing.shared_memory`` segment. A small index
+segment holds a JSON directory behind a version header. Workers attach
+read-only NumPy views, so price memory is paid once per host instead of
+once per worker.
+
+Index layout: ``<q seq><q payload_len><payload json>``. The writer bumps
+``seq`` to an odd value, rewrites the payload, then bumps it to the next
+even value. Readers retry while it is odd or changed during the read, and
+re-read the directory only when ``seq`` moved.
+"""
+import os
+import sys
+import json
+import time
+import struct
+import logging
+import threading
+import weakref
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SHM_PREFIX = os.getenv("PRICE_SHM_PREFIX", "grepx_prices")
+INDEX_SIZE = int(os.getenv("PRICE_SHM_INDEX_BYTES", str(1 << 20)))
+
+_HEADER = struct.Struct("<qq")
+_COLUMNS = ("date", "close", "volume")
+
+# Segments this process created and still owns (its resource tracker cleans them up on exit)
+_created = set()
+
+
+def enabled() -> bool:
+    """Shared-memory serving is opt-in: PRICE_STORE=shm."""
+    return os.getenv("PRICE_STORE", "").lower() == "shm"
+
+
+def _index_name():
+    return f"{SHM_PREFIX}_index"
+
+
+def _attach(name):
+    """Attach to an existing segment without letting this process's resource tracker unlink it on exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if name not in _created:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _create(name, size, persist):
+    """Create a segment; ``persist`` keeps it alive after this process exits (CLI publishes)."""
+    shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+    if persist:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    else:
+        _created.add(name)
+    return shm
+
+
+def _unlink(name):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+    _created.discard(name)
+
+
+def _read_directory(index):
+    """Return (seq, directory) using the seqlock protocol."""
+    while True:
+        seq, length = _HEADER.unpack_from(index.buf, 0)
+        if seq % 2:
+            time.sleep(0.001)
+            continue
+        payload = bytes(index.buf[_HEADER.size:_HEADER.size + length])
+        if _HEADER.unpack_from(index.buf, 0)[0] == seq:
+            return seq, json.loads(payload) if payload else {}
+
+
+def publish(frames, versions, persist=False):
+    """
+    Publish ``{symbol: DataFrame}`` with matching catalog ``versions``.
+    Segments from the previous publish are unlinked; attached readers keep
+    their mappings until they move to the new version.
+    Set ``persist`` when the publishing process exits right after.
+    Returns the new directory version.
+    """
+    try:
+        index = _create(_index_name(), INDEX_SIZE, persist)
+        _HEADER.pack_into(index.buf, 0, 0, 0)
+    except FileExistsError:
+        index = _attach(_index_name())
+
+    seq, old_directory = _read_directory(index)
+    new_version = seq // 2 + 1
+
+    directory = {}
+    for sym, df in frames.items():
+        n = len(df)
+        name = f"{SHM_PREFIX}_{sym.lower()}_{new_version}"
+        shm = _create(name, max(n * 8 * len(_COLUMNS), 8), persist)
+        block = np.ndarray((len(_COLUMNS), n), dtype=np.float64, buffer=shm.buf)
+        block[0].view(np.int64)[:] = df["date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        block[1] = df["close"].to_numpy(dtype=np.float64)
+        block[2] = df["volume"].to_numpy(dtype=np.float64)
+        del block
+        directory[sym] = {"segment": name, "rows": n, "version": list(versions[sym])}
+        shm.close()
+
+    payload = json.dumps(directory, default=str).encode()
+    if _HEADER.size + len(payload) > index.size:
+        raise ValueError(f"Shared price directory needs {len(payload)} bytes; raise PRICE_SHM_INDEX_BYTES")
+
+    _HEADER.pack_into(index.buf, 0, seq + 1, 0)
+    index.buf[_HEADER.size:_HEADER.size + len(payload)] = payload
+    _HEADER.pack_into(index.buf, 0, seq + 2, len(payload))
+    index.close()
+
+    for entry in old_directory.values():
+        _unlink(entry["segment"])
+
+    logger.info("Published %d symbols to shared memory (version %d)", len(directory), new_version)
+    return new_version
+
+
+def unpublish():
+    """Remove the index and all data segments."""
+    try:
+        index = _attach(_index_name())
+    except FileNotFoundError:
+        return
+    _, directory = _read_directory(index)
+    index.close()
+    for entry in directory.values():
+        _unlink(entry["segment"])
+    _unlink(_index_name())
+
+
+class SharedPriceStore:
+    """Reader side: read-only NumPy views over the published segments."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._seq = None
+        self._directory = {}
+        self._segments = {}     # symbol -> SharedMemory
+        # Weak references to the blocks handed out per handle. NumPy views
+        # don't pin the mapping, so a handle is only closed once every frame
+        # built on it has been garbage-collected.
+        self._views = {}        # id(SharedMemory) -> [weakref to block]
+        # Handles from older versions, closed by _release once unused
+        self._retired = []
+
+    def _sync(self):
+        """Re-read the directory if the version header moved. Caller holds the lock."""
+        if self._index is None:
+            try:
+                self._index = _attach(_index_name())
+            except FileNotFoundError:
+                return False
+        seq = _HEADER.unpack_from(self._index.buf, 0)[0]
+        if seq == self._seq:
+            if self._retired:
+                self._release()
+            return True
+
+        self._seq, self._directory = _read_directory(self._index)
+        self._retired.extend(self._segments.values())
+        self._segments = {}
+        self._release()
+        return True
+
+    def _release(self):
+        """Close retired handles that no live frame points into. Caller holds the lock."""
+        still_used = []
+        for shm in self._retired:
+            refs = [ref for ref in self._views.get(id(shm), []) if ref() is not None]
+            if refs:
+                self._views[id(shm)] = refs
+                still_used.append(shm)
+                continue
+            try:
+                shm.close()
+            except BufferError:
+                still_used.append(shm)
+                continue
+            self._views.pop(id(shm), None)
+        self._retired = still_used
+
+    def reset(self):
+        """
+        Forget handles inherited over a fork (gunicorn ``post_fork``); they are
+        re-attached on the next read. Frames built from them stay valid.
+        """
+        self._lock = threading.Lock()
+        if self._index is not None:
+            self._retired.append(self._index)
+        self._retired.extend(self._segments.values())
+        self._index, self._seq, self._directory, self._segments = None, None, {}, {}
+        self._release()
+
+    def version(self):
+        """Current directory version (None when nothing is published)."""
+        with self._lock:
+            if not self._sync():
+                return None
+            return self._seq // 2
+
+    def arrays(self, sym, version=None):
+        """
+        Return read-only ``{"date", "close", "volume"}`` views for ``sym``, or
+        None when it is not published (or was published for another data version).
+        """
+        with self._lock:
+            if not self._sync():
+                return None
+            entry = self._directory.get(sym)
+            if entry is None:
+                return None
+            if version is not None and tuple(entry["version"]) != tuple(version):
+                return None
+
+            shm = self._segments.get(sym)
+            if shm is None:
+                try:
+                    shm = _attach(entry["segment"])
+                except FileNotFoundError:
+                    return None
+                self._segments[sym] = shm
+
+            n = entry["rows"]
+            block = np.ndarray((len(_COLUMNS), n), dtype=np.float64, buffer=shm.buf)
+            block.flags.writeable = False
+            refs = self._views.setdefault(id(shm), [])
+            refs[:] = [ref for ref in refs if ref() is not None]
+            refs.append(weakref.ref(block))
+
+        return {
+            "date": block[0].view(np.int64).view("datetime64[ns]"),
+            "close": block[1],
+            "volume": block[2],
+        }
+
+    def frame(self, sym, version=None):
+        """DataFrame in the ``load_price_data`` shape backed by the shared views."""
+        arrs = self.arrays(sym, version)
+        if arrs is None:
+            return None
+        df = pd.DataFrame(arrs, copy=False)
+        df["symbol"] = sym
+        return df
+
+
+store = SharedPriceStore()
+
+
+def publish_prices(symbols, persist=False):
+    """Fetch ``symbols`` from Mongo and publish them; returns the new version."""
+    from data import catalog
+    from data.db import _fetch_symbol
+
+    frames, versions = {}, catalog.data_versions(symbols)
+    for sym in list(versions):
+        df = _fetch_symbol(sym)
+        if df.empty:
+            del versions[sym]
+            continue
+        frames[sym] = df
+    return publish(frames, versions, persist=persist)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from data.catalog import refresh_catalog
+
+    if len(sys.argv) > 1 and sys.argv[1] == "unpublish":
+        unpublish()
+    else:
+        entries = refresh_catalog()
+        publish_prices([sym for sym, entry in entries.items() if entry is not None], persist=True)
@@ -0,0 +1,46 @@
+"""
+Synthetic daily bars for load tests and offline runs.
+
+Seeds ``<sym>_prices`` collections with a reproducible geometric random walk
+(OHLCV, business days) so the dashboard can run on the in-memory stand-in
+(``tools/mongo_stand_in.py``) without a real database.
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+from pymongo import MongoClient
+
+from data.db import db, _colname, consolidated, get_client
+
+
+def synthetic_bars(sym, start="2015-01-01", end=None, seed=None):
+    """Return a DataFrame of business-day OHLCV bars for ``sym``."""
+    dates = pd.bdate_range(start, end or pd.Timestamp.today().normalize())
+    rng = np.random.default_rng(seed if seed is not None else zlib.crc32(sym.encode()))
+    n = len(dates)
+    drift, vol = rng.uniform(0.0, 0.0008), rng.uniform(0.012, 0.03)
+    close = rng.uniform(20, 400) * np.exp(np.cumsum(rng.normal(drift, vol, n)))
+    open_ = close * np.exp(rng.normal(0, vol / 3, n))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, vol / 2, n)))
+    volume = rng.lognormal(16, 0.5, n).round()
+    return pd.DataFrame({
+        "date": dates.to_pydatetime(),
+        "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+    })
+
+
+def seed_prices(symbols, start="2015-01-01", end=None):
+    """Replace each symbol's price collection with synthetic bars (and the consolidated copy when in use)."""
+    if isinstance(get_client(), MongoClient):
+        raise RuntimeError("seed_prices drops price collections and only runs against the in-memory stand-in")
+    for i, sym in enumerate(symbols):
+        col = db[_colname(sym)]
+        col.drop()
+        col.insert_many(synthetic_bars(sym, start, end, seed=i).to_dict("records"))
+        col.create_index("date")
+
+    if consolidated():
+        from data.migrate_prices import sync_prices
+        sync_prices(symbols, rebuild=True)
@@ -0,0 +1,58 @@
+"""
+Persistent local cache for fundamentals.
+
+One SQLite row per (provider, ticker, field) with the value and the time it
+was fetched, so each field can expire on its own TTL and values from one
+provider (say the offline fixtures) are never served as another's. A
+connection is opened (and closed) per operation, which keeps the cache safe
+to use from worker threads and forked server processes.
+"""
+import os
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+CACHE_PATH = os.getenv("FUNDAMENTALS_CACHE", ".cache/fundamentals.sqlite")
+
+
+class FundamentalsCache:
+    """(provider, ticker, field) -> (value, fetched_at) store backed by SQLite."""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as con, con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS fundamentals ("
+                " provider TEXT NOT NULL,"
+                " ticker TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value TEXT,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (provider, ticker, field))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, provider, ticker):
+        """Return ``{field: (value, fetched_at)}`` for ``ticker`` from ``provider`` (empty if unknown)."""
+        with closing(self._connect()) as con, con:
+            rows = con.execute(
+                "SELECT field, value, fetched_at FROM fundamentals WHERE provider = ? AND ticker = ?",
+                (provider, ticker),
+            ).fetchall()
+        return {field: (json.loads(value), fetched_at) for field, value, fetched_at in rows}
+
+    def put(self, provider, ticker, values, fetched_at=None):
+        """Store ``{field: value}`` for ``ticker`` from ``provider`` stamped with ``fetched_at`` (default: now)."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with closing(self._connect()) as con, con:
+            con.executemany(
+                "INSERT OR REPLACE INTO fundamentals (provider, ticker, field, value, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [(provider, ticker, field, json.dumps(value), fetched_at) for field, value in values.items()],
+            )
@@ -1,16 +1,104 @@
-import yfinance as yf
+import time
+import logging
+import threading
+
+from fundamentals.cache import FundamentalsCache
+from fundamentals.providers import get_provider
+from utils.instrumentation import stage, cache_event
+
+logger = logging.getLogger(__name__)
+
+# Display name -> yfinance ``info`` key
+FIELDS = {
+    'Beta': 'beta',
+    'Trailing P/E': 'trailingPE',
+    'Forward P/E': 'forwardPE',
+    'Market Cap': 'marketCap',
+    'EPS (Trailing)': 'trailingEps',
+    'Revenue Growth': 'revenueGrowth',
+    'Profit Margin': 'profitMargins',
+    # Add more as needed
+}
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Seconds before a cached field is considered stale. Price-driven ratios move
+# intraday; statement-driven figures only change with filings.
+FIELD_TTL = {
+    'Beta': 7 * DAY,
+    'Trailing P/E': HOUR,
+    'Forward P/E': HOUR,
+    'Market Cap': HOUR,
+    'EPS (Trailing)': DAY,
+    'Revenue Growth': DAY,
+    'Profit Margin': DAY,
+}
+
+_cache = None
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        _cache = FundamentalsCache()
+    return _cache
+
+
+def fetch_fundamentals(ticker_symbol):
+    """Fetch from the provider, store in the cache and return ``{field: value}``."""
+    provider = get_provider()
+    with stage("fundamentals_fetch"):
+        info = provider.fetch(ticker_symbol)
+    fundamentals = {field: info.get(key) for field, key in FIELDS.items()}
+    _get_cache().put(provider.name, ticker_symbol, fundamentals)
+    return fundamentals
+
+
+def _revalidate(ticker_symbol):
+    try:
+        fetch_fundamentals(ticker_symbol)
+    except Exception:
+        logger.exception("Fundamentals revalidation failed for %s", ticker_symbol)
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(ticker_symbol)
+
+
+def revalidate_async(ticker_symbol):
+    """Refresh ``ticker_symbol`` in a background thread (at most one per ticker)."""
+    with _revalidating_lock:
+        if ticker_symbol in _revalidating:
+            return
+        _revalidating.add(ticker_symbol)
+    threading.Thread(target=_revalidate, args=(ticker_symbol,), name=f"fund-{ticker_symbol}", daemon=True).start()
+
+
+def is_fresh(ticker_symbol):
+    """True when every field of ``ticker_symbol`` is cached and within its TTL."""
+    cached = _get_cache().get(get_provider().name, ticker_symbol)
+    now = time.time()
+    return all(field in cached and now - cached[field][1] <= FIELD_TTL[field] for field in FIELDS)
+
 
 def get_fundamentals(ticker_symbol):
-    ticker = yf.Ticker(ticker_symbol)
-    info = ticker.info
-    fundamentals = {
-        'Beta': info.get('beta'),
-        'Trailing P/E': info.get('trailingPE'),
-        'Forward P/E': info.get('forwardPE'),
-        'Market Cap': info.get('marketCap'),
-        'EPS (Trailing)': info.get('trailingEps'),
-        'Revenue Growth': info.get('revenueGrowth'),
-        'Profit Margin': info.get('profitMargins'),
-        # Add more as needed
-    }
-    return fundamentals
\ No newline at end of file
+    """
+    Return fundamentals for ``ticker_symbol``, cache first.
+    Stale fields are served immediately while a background thread refetches;
+    only a ticker that was never fetched blocks on the provider.
+    """
+    cached = _get_cache().get(get_provider().name, ticker_symbol)
+    if not all(field in cached for field in FIELDS):
+        cache_event("fundamentals", "miss")
+        return fetch_fundamentals(ticker_symbol)
+
+    now = time.time()
+    if any(now - cached[field][1] > FIELD_TTL[field] for field in FIELDS):
+        cache_event("fundamentals", "stale")
+        revalidate_async(ticker_symbol)
+    else:
+        cache_event("fundamentals", "hit")
+
+    return {field: cached[field][0] for field in FIELDS}
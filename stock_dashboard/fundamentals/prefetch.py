@@ -0,0 +1,104 @@
+"""
+Bulk fundamentals prefetch.
+
+Pulls fundamentals for every ticker in the symbol registry into the local
+cache (fundamentals/cache.py, rows carry fetch timestamps) with a bounded
+thread pool and a shared rate limit, so the Fundamental Analysis tab never
+waits on the network. Tickers whose cached fields are all still fresh are
+skipped, so a restart only fetches what expired.
+
+Runs when the server starts unless FUNDAMENTALS_PREFETCH=0, or on a schedule:
+
+    python -m fundamentals.prefetch            # every ticker
+    python -m fundamentals.prefetch AAPL IBM   # explicit tickers
+"""
+import os
+import sys
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from fundamentals.fundamentals import fetch_fundamentals, is_fresh
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = int(os.getenv("FUNDAMENTALS_PREFETCH_WORKERS", "4"))
+PREFETCH_RATE = float(os.getenv("FUNDAMENTALS_PREFETCH_RATE", "2"))  # requests per second
+
+
+def enabled() -> bool:
+    """Prefetch when the server starts; FUNDAMENTALS_PREFETCH=0 turns it off."""
+    return os.getenv("FUNDAMENTALS_PREFETCH", "1") != "0"
+
+
+def tracked_symbols():
+    """Tickers worth keeping warm: the whole registry."""
+    from data.registry import registry
+
+    return registry.all_symbols()
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across all threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def prefetch_fundamentals(symbols, max_workers=PREFETCH_WORKERS, rate=PREFETCH_RATE):
+    """
+    Fetch and store fundamentals for the ``symbols`` not already fresh in the
+    cache, concurrently. Returns ``{symbol: error or None}`` for the tickers
+    fetched; one failing ticker does not stop the rest.
+    """
+    symbols = [sym for sym in symbols if not is_fresh(sym)]
+    limiter = RateLimiter(rate)
+
+    def fetch(sym):
+        limiter.wait()
+        fetch_fundamentals(sym)
+
+    results = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fund-prefetch") as pool:
+        futures = {pool.submit(fetch, sym): sym for sym in symbols}
+        for future in as_completed(futures):
+            sym = futures[future]
+            try:
+                future.result()
+                results[sym] = None
+            except Exception as exc:
+                logger.warning("Fundamentals prefetch failed for %s: %s", sym, exc)
+                results[sym] = exc
+
+    ok = sum(1 for err in results.values() if err is None)
+    logger.info("Prefetched fundamentals for %d/%d tickers in %.1fs", ok, len(symbols), time.perf_counter() - start)
+    return results
+
+
+def start_prefetch(symbols):
+    """Run ``prefetch_fundamentals`` in a daemon thread."""
+    thread = threading.Thread(target=prefetch_fundamentals, args=(list(symbols),), name="fund-prefetch", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) > 1:
+        tickers = [s.upper() for s in sys.argv[1:]]
+    else:
+        tickers = tracked_symbols()
+    failed = [sym for sym, err in prefetch_fundamentals(tickers).items() if err is not None]
+    sys.exit(1 if failed else 0)
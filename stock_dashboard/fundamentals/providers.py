@@ -0,0 +1,50 @@
+"""
+Fundamentals data providers.
+
+``yfinance`` (default) calls ``yf.Ticker(...).info`` over the network.
+``offline`` serves the bundled fixture file so the Fundamental Analysis tab
+works, and can be benchmarked, without network access.
+Select with FUNDAMENTALS_PROVIDER=yfinance|offline.
+"""
+import os
+import json
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "fundamentals.json")
+
+
+class YFinanceProvider:
+    """Live Yahoo Finance lookups (blocking, rate-limited upstream)."""
+
+    name = "yfinance"
+
+    def fetch(self, ticker_symbol):
+        import yfinance as yf
+
+        return yf.Ticker(ticker_symbol).info or {}
+
+
+class FixtureProvider:
+    """Raw ``info`` dictionaries read from a JSON file keyed by ticker."""
+
+    name = "offline"
+
+    def __init__(self, path=FIXTURE_PATH):
+        with open(path) as fh:
+            self._data = json.load(fh)
+
+    def fetch(self, ticker_symbol):
+        return dict(self._data.get(ticker_symbol.upper(), {}))
+
+
+_provider = None
+
+
+def get_provider():
+    """Return the configured provider (created once per process)."""
+    global _provider
+    if _provider is None:
+        if os.getenv("FUNDAMENTALS_PROVIDER", "yfinance").lower() == "offline":
+            _provider = FixtureProvider(os.getenv("FUNDAMENTALS_FIXTURE", FIXTURE_PATH))
+        else:
+            _provider = YFinanceProvider()
+    return _provider
@@ -0,0 +1,59 @@
+# gunicorn.conf.py
+import os
+import sys
+import subprocess
+import multiprocessing
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8050')}"
+
+# Fork workers after wsgi.py has warmed the catalog and price cache
+preload_app = True
+
+# Each worker keeps its own frame cache, view memo and bar pyramids, so memory
+# grows with the worker count: capped at 4 unless WEB_CONCURRENCY says otherwise.
+MAX_DEFAULT_WORKERS = 4
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, MAX_DEFAULT_WORKERS)))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "2"))
+
+# Long-running analytics go through background callbacks; keep a margin for cold loads
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth from per-worker caches
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+accesslog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """Open a fresh Mongo client and shared-memory handles in each worker instead of the master's."""
+    from data.db import reset_client
+    from data import shared_store
+
+    reset_client()
+    shared_store.store.reset()
+
+
+def when_ready(server):
+    """
+    Fill the fundamentals store for the tracked tickers in a child process
+    (threads in the master would be copied mid-flight into forked workers),
+    unless FUNDAMENTALS_PREFETCH=0. The master's SIGCHLD handling reaps it
+    once it finishes.
+    """
+    from fundamentals import prefetch
+
+    if prefetch.enabled():
+        server.fundamentals_prefetch = subprocess.Popen([sys.executable, "-m", "fundamentals.prefetch"])
+
+
+def on_exit(server):
+    """Stop a prefetch that is still running when the master shuts down."""
+    proc = getattr(server, "fundamentals_prefetch", None)
+    if proc is not None and proc.poll() is None:
+        proc.terminate()
+        proc.wait(timeout=10)
@@ -0,0 +1,44 @@
+"""
+Local background-callback manager.
+
+Long-running callbacks execute in subprocesses coordinated through a
+diskcache directory, so no broker (Redis/Celery) is needed.
+
+Opt-in (BACKGROUND_CALLBACKS=1): each job runs in a forked child, so the
+price frames, catalog entries and view memo it fills die with it. Only the
+shared response cache (utils/response_cache.py) carries a job's result over
+to later requests, so by default callbacks run in the web worker and keep its
+caches warm.
+"""
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_CACHE_DIR = os.getenv("BACKGROUND_CACHE_DIR", ".cache/background")
+
+_manager = None
+
+
+def get_background_manager():
+    """
+    Return the shared DiskcacheManager, or None unless background callbacks are
+    enabled (BACKGROUND_CALLBACKS=1) and diskcache/multiprocess/psutil are installed.
+    """
+    global _manager
+    if _manager is not None:
+        return _manager
+
+    if os.getenv("BACKGROUND_CALLBACKS", "0") != "1":
+        return None
+
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+
+        _manager = DiskcacheManager(diskcache.Cache(BACKGROUND_CACHE_DIR))
+    except ImportError:
+        logger.warning("diskcache not installed; running callbacks in the web worker")
+        return None
+
+    return _manager
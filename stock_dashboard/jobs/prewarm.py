@@ -0,0 +1,38 @@
+"""
+Startup prewarm: load the default basket and build the default Home view
+before the first user arrives, so the first request hits warm caches.
+"""
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Default Home control values (see components/layout.py)
+DEFAULT_VIEW = {"metric": "close", "scale_mode": "raw", "season_year": "ALL", "mode": "light"}
+
+
+def prewarm(symbols=None):
+    """Refresh the catalog, load price frames and build the default view."""
+    from data.registry import default_symbols
+    from data.catalog import refresh_catalog
+    from callbacks.charts import build_dashboard
+
+    symbols = symbols or default_symbols()
+    start = time.perf_counter()
+    refresh_catalog(symbols)
+    build_dashboard(symbols, **DEFAULT_VIEW)
+    logger.info("Prewarmed default view for %d symbols in %.2fs", len(symbols), time.perf_counter() - start)
+
+
+def start_prewarm(symbols=None):
+    """Run prewarm in a daemon thread so startup is not blocked."""
+    def run():
+        try:
+            prewarm(symbols)
+        except Exception:
+            logger.exception("Prewarm failed")
+
+    thread = threading.Thread(target=run, name="prewarm", daemon=True)
+    thread.start()
+    return thread
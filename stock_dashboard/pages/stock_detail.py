@@ -2,6 +2,7 @@
 from dash import html, dcc, register_page
 import dash_bootstrap_components as dbc
 from fundamentals.fundamentals import get_fundamentals
+from components.technical import technical_section
 
 register_page(__name__, path_template="/stock/<ticker>")
 
@@ -60,5 +61,5 @@ def layout(ticker=None):
         fund_cards,
         recommendation,
         html.H2("Technical Analysis", className="mt-5"),
-        html.P("Candlestick chart and technical metrics coming soon...", className="text-muted")
+        technical_section(ticker)
     ], fluid=True)
\ No newline at end of file
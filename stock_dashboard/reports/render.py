@@ -0,0 +1,264 @@
+"""
+Batch report renderer: static HTML (and optionally PNG) snapshots of the
+Home panels for every ticker and for preset baskets, without the web server.
+
+The dataset is loaded and enriched once in the parent process. Reports are
+then rendered by a fork-based process pool whose workers inherit that
+dataset copy-on-write, using the same figure builders as the Home callback
+(callbacks/charts.py) and the month drilldown (callbacks/drilldown.py).
+
+    # every ticker plus the default basket
+    python -m reports.render
+
+    # a few tickers, two baskets, PNGs too (requires kaleido)
+    python -m reports.render --symbols NVDA,MSFT --basket megacap=AAPL,MSFT,NVDA --basket chips=NVDA,INTC --png
+
+A ``manifest.json`` listing every report, its files and the data versions is
+written next to the reports, and throughput is printed in reports/minute.
+"""
+import os
+import sys
+import html
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from datetime import datetime, timezone
+
+import numpy as np
+import plotly.offline
+
+from config.theme import DARK, LIGHT
+from components.cards import risk_chip_color
+from utils.metrics import (
+    add_returns, add_vwap, add_normalized_price, monthly_returns, yearly_returns, risk_table,
+)
+from callbacks.charts import price_figure, monthly_heatmap, yearly_figure, return_correlation, correlation_figure
+from callbacks.drilldown import month_stats, month_figure
+
+logger = logging.getLogger(__name__)
+
+try:
+    import kaleido  # noqa: F401  (PNG export through plotly.io.write_image)
+except ImportError:
+    kaleido = None
+
+DEFAULT_OUT = os.path.join(".cache", "reports")
+
+# Loaded once in the parent; forked workers read it without copying
+_dataset = None
+
+
+def load_dataset(symbols):
+    """Load and enrich every symbol once; returns the shared frames."""
+    from data.db import load_price_data
+
+    df = load_price_data(symbols)
+    if df.empty:
+        return None
+    df = add_normalized_price(add_vwap(add_returns(df)))
+    data = {"df": df, "monthly": monthly_returns(df), "yearly": yearly_returns(df)}
+    # Row positions per symbol, so each report slices its rows without scanning the universe
+    data["rows"] = {key: frame.groupby("symbol").indices for key, frame in data.items()}
+    # Ticker reports rank risk against the whole universe rather than a basket of one
+    data["universe_risk"] = _risk_by_symbol(df)
+    return data
+
+
+def _slice(data, key, symbols):
+    rows = data["rows"][key]
+    return data[key].iloc[np.concatenate([rows[s] for s in symbols])]
+
+
+def _risk_by_symbol(df):
+    rtab = risk_table(df, window=30)
+    return rtab.set_index("symbol") if not rtab.empty else rtab
+
+
+def _risk_cards_html(theme, rtab, note):
+    cards = []
+    for sym, r in rtab.iterrows():
+        color, label = risk_chip_color(float(r["risk_score"]))
+        cards.append(
+            f'<div class="card" style="border-top:4px solid {color}">'
+            f'<div class="muted">{html.escape(sym)}</div>'
+            f'<div class="score">{r["risk_score"]:.2f}/100</div>'
+            f'<div style="color:{color};font-weight:700">{label} Risk</div>'
+            f'<div class="muted">Ann Vol: {r["ann_vol"]:.2%} | Max DD: {r["max_drawdown"]:.2%}</div>'
+            "</div>"
+        )
+    return f'<h2>Risk</h2><div class="muted">{html.escape(note)}</div><div class="cards">{"".join(cards)}</div>'
+
+
+def _page(title, theme, sections):
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<script src="plotly.min.js"></script>
+<style>
+body {{ background:{theme["APP_BG"]}; color:{theme["TEXT"]}; font-family:sans-serif; margin:24px; }}
+.muted {{ color:{theme["MUTED"]}; font-size:12px; }}
+.cards {{ display:flex; gap:12px; flex-wrap:wrap; }}
+.card {{ background:{theme["CARD_BG"]}; border-radius:12px; padding:12px; min-width:240px; }}
+.score {{ font-size:28px; font-weight:800; }}
+</style></head>
+<body><h1>{html.escape(title)}</h1>{"".join(sections)}</body></html>
+"""
+
+
+def render_report(job):
+    """Render one report from the shared dataset; returns its manifest entry."""
+    start = time.perf_counter()
+    theme = DARK if job["theme"] == "dark" else LIGHT
+    data = _dataset
+    symbols = [s for s in job["symbols"] if s in data["rows"]["df"]]
+    entry = {"name": job["name"], "kind": job["kind"], "symbols": symbols, "files": []}
+    if not symbols:
+        entry["error"] = "no data"
+        return entry
+
+    df = _slice(data, "df", symbols)
+    figures = {
+        "price": price_figure(df, "close", "norm" if len(symbols) > 1 else "raw", "ALL", theme),
+        "monthly": monthly_heatmap(_slice(data, "monthly", symbols), "ALL", theme),
+        "yearly": yearly_figure(_slice(data, "yearly", symbols), "ALL", theme),
+    }
+    if job["kind"] == "basket":
+        figures["correlation"] = correlation_figure(return_correlation(df), "ALL", theme)
+        rtab = _risk_by_symbol(df)
+        note = f"Percentile ranks within this basket ({len(symbols)} tickers)"
+    else:
+        # Latest month drilldown, as the heatmap click shows it
+        sym = symbols[0]
+        last = df["date"].max()
+        sdf = df[(df["date"].dt.year == last.year) & (df["date"].dt.month == last.month)]
+        figures["month"] = month_figure(sdf, sym, last.year, last.month, theme)
+        mret, vol, dd = month_stats(sdf)
+        figures["month"].add_annotation(
+            text=f"Return {mret:.2%} | Vol {vol:.2%} | Max DD {dd:.2%}",
+            xref="paper", yref="paper", x=0, y=1.08, showarrow=False,
+        )
+        rtab = data["universe_risk"].loc[data["universe_risk"].index.intersection(symbols)]
+        note = f"Percentile ranks across all {len(data['universe_risk'])} tickers"
+
+    sections = [fig.to_html(full_html=False, include_plotlyjs=False) for fig in figures.values()]
+    if not rtab.empty:
+        sections.append(_risk_cards_html(theme, rtab, note))
+
+    base = f"{job['kind']}-{job['name']}"
+    path = os.path.join(job["out"], base + ".html")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(_page(f"{job['name']} report", theme, sections))
+    entry["files"].append(os.path.basename(path))
+
+    if job["png"]:
+        for key, fig in figures.items():
+            png = os.path.join(job["out"], f"{base}-{key}.png")
+            fig.write_image(png, width=1200, height=500)
+            entry["files"].append(os.path.basename(png))
+
+    entry["seconds"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def _jobs(symbols, baskets, out, theme, png):
+    jobs = [
+        {"name": name, "kind": "basket", "symbols": members, "out": out, "theme": theme, "png": png}
+        for name, members in baskets.items()
+    ]
+    jobs += [
+        {"name": sym, "kind": "ticker", "symbols": [sym], "out": out, "theme": theme, "png": png}
+        for sym in symbols
+    ]
+    return jobs
+
+
+def render_all(symbols, baskets, out=DEFAULT_OUT, workers=None, theme="light", png=False):
+    """Render every ticker and basket report into ``out``; returns the manifest."""
+    global _dataset
+    if png and kaleido is None:
+        raise RuntimeError("PNG output needs the optional 'kaleido' package")
+
+    os.makedirs(out, exist_ok=True)
+    universe = sorted(set(symbols) | {s for members in baskets.values() for s in members})
+
+    from data.catalog import data_versions
+
+    # Read before loading, so the manifest never claims newer data than was rendered
+    versions = data_versions(universe)
+    load_start = time.perf_counter()
+    _dataset = load_dataset(universe)
+    load_seconds = time.perf_counter() - load_start
+    if _dataset is None:
+        raise RuntimeError("No price data for the requested symbols")
+
+    with open(os.path.join(out, "plotly.min.js"), "w", encoding="utf-8") as fh:
+        fh.write(plotly.offline.get_plotlyjs())
+
+    jobs = _jobs(symbols, baskets, out, theme, png)
+    workers = workers or os.cpu_count() or 1
+    render_start = time.perf_counter()
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            entries = list(pool.imap_unordered(render_report, jobs))
+    else:
+        entries = [render_report(job) for job in jobs]
+    render_seconds = time.perf_counter() - render_start
+
+    rendered = sum(1 for e in entries if "error" not in e)
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "theme": theme,
+        "workers": workers,
+        "load_seconds": round(load_seconds, 3),
+        "render_seconds": round(render_seconds, 3),
+        "reports_per_minute": round(rendered / render_seconds * 60, 1) if render_seconds else None,
+        "data_versions": {sym: versions.get(sym) for sym in universe},
+        "reports": sorted(entries, key=lambda e: (e["kind"], e["name"])),
+    }
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, default=str)
+    return manifest
+
+
+def _parse_baskets(values):
+    baskets = {}
+    for value in values:
+        name, _, members = value.partition("=")
+        if not name or not members:
+            raise SystemExit(f"--basket expects NAME=SYM,SYM,...: {value!r}")
+        baskets[name] = [s.strip().upper() for s in members.split(",") if s.strip()]
+    return baskets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", help="comma-separated tickers (default: every ticker in the registry)")
+    parser.add_argument("--basket", action="append", default=[], help="NAME=SYM,SYM,... (repeatable; default: the default selection)")
+    parser.add_argument("--out", help=f"output directory (default: {DEFAULT_OUT}/<date>)")
+    parser.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    parser.add_argument("--theme", choices=["light", "dark"], default="light")
+    parser.add_argument("--png", action="store_true", help="also write PNGs (requires kaleido)")
+    args = parser.parse_args(argv)
+
+    from data.registry import registry
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",")] if args.symbols else registry.all_symbols()
+    baskets = _parse_baskets(args.basket) or {"default": registry.default_symbols()}
+    out = args.out or os.path.join(DEFAULT_OUT, datetime.now().strftime("%Y%m%d"))
+
+    manifest = render_all(symbols, baskets, out, args.workers, args.theme, args.png)
+    failed = [e["name"] for e in manifest["reports"] if "error" in e]
+    print(
+        f"{len(manifest['reports']) - len(failed)} reports in {manifest['render_seconds']:.1f}s "
+        f"({manifest['reports_per_minute']} reports/minute, {manifest['workers']} workers; "
+        f"data load {manifest['load_seconds']:.1f}s) -> {out}"
+    )
+    if failed:
+        print(f"Skipped (no data): {', '.join(failed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -2,4 +2,10 @@
 
 source venv/bin/activate
 
-python app.py
\ No newline at end of file
+# ./run.sh        -> Flask dev server (set DASH_DEBUG=1 for debug mode)
+# ./run.sh prod   -> gunicorn with preloaded app and multiple workers
+if [ "$1" == "prod" ]; then
+    gunicorn -c gunicorn.conf.py wsgi:server
+else
+    python app.py
+fi
@@ -9,6 +9,11 @@ fi
 source venv/bin/activate
 
 pip install --upgrade pip
-pip install -r requirements.txt
+# ./setup.sh dev also installs the test / load-test tools
+if [ "$1" == "dev" ]; then
+    pip install -r requirements-dev.txt
+else
+    pip install -r requirements.txt
+fi
 
 echo "Setup complete!"
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Modules import each other from stock_dashboard/ (data.db, utils.metrics, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# data.db requires these at import; the URI is never contacted, since the
+# in-memory stand-in is installed before any client is opened
+os.environ["MONGO_URI"] = "mongodb://stand-in.invalid"
+os.environ["MONGO_DB"] = "tests"
+os.environ["FUNDAMENTALS_PROVIDER"] = "offline"
+
+from tools import mongo_stand_in  # noqa: E402
+
+mongo_stand_in.install()
+
+
+@pytest.fixture
+def mongo():
+    """Empty in-memory database with the per-process caches that sit in front of it cleared."""
+    from data import db as dbmod, catalog
+
+    for name in dbmod.db.list_collection_names():
+        dbmod.db.drop_collection(name)
+    dbmod._frame_cache.clear()
+    with catalog._lock:
+        catalog._entries.clear()
+    yield dbmod.db
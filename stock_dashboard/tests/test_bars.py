@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from data import bars as barsmod
+from data.bars import bars_for_range, build_pyramid
+from data.synthetic import seed_prices
+
+
+@pytest.fixture
+def seeded(mongo):
+    barsmod._pyramids.clear()
+    seed_prices(["AAA"], start="2018-01-01", end="2023-12-29")
+    return mongo
+
+
+def test_full_history_falls_back_to_a_coarser_level(seeded):
+    level, bars = bars_for_range("AAA")
+    assert level == "W"
+    assert 300 < len(bars) <= 400
+
+
+@pytest.mark.parametrize("start,end,max_candles,level", [
+    ("2023-06-01", "2023-12-29", 400, "D"),
+    ("2020-01-01", "2023-12-29", 400, "W"),
+    ("2020-01-01", "2023-12-29", 100, "M"),
+    ("2018-01-01", "2023-12-29", 20, "Q"),
+])
+def test_finest_level_that_fits(seeded, start, end, max_candles, level):
+    got, bars = bars_for_range("AAA", start, end, max_candles=max_candles)
+    assert got == level
+    assert bars.index.min() >= pd.Timestamp(start)
+    assert bars.index.max() <= pd.Timestamp(end)
+    if level != "Q":
+        assert len(bars) <= max_candles
+
+
+def test_moving_averages_are_filled_at_the_range_start(seeded):
+    level, bars = bars_for_range("AAA", "2023-06-01", "2023-12-29")
+    assert level == "D"
+    assert bars[["ma20", "ma50"]].iloc[0].notna().all()
+
+
+def test_resampled_levels_aggregate_ohlcv():
+    daily = pd.DataFrame(
+        {"open": [1.0, 2.0, 3.0], "high": [5.0, 6.0, 4.0], "low": [0.5, 1.5, 0.1],
+         "close": [2.0, 3.0, 2.5], "volume": [10.0, 20.0, 30.0]},
+        index=pd.to_datetime(["2024-01-03", "2024-01-04", "2024-01-05"]),
+    )
+    week = build_pyramid(daily)["W"].iloc[0]
+    assert week[["open", "high", "low", "close", "volume"]].tolist() == [1.0, 6.0, 0.1, 2.5, 60.0]
+
+
+def test_unknown_symbol(mongo):
+    assert bars_for_range("NONE") is None
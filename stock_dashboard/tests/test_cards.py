@@ -0,0 +1,41 @@
+from callbacks.charts import render_window_cards
+from components.cards import risk_card, risk_chip_color, sparkline
+from config.theme import DARK
+
+RISK_DATA = {
+    "30": [
+        {"symbol": "BBB", "risk_score": 100.0, "ann_vol": 0.42, "max_drawdown": -0.3, "trend": [0.4, 0.42]},
+        {"symbol": "AAA", "risk_score": 55.0, "ann_vol": 0.21, "max_drawdown": -0.1, "trend": []},
+    ],
+}
+
+
+def _text(component):
+    if isinstance(component, str):
+        return component
+    children = getattr(component, "children", None) or []
+    if not isinstance(children, list):
+        children = [children]
+    return " ".join(_text(child) for child in children)
+
+
+def test_window_cards_keep_the_stored_order():
+    cards = render_window_cards(DARK, RISK_DATA, 30)
+    assert [card.children[0].children for card in cards] == ["BBB", "AAA"]
+    assert "Max DD: -30.00%" in _text(cards[0])
+
+
+def test_unknown_window_or_empty_store_renders_nothing():
+    assert render_window_cards(DARK, RISK_DATA, 90) == []
+    assert render_window_cards(DARK, None, 30) == []
+
+
+def test_sparkline_only_with_a_trend():
+    with_trend = risk_card(DARK, "BBB", 100.0, 0.42, -0.3, trend=[0.4, 0.42])
+    without = risk_card(DARK, "AAA", 55.0, 0.21, -0.1)
+    assert len(with_trend.children) == len(without.children) + 1
+    assert sparkline([1, 2], "#fff")["data"][0]["y"] == [1, 2]
+
+
+def test_chip_color_follows_the_score():
+    assert risk_chip_color(90)[1] != risk_chip_color(10)[1]
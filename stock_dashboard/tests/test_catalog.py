@@ -0,0 +1,40 @@
+import datetime
+
+import pytest
+
+from data import catalog
+
+
+@pytest.fixture
+def bars(mongo):
+    col = mongo["aaa_prices"]
+    col.insert_many([
+        {"date": datetime.datetime(2024, 1, d), "close": 10.0 + d, "volume": 100}
+        for d in (1, 2, 3)
+    ])
+    return col
+
+
+def test_untouched_data_keeps_its_version(bars):
+    before = catalog.data_version("AAA")
+    catalog.refresh_symbol("AAA")
+    assert catalog.data_version("AAA") == before
+
+
+def test_in_place_correction_with_updated_at_changes_the_version(bars):
+    before = catalog.data_version("AAA")
+    bars.update_one(
+        {"date": datetime.datetime(2024, 1, 2)},
+        {"$set": {"close": 99.0, "updated_at": datetime.datetime(2024, 2, 1)}},
+    )
+    catalog.refresh_symbol("AAA")
+    assert catalog.data_version("AAA") != before
+
+
+def test_reload_with_same_range_and_count_changes_the_version(bars):
+    before = catalog.data_version("AAA")
+    docs = list(bars.find({}, {"_id": 0}))
+    bars.delete_many({})
+    bars.insert_many(docs)
+    catalog.refresh_symbol("AAA")
+    assert catalog.data_version("AAA") != before
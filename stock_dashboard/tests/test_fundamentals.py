@@ -0,0 +1,33 @@
+from fundamentals import fundamentals
+from fundamentals.cache import FundamentalsCache
+from fundamentals.providers import FixtureProvider
+
+
+def test_cache_is_namespaced_by_provider(tmp_path):
+    cache = FundamentalsCache(str(tmp_path / "f.sqlite"))
+    cache.put("offline", "NVDA", {"Beta": 1.5})
+
+    assert cache.get("offline", "NVDA")["Beta"][0] == 1.5
+    assert cache.get("yfinance", "NVDA") == {}
+
+
+def test_offline_values_are_not_served_for_another_provider(tmp_path, monkeypatch):
+    cache = FundamentalsCache(str(tmp_path / "f.sqlite"))
+    monkeypatch.setattr(fundamentals, "_cache", cache)
+
+    offline = FixtureProvider()
+    monkeypatch.setattr(fundamentals, "get_provider", lambda: offline)
+    assert fundamentals.get_fundamentals("NVDA")["Beta"] is not None
+
+    class Live:
+        name = "yfinance"
+        calls = 0
+
+        def fetch(self, ticker_symbol):
+            Live.calls += 1
+            return {"beta": 9.9}
+
+    monkeypatch.setattr(fundamentals, "get_provider", lambda: Live())
+    assert fundamentals.get_fundamentals("NVDA")["Beta"] == 9.9
+    assert Live.calls == 1
+
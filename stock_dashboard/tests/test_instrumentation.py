@@ -0,0 +1,81 @@
+import dash
+from dash import html, Input, Output
+
+from utils import instrumentation
+from utils.instrumentation import CALLBACK_REQUESTS, STAGE_SECONDS, Counter, register_instrumentation
+
+
+def _app():
+    app = dash.Dash(__name__)
+    app.layout = html.Div([html.Div(id="inp"), html.Div(id="out")])
+
+    @app.callback(Output("out", "children"), Input("inp", "children"))
+    def echo(value):
+        return value
+
+    register_instrumentation(app)
+    return app
+
+
+def _post(client, output, value="x", **kwargs):
+    return client.post("/_dash-update-component", json={
+        "output": output,
+        "outputs": {"id": "out", "property": "children"},
+        "inputs": [{"id": "inp", "property": "children", "value": value}],
+        "changedPropIds": ["inp.children"],
+    }, **kwargs)
+
+
+def test_callback_label_is_a_registered_output_id():
+    client = _app().server.test_client()
+    before = CALLBACK_REQUESTS.value(callback="out.children", status=200)
+    assert _post(client, "out.children").status_code == 200
+    assert CALLBACK_REQUESTS.value(callback="out.children", status=200) == before + 1
+
+
+def test_unregistered_output_is_counted_as_unknown():
+    client = _app().server.test_client()
+    bogus = 'evil"}\ninjected{x="1'
+    before = sum(v for (name, _), v in CALLBACK_REQUESTS._values.items() if name == "unknown")
+    _post(client, bogus)
+
+    names = {name for name, _ in CALLBACK_REQUESTS._values}
+    assert bogus not in names
+    assert sum(v for (name, _), v in CALLBACK_REQUESTS._values.items() if name == "unknown") == before + 1
+
+
+def test_unstaged_time_is_recorded_without_other_stages():
+    client = _app().server.test_client()
+    before = STAGE_SECONDS._series.get(("unstaged",), [0])[-1]
+    _post(client, "out.children")
+    assert STAGE_SECONDS._series[("unstaged",)][-1] == before + 1
+
+
+def test_metrics_only_for_allowed_clients(monkeypatch):
+    client = _app().server.test_client()
+    assert client.get("/metrics").status_code == 200
+    remote = {"REMOTE_ADDR": "203.0.113.7"}
+    assert client.get("/metrics", environ_base=remote).status_code == 403
+
+    monkeypatch.setattr(instrumentation, "METRICS_TOKEN", "s3cret")
+    ok = client.get("/metrics", environ_base=remote, headers={"Authorization": "Bearer s3cret"})
+    assert ok.status_code == 200
+    assert client.get("/metrics", environ_base=remote, headers={"Authorization": "Bearer nope"}).status_code == 403
+
+
+def test_profile_header_ignored_for_other_clients(monkeypatch, tmp_path):
+    monkeypatch.setattr(instrumentation, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(instrumentation, "PROFILE_DIR", str(tmp_path))
+    client = _app().server.test_client()
+
+    local = _post(client, "out.children", headers={"X-Profile": "1"})
+    assert "X-Profile-Output" in local.headers
+    remote = _post(client, "out.children", headers={"X-Profile": "1"}, environ_base={"REMOTE_ADDR": "203.0.113.7"})
+    assert "X-Profile-Output" not in remote.headers
+
+
+def test_label_values_are_escaped():
+    counter = Counter("t_total", "test", ["name"])
+    counter.inc(name='a"b\\c\nd')
+    assert instrumentation._format_labels(["name"], ['a"b\\c\nd']) == '{name="a\\"b\\\\c\\nd"}'
+    assert counter.render()[-1] == 't_total{name="a\\"b\\\\c\\nd"} 1'
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.synthetic import synthetic_bars
+from utils.live import advance_cursor, init_cursor, kpi_series
+from utils.metrics import add_returns, annual_vol_by_symbol, cagr_by_symbol
+
+
+def _bars():
+    frames = []
+    for i, sym in enumerate(["AAA", "BBB"]):
+        df = synthetic_bars(sym, start="2023-01-02", end="2024-02-15", seed=i)
+        frames.append(df.assign(symbol=sym)[["symbol", "date", "close", "volume"]])
+    return add_returns(pd.concat(frames, ignore_index=True))
+
+
+def _split(df, at):
+    return df[df["date"] < at], df[df["date"] >= at].drop(columns="returns")
+
+
+@pytest.mark.parametrize("season_year", ["ALL", "2024"])
+def test_advancing_matches_a_fresh_cursor(season_year):
+    df = _bars()
+    head, tail = _split(df, pd.Timestamp("2024-01-20"))
+
+    state = init_cursor(head, season_year)
+    points = advance_cursor(state, tail, "close", "linear", season_year)
+    fresh = init_cursor(df, season_year)
+
+    assert set(state) == set(fresh)
+    for sym, st in state.items():
+        want = fresh[sym]
+        for key in ("n", "last_date", "month_n", "year_n", "ret_n", "trace"):
+            assert st[key] == want[key], key
+        for key in ("last_close", "cum_pv", "cum_vol", "ret_mean", "ret_m2", "peak", "max_dd", "month_sum", "year_sum"):
+            assert st[key] == pytest.approx(want[key], rel=1e-9, abs=1e-12), key
+        np.testing.assert_allclose(st["recent"], want["recent"])
+        assert st["month"] == pytest.approx(want["month"])
+        assert st["year"] == pytest.approx(want["year"])
+
+        dates, ys = points[sym]
+        new = tail[tail["symbol"] == sym]
+        assert len(dates) == len(new)
+        assert ys == pytest.approx(new["close"].tolist())
+
+
+def test_bars_outside_the_selected_year_are_skipped():
+    df = _bars()
+    head, tail = _split(df, pd.Timestamp("2023-12-20"))
+
+    state = init_cursor(head, "2023")
+    points = advance_cursor(state, tail, "close", "linear", "2023")
+
+    assert all(d.startswith("2023-12") for dates, _ in points.values() for d in dates)
+    assert state["AAA"]["last_date"].startswith("2023-12")
+
+
+def test_normalized_points_use_the_view_start():
+    df = _bars()
+    head, tail = _split(df, pd.Timestamp("2024-02-01"))
+    state = init_cursor(head, "ALL")
+    _, ys = advance_cursor(state, tail, "close", "norm", "ALL")["BBB"]
+
+    bbb = df[df["symbol"] == "BBB"]
+    expected = bbb["close"].iloc[-len(ys):] / bbb["close"].iloc[0] * 100
+    assert ys == pytest.approx(expected.tolist())
+
+
+def test_kpis_from_the_cursor_match_the_full_computation():
+    df = _bars()
+    head, tail = _split(df, pd.Timestamp("2024-01-20"))
+    state = init_cursor(head, "ALL")
+    advance_cursor(state, tail, "close", "linear", "ALL")
+
+    _, _, _, cagr, vol, _ = kpi_series(state)
+    pd.testing.assert_series_equal(cagr.sort_index(), cagr_by_symbol(df).sort_index(), check_names=False)
+    pd.testing.assert_series_equal(vol.sort_index(), annual_vol_by_symbol(df).sort_index(), check_names=False)
+
+
+def test_cursor_starts_from_the_drawn_bars(mongo):
+    from callbacks.live import drawn_bars
+    from data.synthetic import seed_prices
+
+    seed_prices(["AAA", "BBB"], start="2024-01-02", end="2024-02-15")
+    # The chart was drawn before the last week of bars was stored
+    live_view = {"AAA": "2024-02-08T00:00:00", "BBB": "2024-02-07T00:00:00", "OLD": "2024-02-08T00:00:00"}
+    state = init_cursor(drawn_bars(["AAA", "BBB"], live_view), "ALL")
+
+    assert state["AAA"]["last_date"] == "2024-02-08T00:00:00"
+    assert state["BBB"]["last_date"] == "2024-02-07T00:00:00"
+
+
+def test_only_views_reaching_the_present_are_polled():
+    from callbacks.live import follows_new_bars
+
+    this_year = str(pd.Timestamp.today().year)
+    assert follows_new_bars(["on"], "ALL")
+    assert follows_new_bars(["on"], this_year)
+    assert not follows_new_bars(["on"], "2015")
+    assert not follows_new_bars([], "ALL")
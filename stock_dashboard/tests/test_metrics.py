@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from callbacks.charts import risk_surface_data
+from callbacks.live import live_risk_data
+from data.synthetic import synthetic_bars
+from utils.live import init_cursor
+from utils.metrics import (
+    TRADING_DAYS, add_returns, max_drawdown_by_symbol, risk_surface, risk_table,
+)
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def _prices(end="2024-06-28"):
+    frames = [
+        synthetic_bars(sym, start="2022-01-03", end=end, seed=i).assign(symbol=sym)
+        for i, sym in enumerate(SYMBOLS)
+    ]
+    return add_returns(pd.concat(frames, ignore_index=True)[["symbol", "date", "close", "volume"]])
+
+
+def _cards(history, view):
+    surface = risk_surface(history)
+    surface = surface[surface["date"].isin(view["date"])]
+    return risk_surface_data(surface, max_drawdown_by_symbol(view))
+
+
+def test_surface_matches_pandas_rolling_windows():
+    df = _prices()
+    surface = risk_surface(df, windows=(10, 90))
+
+    for sym, sdf in df.groupby("symbol"):
+        sdf = sdf.set_index("date")
+        for window in (10, 90):
+            got = surface[(surface["symbol"] == sym) & (surface["window"] == window)].set_index("date")
+            vol = sdf["returns"].rolling(window).std() * np.sqrt(TRADING_DAYS)
+            dd = sdf["close"] / sdf["close"].rolling(window).max() - 1
+            assert len(got) == len(sdf) - window
+            np.testing.assert_allclose(got["ann_vol"], vol.loc[got.index], rtol=1e-7)
+            np.testing.assert_allclose(got["drawdown"], dd.loc[got.index])
+
+
+@pytest.mark.parametrize("season_year", ["ALL", "2023"])
+def test_default_window_cards_match_risk_table(season_year):
+    history = _prices()
+    view = history if season_year == "ALL" else history[history["date"].dt.year == int(season_year)]
+
+    cards = _cards(history, view)["30"]
+    table = risk_table(view, window=30)
+
+    assert [c["symbol"] for c in cards] == table["symbol"].tolist()
+    np.testing.assert_allclose([c["risk_score"] for c in cards], table["risk_score"])
+    np.testing.assert_allclose([c["ann_vol"] for c in cards], table["ann_vol"], rtol=1e-7)
+    np.testing.assert_allclose([c["max_drawdown"] for c in cards], table["max_drawdown"])
+
+
+def test_cards_rank_each_symbols_latest_row():
+    # DDD stops trading a month early; the cards still score it against the others
+    history = _prices()
+    history = history[(history["symbol"] != "DDD") | (history["date"] < "2024-05-31")]
+
+    cards = _cards(history, history)["30"]
+    assert sorted(c["symbol"] for c in cards) == SYMBOLS
+    assert [c["symbol"] for c in cards] == risk_table(history, window=30)["symbol"].tolist()
+
+
+def test_trend_is_the_windows_volatility():
+    history = _prices()
+    cards = _cards(history, history)["30"]
+    for card in cards:
+        assert 0 < len(card["trend"]) <= 60
+        assert card["trend"][-1] == pytest.approx(card["ann_vol"], abs=1e-4)
+
+
+def test_live_cursor_rescoring_matches_the_full_update():
+    history = _prices()
+    full = _cards(history, history)
+    live = live_risk_data(full, init_cursor(history, "ALL"))
+
+    for window in ("10", "30"):
+        assert [c["symbol"] for c in live[window]] == [c["symbol"] for c in full[window]]
+        np.testing.assert_allclose(
+            [c["risk_score"] for c in live[window]], [c["risk_score"] for c in full[window]]
+        )
+        np.testing.assert_allclose([c["ann_vol"] for c in live[window]], [c["ann_vol"] for c in full[window]], rtol=1e-7)
+    # Longer windows are left as the full update computed them
+    assert live["252"] == full["252"]
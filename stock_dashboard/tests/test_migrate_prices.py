@@ -0,0 +1,78 @@
+import datetime
+
+import pytest
+
+from data import catalog, db as dbmod
+from data.migrate_prices import sync_prices
+
+
+def _bars(n, start=datetime.datetime(2024, 1, 1)):
+    return [
+        {"date": start + datetime.timedelta(days=i), "close": 100.0 + i, "volume": 1000 + i}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def sources(mongo):
+    for sym, n in [("AAA", 5), ("BBB", 4), ("CCC", 3)]:
+        mongo[sym.lower() + "_prices"].insert_many(_bars(n))
+    return mongo
+
+
+def _rows(mongo, sym):
+    return mongo["prices"].count_documents({"symbol": sym})
+
+
+def test_full_sync_copies_every_symbol(sources):
+    assert sync_prices() == {"AAA": 5, "BBB": 4, "CCC": 3}
+    assert sync_prices() == {"AAA": 0, "BBB": 0, "CCC": 0}
+
+
+def test_incremental_sync_copies_only_newer_bars(sources):
+    sync_prices()
+    sources["aaa_prices"].insert_many(_bars(2, datetime.datetime(2024, 2, 1)))
+    assert sync_prices(["AAA"]) == {"AAA": 2}
+    assert _rows(sources, "AAA") == 7
+
+
+def test_subset_rebuild_keeps_other_symbols(sources):
+    sync_prices()
+    sources["bbb_prices"].delete_one({"date": datetime.datetime(2024, 1, 4)})
+
+    assert sync_prices(["BBB"], rebuild=True) == {"BBB": 3}
+    assert _rows(sources, "AAA") == 5
+    assert _rows(sources, "BBB") == 3
+    assert _rows(sources, "CCC") == 3
+
+
+def test_corrected_older_bar_is_recopied(sources):
+    sync_prices()
+    sources["ccc_prices"].update_one({"date": datetime.datetime(2024, 1, 1)}, {"$set": {"close": 1.0}})
+
+    assert sync_prices(["CCC"]) == {"CCC": 3}
+    doc = sources["prices"].find_one({"symbol": "CCC", "date": datetime.datetime(2024, 1, 1)})
+    assert doc["close"] == 1.0
+    assert _rows(sources, "CCC") == 3
+
+
+def test_correction_changes_the_data_version(sources, monkeypatch):
+    monkeypatch.setattr(dbmod, "PRICE_SOURCE", "consolidated")
+    sync_prices()
+    before = catalog.data_version("CCC")
+
+    sources["ccc_prices"].update_one({"date": datetime.datetime(2024, 1, 2)}, {"$set": {"close": 5.0}})
+    sync_prices(["CCC"])
+    assert catalog.data_version("CCC") != before
+
+
+def test_consolidated_catalog_probe(sources, monkeypatch):
+    monkeypatch.setattr(dbmod, "PRICE_SOURCE", "consolidated")
+    sync_prices()
+
+    entries = catalog.refresh_catalog(["AAA", "CCC", "ZZZ"])
+    assert entries["ZZZ"] is None
+    assert entries["AAA"]["rows"] == 5
+    assert entries["CCC"]["min_date"] == datetime.datetime(2024, 1, 1)
+    assert entries["CCC"]["max_date"] == datetime.datetime(2024, 1, 3)
+    assert set(catalog.get_entries(["CCC", "ZZZ", "AAA"])) == {"CCC", "AAA"}
@@ -0,0 +1,89 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from callbacks import portfolio as portfolio_cb
+from utils.portfolio import drawdowns, efficient_frontier, evaluate, return_stats, sample_weights
+
+
+def _returns(seed=0, days=300, symbols=("AAA", "BBB", "CCC")):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=days)
+    frames = [
+        pd.DataFrame({"symbol": sym, "date": dates, "returns": rng.normal(0.0005 * i, 0.01 + 0.005 * i, days)})
+        for i, sym in enumerate(symbols)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_evaluate_matches_a_per_portfolio_loop():
+    stats = return_stats(_returns())
+    weights = sample_weights(50, 3)
+    scores = evaluate(stats, weights, rf=0.04)
+
+    for w, ret, vol, sharpe in zip(weights, scores["ret"], scores["vol"], scores["sharpe"]):
+        assert ret == pytest.approx(w @ stats["mu"])
+        assert vol == pytest.approx(np.sqrt(w @ stats["cov"] @ w))
+        assert sharpe == pytest.approx((ret - 0.04) / vol)
+
+
+def test_sample_weights_are_long_only_and_fully_invested():
+    weights = sample_weights(1000, 5, seed=3)
+    assert (weights >= 0).all()
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+
+def test_sharpe_is_nan_without_volatility():
+    flat = _returns().assign(returns=0.0)
+    scores = evaluate(return_stats(flat), sample_weights(10, 3))
+    assert np.isnan(scores["sharpe"]).all()
+
+
+def test_frontier_is_the_upper_envelope():
+    stats = return_stats(_returns(seed=1))
+    scores = evaluate(stats, sample_weights(5000, 3))
+    ret, vol = scores["ret"], scores["vol"]
+    frontier = efficient_frontier(ret, vol)
+
+    assert len(frontier) > 3
+    assert np.all(np.diff(vol[frontier]) > 0)
+    assert np.all(np.diff(ret[frontier]) >= 0)
+    assert ret[frontier].max() == ret.max()
+    # Nothing in a frontier point's volatility bucket or below beats it
+    width = (vol.max() - vol.min()) / 60
+    bucket = np.minimum(((vol - vol.min()) / width).astype(int), 59)
+    for i in frontier:
+        assert ret[bucket <= bucket[i]].max() == ret[i]
+
+
+def test_frontier_of_degenerate_samples_is_empty():
+    assert len(efficient_frontier(np.array([]), np.array([]))) == 0
+    assert len(efficient_frontier(np.array([np.nan, 1.0]), np.array([0.1, np.nan]))) == 0
+    assert efficient_frontier(np.array([np.nan, 0.2, 0.1]), np.array([0.1, 0.3, 0.2])).tolist() == [2, 1]
+
+
+def test_drawdowns_of_single_asset_portfolios():
+    df = _returns(days=5)
+    stats = return_stats(df)
+    wealth = np.cumprod(1 + stats["daily"][:, 0])
+    expected = (wealth / np.maximum.accumulate(wealth) - 1).min()
+    assert drawdowns(stats, np.array([[1.0, 0.0, 0.0]]))[0] == pytest.approx(expected)
+
+
+def test_flat_basket_has_no_frontier(mongo):
+    for sym in ("FLA", "FLB"):
+        mongo[sym.lower() + "_prices"].insert_many([
+            {"date": datetime.datetime(2024, 1, 1) + datetime.timedelta(days=i), "close": 10.0, "volume": 1}
+            for i in range(10)
+        ])
+    portfolio_cb._portfolios.clear()
+    assert portfolio_cb.analyze_basket(["FLA", "FLB"], "ALL") is None
+
+
+def test_single_row_basket_has_no_frontier(mongo):
+    for sym in ("ONA", "ONB"):
+        mongo[sym.lower() + "_prices"].insert_one({"date": datetime.datetime(2024, 1, 1), "close": 10.0, "volume": 1})
+    portfolio_cb._portfolios.clear()
+    assert portfolio_cb.analyze_basket(["ONA", "ONB"], "ALL") is None
@@ -0,0 +1,68 @@
+import time
+import threading
+
+from fundamentals import prefetch
+from fundamentals.prefetch import RateLimiter, prefetch_fundamentals
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    limiter = RateLimiter(50)
+    stamps = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.wait()
+        with lock:
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stamps.sort()
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert min(gaps) >= limiter.interval * 0.9
+    assert stamps[-1] - stamps[0] >= 5 * limiter.interval * 0.9
+
+
+def test_rate_limiter_without_a_rate_does_not_wait():
+    limiter = RateLimiter(0)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.1
+
+
+def test_prefetch_reports_failures_per_ticker(monkeypatch):
+    fetched = []
+
+    def fetch(sym):
+        if sym == "BAD":
+            raise ValueError("no data")
+        fetched.append(sym)
+
+    monkeypatch.setattr(prefetch, "fetch_fundamentals", fetch)
+    monkeypatch.setattr(prefetch, "is_fresh", lambda sym: False)
+    results = prefetch_fundamentals(["AAA", "BAD", "CCC"], max_workers=2, rate=0)
+
+    assert sorted(fetched) == ["AAA", "CCC"]
+    assert results["AAA"] is None and results["CCC"] is None
+    assert isinstance(results["BAD"], ValueError)
+
+
+def test_fresh_tickers_are_skipped(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(prefetch, "fetch_fundamentals", fetched.append)
+    monkeypatch.setattr(prefetch, "is_fresh", lambda sym: sym == "AAA")
+
+    assert set(prefetch_fundamentals(["AAA", "CCC"], rate=0)) == {"CCC"}
+    assert fetched == ["CCC"]
+
+
+def test_prefetch_is_on_unless_switched_off(monkeypatch):
+    monkeypatch.delenv("FUNDAMENTALS_PREFETCH", raising=False)
+    assert prefetch.enabled()
+    monkeypatch.setenv("FUNDAMENTALS_PREFETCH", "0")
+    assert not prefetch.enabled()
@@ -0,0 +1,77 @@
+import time
+import datetime
+import threading
+
+import pytest
+
+from data.registry import SymbolRegistry
+
+
+@pytest.fixture
+def registry(mongo):
+    bar = {"date": datetime.datetime(2024, 1, 2), "close": 1.0, "volume": 1}
+    for sym in ["AMD", "AMZN", "AAPL", "MSFT", "NVDA"]:
+        mongo[sym.lower() + "_prices"].insert_one(dict(bar))
+    mongo["symbol_meta"].insert_many([
+        {"symbol": "aapl", "name": "Apple Inc."},
+        {"symbol": "AMZN", "name": "Amazon.com Inc."},
+        {"symbol": "MSFT", "name": "Microsoft Corporation"},
+        {"symbol": "NVDA", "name": "NVIDIA Corporation"},
+        {"symbol": "ZZZZ", "name": "No prices stored"},
+    ])
+    return SymbolRegistry()
+
+
+def test_universe_comes_from_price_collections(registry):
+    assert registry.all_symbols() == ["AAPL", "AMD", "AMZN", "MSFT", "NVDA"]
+
+
+def test_ticker_prefix_matches_come_first_then_name_words(registry):
+    assert registry.search("a") == ["AAPL", "AMD", "AMZN"]
+    assert registry.search("micro") == ["MSFT"]
+    assert registry.search("corp") == ["MSFT", "NVDA"]
+    assert registry.search("  nv ") == ["NVDA"]
+
+
+def test_symbol_matching_ticker_and_name_is_listed_once(registry):
+    assert registry.search("am") == ["AMD", "AMZN"]
+
+
+def test_search_respects_limit_and_empty_query(registry):
+    assert registry.search("a", limit=2) == ["AAPL", "AMD"]
+    assert registry.search("") == []
+    assert registry.search(None) == []
+    assert registry.search("xyz") == []
+
+
+def test_options_label_with_company_name(registry):
+    assert registry.options(["NVDA", "AMD", "NVDA"]) == [
+        {"label": "NVDA · NVIDIA Corporation", "value": "NVDA"},
+        {"label": "AMD", "value": "AMD"},
+    ]
+
+
+def test_default_symbols_restricted_to_known(registry, monkeypatch):
+    monkeypatch.setenv("DEFAULT_SYMBOLS", "nvda, TSLA,AMD")
+    assert registry.default_symbols() == ["NVDA", "AMD"]
+
+
+def test_concurrent_readers_of_an_expired_registry_load_it_once(registry, monkeypatch):
+    calls = []
+    release = threading.Event()
+    load = registry._load
+
+    def slow_load():
+        calls.append(1)
+        release.wait(1)
+        load()
+
+    monkeypatch.setattr(registry, "_load", slow_load)
+    threads = [threading.Thread(target=registry.all_symbols) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
@@ -0,0 +1,22 @@
+import json
+
+from data import catalog
+from data.synthetic import seed_prices
+from reports.render import render_all
+
+
+def test_render_all_writes_reports_and_manifest(mongo, tmp_path):
+    seed_prices(["AAA", "BBB"], start="2023-06-01", end="2024-03-29")
+
+    manifest = render_all(["AAA", "BBB", "NONE"], {"pair": ["AAA", "BBB"]}, out=str(tmp_path), workers=2)
+
+    names = {p.name for p in tmp_path.iterdir()}
+    assert {"manifest.json", "plotly.min.js", "ticker-AAA.html", "ticker-BBB.html", "basket-pair.html"} <= names
+    assert json.loads((tmp_path / "manifest.json").read_text()) == json.loads(json.dumps(manifest, default=str))
+
+    entries = {(e["kind"], e["name"]): e for e in manifest["reports"]}
+    assert entries[("ticker", "NONE")]["error"] == "no data"
+    assert entries[("basket", "pair")]["symbols"] == ["AAA", "BBB"]
+    assert entries[("ticker", "AAA")]["files"] == ["ticker-AAA.html"]
+    assert manifest["data_versions"]["AAA"] == catalog.data_version("AAA")
+    assert manifest["data_versions"]["NONE"] is None
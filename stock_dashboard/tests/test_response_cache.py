@@ -0,0 +1,71 @@
+import diskcache
+import plotly.graph_objects as go
+import pytest
+
+from callbacks import charts
+from utils import response_cache
+from utils.response_cache import cache_key
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    cache = diskcache.Cache(str(tmp_path))
+    monkeypatch.setattr(response_cache, "_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_cache_key_is_stable_and_order_insensitive_for_dicts():
+    assert cache_key("view", ("AAA",), {"a": 1, "b": 2}) == cache_key("view", ["AAA"], {"b": 2, "a": 1})
+    assert cache_key("view", 1).startswith("view:")
+
+
+def test_cache_key_changes_with_any_part():
+    base = cache_key("view", 1, ["AAA"], (3, "2024-01-02", "t"))
+    assert cache_key("view", 2, ["AAA"], (3, "2024-01-02", "t")) != base
+    assert cache_key("view", 1, ["BBB"], (3, "2024-01-02", "t")) != base
+    assert cache_key("view", 1, ["AAA"], (4, "2024-01-02", "t")) != base
+    assert cache_key("other", 1, ["AAA"], (3, "2024-01-02", "t")) != base
+
+
+def test_outputs_round_trip_as_plain_json(shared):
+    fig = go.Figure(go.Scatter(x=[1, 2], y=[3, 4]))
+    response_cache.put("k", (fig, [{"a": 1}], None))
+
+    got = response_cache.get("k")
+    assert got[0]["data"][0]["type"] == "scatter"
+    assert got[1:] == [[{"a": 1}], None]
+    assert response_cache.get("missing") is None
+
+
+def test_cache_key_changes_with_the_code_version(monkeypatch):
+    base = cache_key("view", 1)
+    monkeypatch.setattr(response_cache, "CODE_VERSION", "another-build")
+    assert cache_key("view", 1) != base
+
+
+def test_build_id_overrides_the_source_hash(monkeypatch):
+    source_hash = response_cache._code_version()
+    monkeypatch.setenv("BUILD_ID", "abc123")
+    assert response_cache._code_version() == "abc123"
+    monkeypatch.delenv("BUILD_ID")
+    assert response_cache._code_version() == source_hash
+
+
+def test_dashboard_entries_from_another_build_are_not_served(shared, mongo, monkeypatch):
+    monkeypatch.setattr(charts, "_view_memo", charts.OrderedDict())
+    key = charts._view_key([], "close", "linear", "ALL", "dark")
+    with monkeypatch.context() as m:
+        m.setattr(response_cache, "CODE_VERSION", "older-build")
+        response_cache.put(cache_key("dashboard", key), ["stale"] * 7)
+
+    result = charts.build_dashboard([], "close", "linear", "ALL", "dark")
+    assert result[6] is None
+    assert response_cache.get(cache_key("dashboard", key)) is not None
+
+
+def test_view_key_covers_the_returns_source(mongo, monkeypatch):
+    monkeypatch.setenv("RETURNS_SOURCE", "pandas")
+    pandas_key = charts._view_key(["AAA"], "close", "linear", "ALL", "dark")
+    monkeypatch.setenv("RETURNS_SOURCE", "rollups")
+    assert charts._view_key(["AAA"], "close", "linear", "ALL", "dark") != pandas_key
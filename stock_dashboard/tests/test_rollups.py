@@ -0,0 +1,129 @@
+import json
+import base64
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from plotly.io.json import to_json_plotly
+
+from data import rollups
+from data.db import load_price_data
+from data.migrate_prices import sync_prices
+from data.synthetic import seed_prices
+from utils.metrics import monthly_returns, yearly_returns
+
+SYMBOLS = ["AAA", "BBB"]
+
+
+@pytest.fixture
+def seeded(mongo, monkeypatch):
+    monkeypatch.setenv("RETURNS_SOURCE", "rollups")
+    with rollups._lock:
+        rollups._fresh.clear()
+    seed_prices(SYMBOLS, start="2022-06-01", end="2024-03-29")
+    return mongo
+
+
+def test_monthly_rollups_match_pandas(seeded):
+    got = rollups.monthly_rollups(SYMBOLS)
+    want = monthly_returns(load_price_data(SYMBOLS))
+
+    assert list(got.columns) == ["symbol", "year", "month", "first_close", "last_close", "monthly_return"]
+    assert len(got) == len(want) == 2 * 22
+    pd.testing.assert_frame_equal(
+        got.reset_index(drop=True), want[got.columns].reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_yearly_rollups_match_pandas(seeded):
+    got = rollups.yearly_rollups(SYMBOLS)
+    want = yearly_returns(load_price_data(SYMBOLS))
+
+    assert list(got.columns) == ["symbol", "year", "first_close", "last_close", "yearly_return"]
+    assert got["year"].tolist() == [2022, 2023, 2024] * 2
+    np.testing.assert_allclose(got["yearly_return"], want["yearly_return"])
+
+
+def test_appended_bars_extend_the_last_year(seeded):
+    rollups.yearly_rollups(SYMBOLS)
+    seeded["aaa_prices"].insert_one({"date": datetime.datetime(2024, 4, 1), "close": 1.0, "volume": 1.0})
+    from data import catalog
+    catalog.refresh_catalog(["AAA"])
+
+    yearly = rollups.yearly_rollups(["AAA"])
+    assert yearly["last_close"].iloc[-1] == 1.0
+    assert rollups.monthly_rollups(["AAA"]).iloc[-1][["year", "month"]].tolist() == [2024, 4]
+
+
+def test_empty_rollups_keep_their_columns(mongo):
+    assert list(rollups.monthly_rollups(["NONE"]).columns)[-1] == "monthly_return"
+    assert list(rollups.yearly_rollups(["NONE"]).columns)[-1] == "yearly_return"
+
+
+def test_string_dated_bars_are_merged_into_the_same_months(mongo, monkeypatch):
+    monkeypatch.setenv("RETURNS_SOURCE", "rollups")
+    with rollups._lock:
+        rollups._fresh.clear()
+    mongo["mix_prices"].insert_many([
+        {"date": "2024-03-01", "close": 50.0, "volume": 1.0},
+        {"date": datetime.datetime(2024, 3, 4), "close": 52.0, "volume": 1.0},
+        {"date": datetime.datetime(2024, 3, 28), "close": 60.0, "volume": 1.0},
+        {"date": "2024-04-02", "close": 75.0, "volume": 1.0},
+    ])
+
+    monthly = rollups.monthly_rollups(["MIX"])
+    assert monthly[["month", "first_close", "last_close"]].values.tolist() == [[3, 50.0, 60.0], [4, 75.0, 75.0]]
+    yearly = rollups.yearly_rollups(["MIX"])
+    assert yearly[["year", "first_close", "last_close"]].values.tolist() == [[2024, 50.0, 75.0]]
+
+
+def test_consolidated_copy_stores_string_dates_as_dates(mongo):
+    mongo["sss_prices"].insert_many([
+        {"date": "2024-01-02", "close": 1.0, "volume": 1},
+        {"date": "2024-01-03", "close": 2.0, "volume": 1},
+    ])
+    sync_prices(["SSS"])
+    dates = [doc["date"] for doc in mongo["prices"].find({"symbol": "SSS"})]
+    assert dates == [datetime.datetime(2024, 1, 2), datetime.datetime(2024, 1, 3)]
+
+
+def _plain(value):
+    """Outputs as plain JSON, plotly's base64 typed arrays decoded to lists."""
+    if isinstance(value, dict):
+        if set(value) == {"dtype", "bdata"} or set(value) == {"dtype", "bdata", "shape"}:
+            array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+            return array.astype(float).tolist()
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _assert_close(got, want, path="output"):
+    if isinstance(want, dict):
+        assert isinstance(got, dict) and set(got) == set(want), path
+        for k in want:
+            _assert_close(got[k], want[k], f"{path}.{k}")
+    elif isinstance(want, list):
+        assert isinstance(got, list) and len(got) == len(want), path
+        for i, (g, w) in enumerate(zip(got, want)):
+            _assert_close(g, w, f"{path}[{i}]")
+    elif isinstance(want, (int, float)) and not isinstance(want, bool):
+        assert got == pytest.approx(want, rel=1e-9, abs=1e-12, nan_ok=True), path
+    else:
+        assert got == want, path
+
+
+@pytest.mark.parametrize("metric", ["close", "vwap", "volume"])
+def test_dashboard_for_one_year_matches_the_pandas_path(seeded, monkeypatch, metric):
+    # 2024 starts past the risk lookback, so the rollups path loads a cut-off history
+    from callbacks.charts import _build_dashboard
+
+    def build():
+        outputs = _build_dashboard(SYMBOLS, metric, "raw", "2024", "light", lambda step: None)
+        return _plain(json.loads(to_json_plotly(list(outputs))))
+
+    with_rollups = build()
+    monkeypatch.setenv("RETURNS_SOURCE", "pandas")
+    _assert_close(with_rollups, build())
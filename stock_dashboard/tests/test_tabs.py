@@ -0,0 +1,22 @@
+import pytest
+from dash.exceptions import PreventUpdate
+
+from callbacks.tabs import update_fund_details
+
+
+def test_fund_details_wait_for_the_tab(monkeypatch):
+    monkeypatch.setattr("callbacks.tabs.get_fundamentals", lambda ticker: pytest.fail("fetched on Home"))
+    with pytest.raises(PreventUpdate):
+        update_fund_details("NVDA", "home", None)
+
+
+def test_fund_details_built_once_per_ticker(monkeypatch):
+    calls = []
+    monkeypatch.setattr("callbacks.tabs.get_fundamentals", lambda ticker: calls.append(ticker) or {"Beta": 1.2})
+
+    _, shown = update_fund_details("NVDA", "fundamentals", None)
+    assert shown == "NVDA"
+    with pytest.raises(PreventUpdate):
+        update_fund_details("NVDA", "fundamentals", shown)
+    update_fund_details("AMD", "fundamentals", shown)
+    assert calls == ["NVDA", "AMD"]
@@ -0,0 +1,333 @@
+"""
+Concurrent-session load test for the Dash callback endpoints.
+
+Each simulated session behaves like a browser tab: it loads the page, fires
+the initial callbacks, then replays a weighted mix of interactions as
+``_dash-update-component`` POSTs. Every response is fed back into the
+session state and its dependent callbacks fire, the way the renderer does.
+Background callbacks are polled until their result arrives.
+
+    # local app on synthetic data (in memory), 8 sessions for 30s
+    python -m tools.loadtest --sessions 8 --duration 30
+
+    # existing server, compare with a previous run
+    python -m tools.loadtest --url http://localhost:8050 --compare .cache/loadtest/prev.json
+
+Results (latency percentiles and error rates per scenario and per callback)
+are printed and saved as JSON under --out.
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from collections import defaultdict
+
+import numpy as np
+import requests
+
+DEFAULT_SYMBOLS = ["AMZN", "MSFT", "NVDA", "TSLA", "META", "GOOGL", "NFLX", "INTC", "BABA"]
+DEFAULT_MIX = "initial=1,symbols=3,year=3,drilldown=2,theme=1"
+POLL_INTERVAL = 0.05
+REQUEST_TIMEOUT = 120
+MAX_CHAIN_DEPTH = 4
+
+
+def _key(dep):
+    return f"{dep['id']}.{dep['property']}"
+
+
+def _outputs(dep):
+    """Split Dash's output string into ``[{"id", "property"}]``."""
+    out = dep["output"]
+    parts = out.strip(".").split("...") if out.startswith("..") else [out]
+    return [{"id": p.rsplit(".", 1)[0], "property": p.rsplit(".", 1)[1]} for p in parts]
+
+
+def _short(dep):
+    return ",".join(o["id"] for o in _outputs(dep))
+
+
+class Session:
+    """One simulated user: a requests.Session plus the component state it has seen."""
+
+    def __init__(self, base_url, dependencies, symbols, rng, record):
+        self.base_url = base_url.rstrip("/")
+        self.http = requests.Session()
+        self.deps = [d for d in dependencies if not d.get("clientside_function")]
+        self.symbols = symbols
+        self.rng = rng
+        self.record = record
+        self.state = {
+            "symbols.value": list(symbols),
+            "metric.value": "close",
+            "scale_mode.value": "raw",
+            "season_year.value": "ALL",
+            "season_year.options": [{"label": "ALL", "value": "ALL"}],
+            "theme_store.data": "light",
+            "main-tabs.active_tab": "home",
+            "fund-stock-dropdown.value": "NVDA",
+            "theme_toggle_switch.n_clicks": 0,
+        }
+
+    def _payload(self, dep, changed):
+        outputs = _outputs(dep)
+        return {
+            "output": dep["output"],
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": [{**i, "value": self.state.get(_key(i))} for i in dep["inputs"]],
+            "state": [{**s, "value": self.state.get(_key(s))} for s in dep["state"]],
+            "changedPropIds": changed,
+        }
+
+    def fire(self, dep, changed, scenario, depth=0):
+        """POST one callback (polling background jobs), apply its outputs, then fire dependents."""
+        payload = self._payload(dep, changed)
+        url = f"{self.base_url}/_dash-update-component"
+        start = time.perf_counter()
+        status, body = None, None
+        try:
+            resp = self.http.post(url, json=payload, timeout=REQUEST_TIMEOUT)
+            status = resp.status_code
+            body = resp.json() if status == 200 else None
+            while body and "cacheKey" in body and "response" not in body:
+                if time.perf_counter() - start > REQUEST_TIMEOUT:
+                    status, body = "timeout", None
+                    break
+                job = body
+                time.sleep(POLL_INTERVAL)
+                resp = self.http.post(url, params={"cacheKey": job["cacheKey"], "job": job["job"]}, json=payload, timeout=REQUEST_TIMEOUT)
+                status = resp.status_code
+                body = resp.json() if status == 200 else None
+                if body is not None and "response" not in body:
+                    body = {**job, **body}
+        except requests.RequestException:
+            status = "error"
+        elapsed = time.perf_counter() - start
+        self.record(scenario, _short(dep), elapsed, status)
+
+        if not body or "response" not in body:
+            return
+        changed_keys = []
+        for comp_id, props in body["response"].items():
+            for prop, value in props.items():
+                self.state[f"{comp_id}.{prop}"] = value
+                changed_keys.append(f"{comp_id}.{prop}")
+        if depth < MAX_CHAIN_DEPTH:
+            self.fire_dependents(changed_keys, scenario, depth + 1)
+
+    def fire_dependents(self, changed_keys, scenario, depth=0):
+        for dep in self.deps:
+            triggered = [k for k in changed_keys if any(_key(i) == k for i in dep["inputs"])]
+            if triggered:
+                self.fire(dep, triggered, scenario, depth)
+
+    # Scenarios -----------------------------------------------------------
+
+    def initial(self):
+        start = time.perf_counter()
+        ok = True
+        for path in ("/", "/_dash-layout"):
+            try:
+                ok &= self.http.get(self.base_url + path, timeout=60).status_code == 200
+            except requests.RequestException:
+                ok = False
+        self.record("initial", "GET page+layout", time.perf_counter() - start, 200 if ok else "error")
+        for dep in self.deps:
+            if not dep.get("prevent_initial_call"):
+                self.fire(dep, [], "initial")
+
+    def symbols_change(self):
+        k = self.rng.randint(1, len(self.symbols))
+        self.state["symbols.value"] = self.rng.sample(self.symbols, k)
+        self.fire_dependents(["symbols.value"], "symbols")
+
+    def year_change(self):
+        years = [o["value"] for o in self.state.get("season_year.options") or []] or ["ALL"]
+        self.state["season_year.value"] = self.rng.choice(years)
+        self.fire_dependents(["season_year.value"], "year")
+
+    def drilldown(self):
+        sym = self.rng.choice(self.state["symbols.value"] or self.symbols)
+        month = self.rng.randint(1, 12)
+        self.state["monthly_heat.clickData"] = {"points": [{"x": str(month), "y": sym}]}
+        self.fire_dependents(["monthly_heat.clickData"], "drilldown")
+
+    def theme_toggle(self):
+        self.state["theme_toggle_switch.n_clicks"] = (self.state["theme_toggle_switch.n_clicks"] or 0) + 1
+        self.fire_dependents(["theme_toggle_switch.n_clicks"], "theme")
+
+
+SCENARIOS = {
+    "initial": Session.initial,
+    "symbols": Session.symbols_change,
+    "year": Session.year_change,
+    "drilldown": Session.drilldown,
+    "theme": Session.theme_toggle,
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}'; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def start_local_app(symbols, start):
+    """
+    Start the app in-process on a free port, backed by synthetic bars in the
+    in-memory stand-in. Seeding drops the price collections it fills, so the
+    database settings are overridden outright: a MONGO_URI from the
+    environment or ``.env`` must never point the seeder at a real server.
+    """
+    configured = os.environ.get("MONGO_URI")
+    if configured:
+        print(f"Ignoring MONGO_URI={configured}: local mode runs in memory (use --url for a real server)")
+    os.environ["MONGO_URI"] = "mongodb://stand-in.invalid"
+    os.environ["MONGO_DB"] = "loadtest"
+    os.environ.setdefault("FUNDAMENTALS_PROVIDER", "offline")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from werkzeug.serving import make_server
+    from tools import mongo_stand_in
+
+    mongo_stand_in.install()
+    from data.synthetic import seed_prices
+
+    seed_prices(symbols, start=start)
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app.server, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def summarize(samples, wall):
+    """Latency percentiles (ms), error rate and throughput per group."""
+    def stats(rows):
+        lat = np.array([r[2] for r in rows]) * 1000
+        errors = sum(1 for r in rows if r[3] != 200 and r[3] != 204)
+        return {
+            "count": len(rows),
+            "errors": errors,
+            "error_rate": errors / len(rows) if rows else 0.0,
+            "mean_ms": float(lat.mean()) if len(lat) else 0.0,
+            "p50_ms": float(np.percentile(lat, 50)) if len(lat) else 0.0,
+            "p95_ms": float(np.percentile(lat, 95)) if len(lat) else 0.0,
+            "p99_ms": float(np.percentile(lat, 99)) if len(lat) else 0.0,
+            "max_ms": float(lat.max()) if len(lat) else 0.0,
+        }
+
+    by_scenario, by_callback = defaultdict(list), defaultdict(list)
+    for row in samples:
+        by_scenario[row[0]].append(row)
+        by_callback[row[1]].append(row)
+    return {
+        "wall_seconds": wall,
+        "requests": len(samples),
+        "throughput_rps": len(samples) / wall if wall else 0.0,
+        "overall": stats(samples),
+        "scenarios": {k: stats(v) for k, v in sorted(by_scenario.items())},
+        "callbacks": {k: stats(v) for k, v in sorted(by_callback.items())},
+    }
+
+
+def print_report(summary, previous=None):
+    print(f"\n{summary['requests']} requests in {summary['wall_seconds']:.1f}s "
+          f"({summary['throughput_rps']:.1f} req/s), error rate {summary['overall']['error_rate']:.2%}")
+    for section in ("scenarios", "callbacks"):
+        print(f"\n{section.upper():<60} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'err%':>6}")
+        for name, s in summary[section].items():
+            line = f"{name[:60]:<60} {s['count']:>6} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['error_rate']*100:>5.1f}"
+            prev = (previous or {}).get(section, {}).get(name)
+            if prev and prev["p95_ms"]:
+                line += f"   p95 {(s['p95_ms'] / prev['p95_ms'] - 1) * 100:+.0f}% vs previous"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target server (default: start a local app on synthetic data)")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated sessions")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--symbols", default=",".join(DEFAULT_SYMBOLS), help="ticker universe")
+    parser.add_argument("--start", default="2015-01-01", help="first synthetic bar date (local mode)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pause between interactions (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=".cache/loadtest", help="directory for result JSON")
+    parser.add_argument("--compare", help="previous result JSON to compare against")
+    args = parser.parse_args(argv)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        base_url, server = start_local_app(symbols, args.start)
+        print(f"Local app on synthetic data at {base_url}")
+
+    dependencies = requests.get(f"{base_url.rstrip('/')}/_dash-dependencies", timeout=30).json()
+
+    samples = []
+    lock = threading.Lock()
+
+    def record(scenario, callback, elapsed, status):
+        with lock:
+            samples.append((scenario, callback, elapsed, status))
+
+    deadline = time.monotonic() + args.duration
+
+    def run_session(i):
+        rng = random.Random(args.seed + i)
+        session = Session(base_url, dependencies, symbols, rng, record)
+        session.initial()
+        while time.monotonic() < deadline:
+            SCENARIOS[rng.choices(names, weights)[0]](session)
+            if args.think_time:
+                time.sleep(args.think_time)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=run_session, args=(i,)) for i in range(args.sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    summary = summarize(samples, wall)
+    result = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {**vars(args), "symbols": symbols, "mix": mix, "url": args.url or "local"},
+        **summary,
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as fh:
+            previous = json.load(fh)
+    print_report(result, previous)
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as fh:
+        json.dump(result, fh, indent=2)
+    print(f"\nSaved {path}")
+
+    if server is not None:
+        server.shutdown()
+    return 1 if summary["overall"]["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+In-memory Mongo stand-in for tests and local load tests.
+
+``install()`` points ``data.db`` at one mongomock client. The same client is
+handed to every thread and to forked children (background callback jobs),
+which inherit its contents, so they all see the seeded data.
+
+mongomock is not thread-safe: a query iterating a collection while another
+thread writes to it raises "dictionary changed size during iteration". The
+client is wrapped so every call runs under one process-wide lock.
+"""
+import os
+import threading
+
+
+class Serialized:
+    """
+    Runs every call on a mongomock object under one process-wide lock.
+    Databases, collections and cursors it returns are wrapped in turn, and a
+    cursor is read in full under the lock.
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, target):
+        self._target = target
+
+    @staticmethod
+    def _wrap(value):
+        return Serialized(value) if type(value).__module__.startswith("mongomock") else value
+
+    def __getattr__(self, name):
+        with self._lock:
+            value = getattr(self._target, name)
+        if not callable(value) or type(value).__module__.startswith("mongomock"):
+            return self._wrap(value)
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return self._wrap(value(*args, **kwargs))
+        return call
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._wrap(self._target[key])
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._target))
+
+    @classmethod
+    def _after_fork(cls):
+        # The lock may have been held by another thread at fork time
+        cls._lock = threading.RLock()
+
+
+os.register_at_fork(after_in_child=Serialized._after_fork)
+
+
+def install():
+    """
+    Serve ``data.db`` from a fresh in-memory client; returns it. MONGO_URI and
+    MONGO_DB must still be set (data.db requires them), but the URI is never
+    contacted.
+    """
+    import mongomock
+    from data import db
+
+    client = Serialized(mongomock.MongoClient())
+    db._make_client = lambda uri: client
+    db.reset_client()
+    return client
@@ -0,0 +1,253 @@
+"""
+Lightweight timing and cache metrics with a Prometheus ``/metrics`` route.
+
+- ``stage("name")`` times a block into ``dashboard_stage_seconds``.
+- Every ``_dash-update-component`` request is timed per callback (keyed by
+  its registered output id; anything else is counted as ``unknown``) in
+  ``dash_callback_seconds``. The part not spent in top-level stages is
+  recorded as the ``unstaged`` stage: Dash dispatch and JSON encoding, plus
+  all of the work of callbacks that define no stages.
+- ``cache_event(cache, hit)`` feeds ``cache_requests_total`` for hit ratios.
+- With PROFILING_ENABLED=1, a request carrying the ``X-Profile: 1`` header
+  (or a ``profile=1`` cookie) runs under cProfile. The stats are written to
+  PROFILE_DIR and the path is returned in ``X-Profile-Output``.
+
+``/metrics`` and profiling are only served to clients in METRICS_ALLOW
+(comma-separated addresses or networks, default loopback) or presenting
+``Authorization: Bearer <METRICS_TOKEN>`` when a token is set.
+
+Metrics are per process: under gunicorn each worker reports its own numbers,
+and background-callback jobs (separate processes) only show up in the
+per-callback request timings.
+"""
+import os
+import io
+import re
+import hmac
+import time
+import ipaddress
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+
+import flask
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", ".cache/profiles")
+
+UNKNOWN_CALLBACK = "unknown"
+
+METRICS_ALLOW = [
+    ipaddress.ip_network(net.strip(), strict=False)
+    for net in os.getenv("METRICS_ALLOW", "127.0.0.1,::1").split(",")
+    if net.strip()
+]
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def _escape(value):
+    """Label value escaping from the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + [f'{n}="{_escape(v)}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, val in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {val}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}   # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', bound)])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("dashboard_stage_seconds", "Time spent per analytics stage", ["stage"])
+CALLBACK_SECONDS = Histogram("dash_callback_seconds", "Callback request latency", ["callback"])
+CALLBACK_REQUESTS = Counter("dash_callback_requests_total", "Callback requests", ["callback", "status"])
+RESPONSE_BYTES = Histogram(
+    "dash_callback_response_bytes", "Callback response size", ["callback"],
+    buckets=(1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7),
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups", ["cache", "result"])
+
+METRICS = [STAGE_SECONDS, CALLBACK_SECONDS, CALLBACK_REQUESTS, RESPONSE_BYTES, CACHE_REQUESTS]
+
+
+def register_metric(metric):
+    """Add an object with ``render() -> [lines]`` to the /metrics output."""
+    METRICS.append(metric)
+
+
+def cache_event(cache, hit):
+    """Record one lookup against ``cache``; ``hit`` may be a bool or a result label."""
+    result = hit if isinstance(hit, str) else ("hit" if hit else "miss")
+    CACHE_REQUESTS.inc(cache=cache, result=result)
+
+
+@contextmanager
+def stage(name):
+    """Time a block; top-level stages inside a callback request also count toward its body time."""
+    in_request = flask.has_request_context()
+    if in_request:
+        depth = getattr(flask.g, "stage_depth", 0)
+        flask.g.stage_depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        if in_request:
+            flask.g.stage_depth = depth
+            if depth == 0:
+                flask.g.stage_seconds = getattr(flask.g, "stage_seconds", 0.0) + elapsed
+
+
+def render_metrics():
+    """Prometheus text exposition of every metric."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _callback_name(callback_map):
+    """
+    The request's callback as a label: its output id when it names a
+    registered callback, else UNKNOWN_CALLBACK. The request body is client
+    input, so anything not in ``callback_map`` must not become a label value.
+    """
+    body = flask.request.get_json(silent=True)
+    output = body.get("output") if isinstance(body, dict) else None
+    if not isinstance(output, str) or output not in callback_map:
+        return UNKNOWN_CALLBACK
+    return output.strip(".").replace("...", ",")
+
+
+def _trusted():
+    """Whether the request may read metrics or ask for a profile (see METRICS_ALLOW / METRICS_TOKEN)."""
+    auth = flask.request.headers.get("Authorization", "")
+    if METRICS_TOKEN and hmac.compare_digest(auth, f"Bearer {METRICS_TOKEN}"):
+        return True
+    try:
+        addr = ipaddress.ip_address(flask.request.remote_addr or "")
+    except ValueError:
+        return False
+    return any(addr in net for net in METRICS_ALLOW)
+
+
+def _profile_requested():
+    return PROFILING_ENABLED and (
+        flask.request.headers.get("X-Profile") == "1" or flask.request.cookies.get("profile") == "1"
+    ) and _trusted()
+
+
+def register_instrumentation(app):
+    """Attach request timing, the optional profiler and the /metrics route to the Flask server."""
+    server = app.server
+
+    @server.before_request
+    def _start_timer():
+        if not flask.request.path.endswith("_dash-update-component"):
+            return
+        flask.g.request_start = time.perf_counter()
+        if _profile_requested():
+            flask.g.profiler = cProfile.Profile()
+            flask.g.profiler.enable()
+
+    @server.after_request
+    def _record(response):
+        start = getattr(flask.g, "request_start", None)
+        if start is None:
+            return response
+
+        profiler = getattr(flask.g, "profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            response.headers["X-Profile-Output"] = _dump_profile(profiler, _callback_name(app.callback_map))
+
+        elapsed = time.perf_counter() - start
+        name = _callback_name(app.callback_map)
+        CALLBACK_SECONDS.observe(elapsed, callback=name)
+        CALLBACK_REQUESTS.inc(callback=name, status=response.status_code)
+        RESPONSE_BYTES.observe(response.calculate_content_length() or 0, callback=name)
+        body_time = getattr(flask.g, "stage_seconds", 0.0)
+        STAGE_SECONDS.observe(max(elapsed - body_time, 0.0), stage="unstaged")
+        return response
+
+    @server.route("/metrics")
+    def metrics():
+        if not _trusted():
+            flask.abort(403)
+        return flask.Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def _dump_profile(profiler, name):
+    """Write ``.prof`` and a cumulative-time text summary; returns the text file path."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = re.sub(r"[^\w.+-]", "_", name.replace(",", "+"))[:60]
+    base = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}")
+    profiler.dump_stats(base + ".prof")
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(40)
+    with open(base + ".txt", "w") as fh:
+        fh.write(out.getvalue())
+    return base + ".txt"
@@ -0,0 +1,168 @@
+"""
+Running per-symbol state for live updates.
+
+``init_cursor`` summarises the bars currently shown into small running
+totals. ``advance_cursor`` folds new bars into them and returns only the new
+chart points, so a live tick costs O(new bars) instead of a full rebuild.
+The result is JSON-safe and is kept in the ``live_cursor`` store.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.metrics import TRADING_DAYS, risk_scores
+
+RISK_WINDOW = 30
+RF = 0.04
+
+
+def _iso(ts):
+    return pd.Timestamp(ts).isoformat()
+
+
+def _ret(first, last):
+    return (last - first) / first if first else np.nan
+
+
+def init_cursor(df, season_year):
+    """
+    Build the per-symbol state from ``df`` (full history for the selected
+    symbols with ``returns``) as ``update`` would show it for ``season_year``.
+    Trace indices follow ``px.line(color="symbol")``: sorted symbols present.
+    """
+    full = df.sort_values(["symbol", "date"])
+    view = full if season_year == "ALL" else full[full["date"].dt.year == int(season_year)]
+
+    state = {}
+    for i, (sym, sdf) in enumerate(view.groupby("symbol", sort=True)):
+        closes = sdf["close"].to_numpy(dtype=float)
+        dates = sdf["date"]
+        rets = sdf["returns"].dropna().to_numpy(dtype=float)
+        hist = full[full["symbol"] == sym]
+        # Like the risk surface, the risk window may reach back before the view
+        shown = hist[hist["date"] <= dates.iloc[-1]]
+
+        months = sdf.groupby([dates.dt.year.rename("y"), dates.dt.month.rename("m")])["close"].agg(["first", "last"])
+        years = sdf.groupby(dates.dt.year.rename("y"))["close"].agg(["first", "last"])
+        closed_months = (months["last"] - months["first"]).iloc[:-1] / months["first"].iloc[:-1]
+        closed_years = (years["last"] - years["first"]).iloc[:-1] / years["first"].iloc[:-1]
+
+        ret_mean = float(rets.mean()) if len(rets) else 0.0
+        state[sym] = {
+            "trace": i,
+            "n": int(len(sdf)),
+            "first_date": _iso(dates.iloc[0]),
+            "first_close": float(closes[0]),
+            "last_date": _iso(dates.iloc[-1]),
+            "last_close": float(closes[-1]),
+            # VWAP accumulates over the full history (add_vwap runs before the year filter)
+            "cum_pv": float((hist["close"] * hist["volume"]).sum()),
+            "cum_vol": float(hist["volume"].sum()),
+            "ret_n": int(len(rets)),
+            "ret_mean": ret_mean,
+            "ret_m2": float(((rets - ret_mean) ** 2).sum()),
+            "recent": shown["returns"].iloc[-RISK_WINDOW:].astype(float).tolist(),
+            "peak": float(np.maximum.accumulate(closes)[-1]),
+            "max_dd": float((closes / np.maximum.accumulate(closes) - 1).min()),
+            "month": [int(months.index[-1][0]), int(months.index[-1][1]), float(months["first"].iloc[-1])],
+            "month_sum": float(closed_months.sum()),
+            "month_n": int(closed_months.notna().sum()),
+            "year": [int(years.index[-1]), float(years["first"].iloc[-1])],
+            "year_sum": float(closed_years.sum()),
+            "year_n": int(closed_years.notna().sum()),
+        }
+    return state
+
+
+def _y_value(st, close, volume, metric, scale_mode):
+    if metric == "volume":
+        return volume
+    if metric == "vwap":
+        return st["cum_pv"] / st["cum_vol"] if st["cum_vol"] else None
+    if scale_mode == "norm":
+        return close / st["first_close"] * 100.0 if st["first_close"] > 0 else 100.0
+    return close
+
+
+def advance_cursor(state, bars, metric, scale_mode, season_year):
+    """
+    Fold ``bars`` (symbol/date/close/volume, sorted) into ``state`` in place.
+    Returns ``{symbol: (dates, ys)}`` with the new chart points.
+    """
+    points = {}
+    for sym, sdf in bars.groupby("symbol", sort=True):
+        st = state.get(sym)
+        if st is None:
+            continue
+        for date, close, volume in zip(sdf["date"], sdf["close"].astype(float), sdf["volume"].astype(float)):
+            if season_year != "ALL" and date.year != int(season_year):
+                continue
+
+            ret = close / st["last_close"] - 1 if st["last_close"] else np.nan
+            if not np.isnan(ret):
+                st["ret_n"] += 1
+                delta = ret - st["ret_mean"]
+                st["ret_mean"] += delta / st["ret_n"]
+                st["ret_m2"] += delta * (ret - st["ret_mean"])
+            st["recent"] = (st["recent"] + [ret])[-RISK_WINDOW:]
+
+            st["peak"] = max(st["peak"], close)
+            st["max_dd"] = min(st["max_dd"], close / st["peak"] - 1)
+            st["cum_pv"] += close * volume
+            st["cum_vol"] += volume
+
+            y, m, month_first = st["month"]
+            if (date.year, date.month) != (y, m):
+                st["month_sum"] += _ret(month_first, st["last_close"])
+                st["month_n"] += 1
+                st["month"] = [date.year, date.month, close]
+            year, year_first = st["year"]
+            if date.year != year:
+                st["year_sum"] += _ret(year_first, st["last_close"])
+                st["year_n"] += 1
+                st["year"] = [date.year, close]
+
+            st["last_close"] = close
+            st["last_date"] = _iso(date)
+            st["n"] += 1
+
+            dates, ys = points.setdefault(sym, ([], []))
+            dates.append(st["last_date"])
+            ys.append(_y_value(st, close, volume, metric, scale_mode))
+    return points
+
+
+def kpi_series(state, rf=RF):
+    """
+    Per-symbol Series matching the ``kpi_cards`` inputs:
+    (latest yearly, avg monthly, avg yearly, CAGR, annual vol, Sharpe).
+    """
+    yearly, monthly, cagr, vol = {}, {}, {}, {}
+    for sym, st in state.items():
+        yearly[sym] = (st["year_sum"] + _ret(st["year"][1], st["last_close"])) / (st["year_n"] + 1)
+        monthly[sym] = (st["month_sum"] + _ret(st["month"][2], st["last_close"])) / (st["month_n"] + 1)
+        if st["n"] >= 2:
+            days = (pd.Timestamp(st["last_date"]) - pd.Timestamp(st["first_date"])).days
+            cagr[sym] = (st["last_close"] / st["first_close"]) ** (1 / max(days / 365.25, 1e-9)) - 1
+        if st["ret_n"] >= 2:
+            vol[sym] = np.sqrt(st["ret_m2"] / (st["ret_n"] - 1)) * np.sqrt(TRADING_DAYS)
+
+    yearly, monthly = pd.Series(yearly, dtype=float), pd.Series(monthly, dtype=float)
+    cagr, vol = pd.Series(cagr, dtype=float), pd.Series(vol, dtype=float)
+    aligned = cagr.index.intersection(vol.index)
+    sharpe = (cagr.loc[aligned] - rf) / vol.loc[aligned].replace(0, np.nan)
+    return yearly.dropna(), monthly, yearly, cagr, vol, sharpe
+
+
+def risk_frame(state, window=RISK_WINDOW):
+    """
+    ``risk_scores`` rows from the running state for a ``window`` of at most
+    RISK_WINDOW returns. A symbol is scored once its last ``window`` returns
+    are known, the rule the risk surface applies.
+    """
+    rows = []
+    for sym, st in state.items():
+        recent = np.asarray(st["recent"][-window:], dtype=float)
+        if len(recent) < window or not np.isfinite(recent).all():
+            continue
+        rows.append({"symbol": sym, "ann_vol": float(recent.std(ddof=1)) * np.sqrt(TRADING_DAYS), "max_drawdown": st["max_dd"]})
+    return risk_scores(pd.DataFrame(rows))
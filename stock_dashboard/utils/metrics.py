@@ -1,6 +1,10 @@
+import logging
+
 import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 TRADING_DAYS = 252
 
 def add_returns(df: pd.DataFrame) -> pd.DataFrame:
@@ -99,6 +103,22 @@ def max_drawdown_by_symbol(df: pd.DataFrame) -> pd.Series:
     return pd.Series(out).sort_values()
 
 
+def risk_scores(r: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add percentile ranks and the 0-100 ``risk_score`` to per-symbol
+    ``ann_vol``/``max_drawdown`` rows, riskiest first.
+    """
+    if r.empty:
+        return r
+    r = r.copy()
+    r["vol_percentile"] = r["ann_vol"].rank(pct=True) * 100
+    r["dd_percentile"] = np.abs(r["max_drawdown"]).rank(pct=True) * 100
+
+    r["risk_score"] = (0.6 * r["vol_percentile"] + 0.4 * r["dd_percentile"])
+
+    return r.sort_values("risk_score", ascending=False)
+
+
 def risk_table(df: pd.DataFrame, window=30) -> pd.DataFrame:
     """
     Industry-standard risk scoring used by Morningstar, Bloomberg, etc.
@@ -128,21 +148,69 @@ def risk_table(df: pd.DataFrame, window=30) -> pd.DataFrame:
             "sharpe": sharpe
         })
     
-    r = pd.DataFrame(rows)
+    r = risk_scores(pd.DataFrame(rows))
     if r.empty:
         return r
     
-    r["vol_percentile"] = r["ann_vol"].rank(pct=True) * 100
-    r["dd_percentile"] = np.abs(r["max_drawdown"]).rank(pct=True) * 100
-    
-    r["risk_score"] = (0.6 * r["vol_percentile"] + 0.4 * r["dd_percentile"])
-    
-    r = r.sort_values("risk_score", ascending=False)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Percentile-based risk scores (0 = safest, 100 = riskiest among selected stocks)")
+        for _, row in r.iterrows():
+            logger.debug("%s: %.2f/100 (Vol %%ile: %.0f, DD %%ile: %.0f)",
+                         row["symbol"], row["risk_score"], row["vol_percentile"], row["dd_percentile"])
     
-    print(f"\n=== PERCENTILE-BASED RISK SCORES ===")
-    print(f"(0 = safest, 100 = riskiest among selected stocks)")
-    for idx, row in r.iterrows():
-        print(f"{row['symbol']}: {row['risk_score']:.2f}/100 " +
-              f"(Vol %ile: {row['vol_percentile']:.0f}, DD %ile: {row['dd_percentile']:.0f})")
-    
-    return r
\ No newline at end of file
+    return r
+
+RISK_WINDOWS = (10, 30, 90, 252)
+
+
+def risk_surface(df: pd.DataFrame, windows=RISK_WINDOWS) -> pd.DataFrame:
+    """
+    Rolling risk for every symbol, date and window in one vectorized pass.
+
+    Rolling volatility comes from cumulative sums of returns and squared
+    returns shared by all windows; drawdown is the close against its trailing
+    ``window``-day high (not ``risk_table``'s max drawdown). Scores are not
+    ranked here: the risk cards rank each symbol's latest row with
+    ``risk_scores`` (see ``callbacks.charts.risk_surface_data``). Returns one
+    row per (window, symbol, date) where the window is full.
+    """
+    df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
+    close = df["close"].to_numpy(dtype=float)
+    pos = df.groupby("symbol").cumcount().to_numpy()
+
+    # Demean per symbol before summing: variance is unchanged and the
+    # difference of two long cumulative sums keeps its precision.
+    r = df["returns"].to_numpy(dtype=float)
+    r = r - df["returns"].groupby(df["symbol"]).transform("mean").to_numpy(dtype=float)
+    r = np.nan_to_num(r)
+    c1 = np.concatenate([[0.0], np.cumsum(r)])
+    c2 = np.concatenate([[0.0], np.cumsum(r * r)])
+    idx = np.arange(len(df))
+    close_series = pd.Series(close)
+
+    frames = []
+    for window in windows:
+        # Returns start at each symbol's second row, so a full window needs pos >= window
+        valid = pos >= window
+        if not valid.any():
+            continue
+        end = idx[valid] + 1
+        s1 = c1[end] - c1[end - window]
+        s2 = c2[end] - c2[end - window]
+        ann_vol = np.sqrt(np.maximum((s2 - s1 * s1 / window) / (window - 1), 0.0) * TRADING_DAYS)
+
+        # A flat rolling max is safe: rows with pos >= window only look back inside their symbol
+        high = close_series.rolling(window, min_periods=window).max().to_numpy()[valid]
+        drawdown = close[valid] / high - 1
+
+        frames.append(pd.DataFrame({
+            "window": window,
+            "symbol": df["symbol"].to_numpy()[valid],
+            "date": df["date"].to_numpy()[valid],
+            "ann_vol": ann_vol,
+            "drawdown": drawdown,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=["window", "symbol", "date", "ann_vol", "drawdown"])
+    return pd.concat(frames, ignore_index=True)
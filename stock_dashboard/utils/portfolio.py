@@ -0,0 +1,91 @@
+"""
+Vectorized portfolio analytics over a basket of symbols.
+
+``return_stats`` turns the daily returns into annualized mean and covariance
+once. ``evaluate`` then scores a whole (portfolios x symbols) weight matrix
+in a few matrix products: returns are ``W @ mu`` and variances are the row
+sums of ``(W @ cov) * W``. Nothing loops over portfolios in Python.
+Drawdown needs the full path, so it is only computed for the handful of
+frontier portfolios (``drawdowns``).
+
+Portfolios are long-only, fully invested and rebalanced daily.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.metrics import TRADING_DAYS
+
+RF = 0.04
+
+
+def return_stats(df: pd.DataFrame) -> dict:
+    """
+    Annualized ``mu`` and ``cov`` from ``df`` (symbol/date/returns) over the
+    dates every symbol traded, plus that aligned daily return matrix.
+    """
+    pivot = df.pivot(index="date", columns="symbol", values="returns").dropna()
+    daily = pivot.to_numpy(dtype=float)
+    if len(daily) < 2:
+        return {"symbols": list(pivot.columns), "mu": None, "cov": None, "daily": daily, "days": len(daily)}
+    return {
+        "symbols": list(pivot.columns),
+        "mu": daily.mean(axis=0) * TRADING_DAYS,
+        "cov": np.cov(daily, rowvar=False).reshape(daily.shape[1], daily.shape[1]) * TRADING_DAYS,
+        "daily": daily,
+        "days": len(daily),
+    }
+
+
+def sample_weights(n_portfolios, n_assets, seed=0) -> np.ndarray:
+    """
+    Dirichlet draws on the weight simplex, one row per portfolio. Each row
+    gets its own concentration (log-uniform in [0.05, 1]): a flat Dirichlet(1)
+    over many symbols clusters around equal weight, while small
+    concentrations reach the concentrated corners where the frontier's ends lie.
+    """
+    rng = np.random.default_rng(seed)
+    alpha = np.exp(rng.uniform(np.log(0.05), 0.0, n_portfolios))
+    w = rng.gamma(alpha[:, None], size=(n_portfolios, n_assets))
+    total = w.sum(axis=1, keepdims=True)
+    return np.divide(w, total, out=np.full_like(w, 1.0 / n_assets), where=total > 0)
+
+
+def evaluate(stats, weights, rf=RF) -> dict:
+    """Annualized return, volatility and Sharpe for every row of ``weights``."""
+    ret = weights @ stats["mu"]
+    vol = np.sqrt(np.maximum(np.einsum("ij,ij->i", weights @ stats["cov"], weights), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, (ret - rf) / vol, np.nan)
+    return {"ret": ret, "vol": vol, "sharpe": sharpe}
+
+
+def efficient_frontier(ret, vol, buckets=60) -> np.ndarray:
+    """
+    Indices of the sampled portfolios on the upper envelope: the best return
+    in each volatility bucket, kept only where it beats every lower-vol pick.
+    Portfolios with a non-finite return or volatility are ignored; with none
+    left the frontier is empty.
+    """
+    finite = np.flatnonzero(np.isfinite(ret) & np.isfinite(vol))
+    if len(finite) == 0:
+        return finite
+    ret, vol = ret[finite], vol[finite]
+
+    edges = np.linspace(vol.min(), vol.max(), buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, vol, side="right") - 1, 0, buckets - 1)
+
+    # Sort by (bucket, return) so the last row of each bucket is its best portfolio
+    order = np.lexsort((ret, bucket))
+    last = np.flatnonzero(np.diff(bucket[order], append=buckets))
+    best = order[last]
+
+    keep = ret[best] >= np.maximum.accumulate(ret[best])
+    return finite[best[keep]]
+
+
+def drawdowns(stats, weights) -> np.ndarray:
+    """Max drawdown of each row of ``weights`` over the aligned daily history."""
+    if len(stats["daily"]) == 0:
+        return np.zeros(len(weights))
+    wealth = np.cumprod(1.0 + stats["daily"] @ weights.T, axis=0)
+    return (wealth / np.maximum.accumulate(wealth, axis=0) - 1.0).min(axis=0)
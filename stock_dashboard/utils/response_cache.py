@@ -0,0 +1,132 @@
+"""
+Shared cross-session response cache.
+
+Callback outputs are serialized with ``plotly.io.json.to_json_plotly`` and
+stored in a size-bounded diskcache directory, keyed by a SHA-256 of the
+canonical inputs plus the data versions they were built from. diskcache is
+SQLite-backed, so every gunicorn worker and background-callback process on
+the host shares the same entries; least-recently-used entries are evicted
+once RESPONSE_CACHE_BYTES is reached.
+
+Every key also covers CODE_VERSION: BUILD_ID when the deploy sets it, else a
+hash of the app's Python sources and the plotly/Dash versions. Entries left
+on disk by another build are never served and age out under the size limit.
+
+Disable with RESPONSE_CACHE=0. Hit/miss counts (shared across processes)
+and the cache size are exported on ``/metrics``.
+"""
+import os
+import json
+import hashlib
+import logging
+
+import dash
+import plotly
+from plotly.io.json import to_json_plotly
+
+from utils.instrumentation import cache_event, register_metric
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", ".cache/responses")
+RESPONSE_CACHE_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(256 * 1024 * 1024)))
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_cache = None
+_disabled = False
+
+
+def _code_version():
+    build = os.getenv("BUILD_ID")
+    if build:
+        return build
+    digest = hashlib.sha256(f"plotly {plotly.__version__} dash {dash.__version__}".encode())
+    for dirpath, dirnames, filenames in os.walk(_APP_ROOT):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "__")) and d != "tests")
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                path = os.path.join(dirpath, name)
+                digest.update(os.path.relpath(path, _APP_ROOT).encode())
+                with open(path, "rb") as fh:
+                    digest.update(fh.read())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+
+
+def _get_cache():
+    """The shared diskcache.Cache, or None when disabled or diskcache is missing."""
+    global _cache, _disabled
+    if _cache is not None or _disabled:
+        return _cache
+
+    if os.getenv("RESPONSE_CACHE", "1") == "0":
+        _disabled = True
+        return None
+
+    try:
+        import diskcache
+    except ImportError:
+        logger.warning("diskcache not installed; shared response cache disabled")
+        _disabled = True
+        return None
+
+    _cache = diskcache.Cache(
+        RESPONSE_CACHE_DIR,
+        size_limit=RESPONSE_CACHE_BYTES,
+        eviction_policy="least-recently-used",
+    )
+    _cache.stats(enable=True)
+    return _cache
+
+
+def cache_key(name, *parts):
+    """Stable hash of ``name``, JSON-able ``parts`` (tuples, lists, strings, numbers) and CODE_VERSION."""
+    canonical = json.dumps([CODE_VERSION, name, *parts], sort_keys=True, separators=(",", ":"), default=str)
+    return f"{name}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+def get(key):
+    """Deserialized outputs for ``key``, or None."""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    payload = cache.get(key)
+    cache_event("response_cache", payload is not None)
+    if payload is None:
+        return None
+    return json.loads(payload)
+
+
+def put(key, outputs):
+    """Serialize and store ``outputs`` (figures, Dash components, plain data)."""
+    cache = _get_cache()
+    if cache is None:
+        return
+    cache.set(key, to_json_plotly(outputs))
+
+
+class _ResponseCacheStats:
+    """Host-wide counters kept by diskcache itself, rendered in Prometheus text."""
+
+    def render(self):
+        cache = _get_cache()
+        if cache is None:
+            return []
+        hits, misses = cache.stats()
+        return [
+            "# HELP response_cache_hits_total Shared response cache hits (all processes)",
+            "# TYPE response_cache_hits_total counter",
+            f"response_cache_hits_total {hits}",
+            "# HELP response_cache_misses_total Shared response cache misses (all processes)",
+            "# TYPE response_cache_misses_total counter",
+            f"response_cache_misses_total {misses}",
+            "# HELP response_cache_bytes Shared response cache size on disk",
+            "# TYPE response_cache_bytes gauge",
+            f"response_cache_bytes {cache.volume()}",
+        ]
+
+
+register_metric(_ResponseCacheStats())
@@ -0,0 +1,29 @@
+# wsgi.py
+"""
+Production entry point: ``gunicorn -c gunicorn.conf.py wsgi:server``.
+
+With ``preload_app`` the master imports this module once, warms the symbol
+catalog and price cache, then forks workers that share those pages
+copy-on-write. With PRICE_STORE=shm the price arrays are published to
+shared memory first, so every worker reads the same physical pages. The
+Mongo client and shared-memory handles used here stay in the master; workers
+open their own after the fork (``post_fork`` in gunicorn.conf.py).
+"""
+import logging
+
+from app import app, server
+from data import shared_store
+from data.registry import default_symbols
+from jobs.prewarm import prewarm
+
+logger = logging.getLogger(__name__)
+
+try:
+    if shared_store.enabled():
+        shared_store.publish_prices(default_symbols())
+    prewarm()
+except Exception:
+    # A cold start is slower but still serves requests
+    logger.exception("Prewarm failed; workers will start cold")
+
+application = server